@@ -1,14 +1,13 @@
 from typing import Optional
 
 import typer
-from rich import print_json
 
-from agentex.cli.handlers.agent_handlers import create_agent, get_agent, list_agents, delete_agent
-from agentex.client.agentex import Agentex
 from agentex.utils.logging import make_logger
 
 logger = make_logger(__name__)
 
+# Handlers, the client and rich are imported inside the commands, so that starting the CLI only pays for the
+# modules the invoked command needs
 agents = typer.Typer()
 
 
@@ -16,14 +15,20 @@ agents = typer.Typer()
 def create(
     manifest: Optional[str] = typer.Option(
         None, help="Path to the manifest you want to use"
-    )
+    ),
+    resume_upload: Optional[str] = typer.Option(
+        None, help="Upload ID of an interrupted build context upload to resume"
+    ),
 ):
     """
     Register an action with the given manifest path.
     """
+    from agentex.cli.handlers.agent_handlers import create_agent
+    from agentex.client.agentex import Agentex
+
     typer.echo(f"Registering action with manifest: {manifest}")
     client = Agentex()
-    agent = create_agent(client, manifest)
+    agent = create_agent(client, manifest, upload_id=resume_upload)
     logger.info(f"Agent created: {agent}")
 
 
@@ -37,6 +42,11 @@ def get(
     """
     Get the agent with the given name.
     """
+    from rich import print_json
+
+    from agentex.cli.handlers.agent_handlers import get_agent
+    from agentex.client.agentex import Agentex
+
     logger.info(f"Getting agent with ID: {agent_id}")
     client = Agentex()
     agent = get_agent(agentex=client, agent_id=agent_id)
@@ -49,6 +59,11 @@ def list():
     """
     List all agents.
     """
+    from rich import print_json
+
+    from agentex.cli.handlers.agent_handlers import list_agents
+    from agentex.client.agentex import Agentex
+
     logger.info("Listing all agents")
     client = Agentex()
     agents = list_agents(agentex=client)
@@ -66,6 +81,9 @@ def delete(
     """
     Delete the agent with the given name.
     """
+    from agentex.cli.handlers.agent_handlers import delete_agent
+    from agentex.client.agentex import Agentex
+
     logger.info(f"Deleting agent with name: {agent_name}")
     client = Agentex()
     delete_agent(agentex=client, agent_name=agent_name)
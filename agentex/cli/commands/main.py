@@ -1,10 +1,7 @@
-import asyncio
-
 import typer
 
 from agentex.cli.commands.agents import agents
 from agentex.cli.commands.tasks import tasks
-from agentex.client.agentex import AsyncAgentex
 
 # Create the main Typer application
 app = typer.Typer(
@@ -20,6 +17,8 @@ app.add_typer(tasks, name="tasks")
 
 
 async def async_hello():
+    from agentex.client.agentex import AsyncAgentex
+
     agentex = AsyncAgentex()
     response = await agentex.get("/")
     typer.echo(response.text)
@@ -27,6 +26,8 @@ async def async_hello():
 
 @app.command()
 def hello():
+    import asyncio
+
     asyncio.run(async_hello())
 
 
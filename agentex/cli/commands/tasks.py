@@ -1,16 +1,14 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 import typer
-from rich import print_json
 
-from agentex.cli.handlers.task_handlers import submit_task, modify_task, get_task, list_tasks, delete_task
-from agentex.client.agentex import Agentex
-from agentex.client.types.tasks import InstructTaskRequest, ApproveTaskRequest, \
-    CancelTaskRequest
+from agentex.constants import DEFAULT_ROOT_THREAD_NAME
 from agentex.utils.logging import make_logger
 
 logger = make_logger(__name__)
 
+# Handlers, the client and rich are imported inside the commands, so that starting the CLI only pays for the
+# modules the invoked command needs
 tasks = typer.Typer()
 
 
@@ -35,6 +33,11 @@ def submit(
     """
     Submit a task to the given agent.
     """
+    from rich import print_json
+
+    from agentex.cli.handlers.task_handlers import submit_task
+    from agentex.client.agentex import Agentex
+
     logger.info(f"Submitting task to agent: {agent}")
     client = Agentex()
     task = submit_task(
@@ -47,6 +50,54 @@ def submit(
     print_json(data=task.to_dict())
 
 
+@tasks.command(name="submit-batch")
+def submit_batch(
+    path: str = typer.Argument(
+        ...,
+        help='JSONL file with one task per line, e.g. {"agent": "my-agent", "prompt": "...", "require_approval": false}'
+    ),
+    agent: Optional[str] = typer.Option(
+        None, help="Name of the agent to submit lines without an agent to"
+    ),
+    concurrency: int = typer.Option(
+        16, help="Maximum number of submissions in flight"
+    ),
+    rate_limit: Optional[float] = typer.Option(
+        None, help="Maximum number of submissions per second"
+    ),
+    max_retries: int = typer.Option(
+        3, help="How often to retry a submission that failed transiently"
+    ),
+    manifest: Optional[str] = typer.Option(
+        None, help="Where to write the JSONL result manifest. Defaults to <path>.manifest.jsonl"
+    ),
+):
+    """
+    Submit every task in a JSONL file, concurrently.
+    """
+    import asyncio
+
+    from agentex.cli.handlers.task_handlers import load_task_batch, submit_task_batch
+    from agentex.client.agentex import AsyncAgentex
+    from agentex.client.types.bulk import BulkItemStatus
+
+    batch = load_task_batch(path=path, default_agent=agent)
+    manifest = manifest or f"{path}.manifest.jsonl"
+    logger.info(f"Submitting {len(batch)} tasks from {path}")
+    results = asyncio.run(submit_task_batch(
+        agentex=AsyncAgentex(),
+        tasks=batch,
+        manifest_path=manifest,
+        concurrency=concurrency,
+        rate_limit=rate_limit,
+        max_retries=max_retries,
+    ))
+    failed = sum(1 for result in results if result.status == BulkItemStatus.FAILED)
+    logger.info(f"Submitted {len(results) - failed} tasks, {failed} failed. Results written to {manifest}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @tasks.command()
 def get(
     task_id: str = typer.Argument(
@@ -57,6 +108,11 @@ def get(
     """
     Get the task with the given ID.
     """
+    from rich import print_json
+
+    from agentex.cli.handlers.task_handlers import get_task
+    from agentex.client.agentex import Agentex
+
     logger.info(f"Getting task: {task_id}")
     client = Agentex()
     task = get_task(agentex=client, task_id=task_id)
@@ -69,6 +125,11 @@ def list():
     """
     List all tasks.
     """
+    from rich import print_json
+
+    from agentex.cli.handlers.task_handlers import list_tasks
+    from agentex.client.agentex import Agentex
+
     client = Agentex()
     tasks = list_tasks(agentex=client)
     print_json(data=[task.to_dict() for task in tasks])
@@ -84,6 +145,9 @@ def delete(
     """
     Delete the task with the given ID.
     """
+    from agentex.cli.handlers.task_handlers import delete_task
+    from agentex.client.agentex import Agentex
+
     logger.info(f"Deleting task: {task_id}")
     client = Agentex()
     delete_task(agentex=client, task_id=task_id)
@@ -96,15 +160,50 @@ def tail(
         ...,
         help="ID of the task to get"
     ),
+    thread: str = typer.Option(
+        DEFAULT_ROOT_THREAD_NAME, help="Name of the thread to print the messages of"
+    ),
+    count: int = typer.Option(
+        1, "--count", "-n", help="Number of most recent messages to print"
+    ),
 ):
     """
-    Get the task with the given ID.
+    Print the most recent messages of the task with the given ID.
     """
+    from agentex.cli.handlers.task_handlers import get_task_messages
+    from agentex.client.agentex import Agentex
+
     logger.info(f"Getting task: {task_id}")
     client = Agentex()
-    task = get_task(agentex=client, task_id=task_id)
-    # print(f"Last Response {task_id}:")
-    logger.info(f"Agentex ({task_id}): {task.messages[-1].content}")
+    thread_slice = get_task_messages(agentex=client, task_id=task_id, thread_name=thread, count=count)
+    for message in thread_slice.messages:
+        logger.info(f"Agentex ({task_id}): {message.content}")
+
+
+@tasks.command()
+def watch(
+    task_id: str = typer.Argument(
+        ...,
+        help="ID of the task to watch"
+    ),
+    offset: Optional[int] = typer.Option(
+        None, help="Resume after the event with this offset, as printed in front of each event"
+    ),
+):
+    """
+    Follow the messages, tool calls and status changes of the task with the given ID live, until it finishes.
+    """
+    import asyncio
+
+    from agentex.cli.handlers.task_handlers import watch_task
+    from agentex.client.agentex import AsyncAgentex
+
+    logger.info(f"Watching task: {task_id}")
+    client = AsyncAgentex()
+    try:
+        asyncio.run(watch_task(agentex=client, task_id=task_id, offset=offset))
+    except KeyboardInterrupt:
+        pass
 
 
 @tasks.command()
@@ -121,6 +220,10 @@ def instruct(
     """
     Instruct a task with the given instruction.
     """
+    from agentex.cli.handlers.task_handlers import modify_task
+    from agentex.client.agentex import Agentex
+    from agentex.client.types.tasks import InstructTaskRequest
+
     client = Agentex()
     modify_task(
         agentex=client,
@@ -140,6 +243,10 @@ def approve(
     """
     Approve a task.
     """
+    from agentex.cli.handlers.task_handlers import modify_task
+    from agentex.client.agentex import Agentex
+    from agentex.client.types.tasks import ApproveTaskRequest
+
     client = Agentex()
     modify_task(
         agentex=client,
@@ -159,6 +266,10 @@ def cancel(
     """
     Cancel a task.
     """
+    from agentex.cli.handlers.task_handlers import modify_task
+    from agentex.client.agentex import Agentex
+    from agentex.client.types.tasks import CancelTaskRequest
+
     client = Agentex()
     modify_task(
         agentex=client,
@@ -1,37 +1,48 @@
 from pathlib import Path
+from typing import Optional
 
-from rich.console import Console
+from rich.progress import DownloadColumn, Progress, SpinnerColumn, TextColumn, TransferSpeedColumn
 
 from agentex.cli.models.action_manifest import AgentManifestConfig
 from agentex.client.agentex import Agentex
 from agentex.client.types.agents import CreateAgentRequest
+from agentex.utils.console import get_console
 from agentex.utils.logging import make_logger
 
 logger = make_logger(__name__)
-console = Console()
+console = get_console()
 
 
-def create_agent(agentex: Agentex, manifest_path: str):
+def create_agent(agentex: Agentex, manifest_path: str, upload_id: Optional[str] = None):
+    """
+    Creates the agent described by the manifest. Its build context is uploaded in resumable chunks while it is
+    being archived; pass the upload ID of an interrupted run as `upload_id` to continue where it stopped.
+    """
     agent_manifest = AgentManifestConfig.from_yaml(file_path=manifest_path)
     build_context_root = (Path(manifest_path).parent / agent_manifest.build.context.root).resolve()
+    request = CreateAgentRequest(
+        name=agent_manifest.agent.name,
+        description=agent_manifest.agent.description,
+        workflow_name=agent_manifest.workflow.name,
+        workflow_queue_name=agent_manifest.workflow.queue_name,
+    )
     with agent_manifest.context_manager(build_context_root) as build_context:
-        with build_context.zipped(build_context.path) as zip_stream:
-            params = dict(
-                agent_package=('context.tar.gz', zip_stream, 'application/gzip'),
-                request=CreateAgentRequest(
-                    name=agent_manifest.agent.name,
-                    description=agent_manifest.agent.description,
-                    workflow_name=agent_manifest.workflow.name,
-                    workflow_queue_name=agent_manifest.workflow.queue_name,
-                )
+        with build_context.archive_stream() as package_stream, Progress(
+            SpinnerColumn(),
+            TextColumn("{task.description}"),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            console=console,
+        ) as progress:
+            progress_task = progress.add_task("Uploading build context", total=None)
+            upload_id = agentex.agents.upload_package(
+                package_stream,
+                upload_id=upload_id,
+                on_progress=lambda offset: progress.update(progress_task, completed=offset),
             )
 
-            logger.info(f"Creating agent with payload: {params}")
-
-            return agentex.agents.create(
-                agent_package=params['agent_package'],
-                request=params['request'],
-            )
+    logger.info(f"Uploaded build context as {upload_id}, creating agent with request: {request}")
+    return agentex.agents.create(upload_id=upload_id, request=request)
 
 
 def get_agent(agentex: Agentex, agent_id: str):
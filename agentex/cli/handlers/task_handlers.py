@@ -1,13 +1,21 @@
-from typing import Optional
+import json
+from pathlib import Path
+from typing import List, Optional
 
-from rich.console import Console
+from pydantic import Field
+from rich.markup import escape
+from rich.progress import Progress
 
-from agentex.client.agentex import Agentex
-from agentex.client.types.tasks import ModifyTaskRequest
+from agentex.client.agentex import Agentex, AsyncAgentex
+from agentex.client.types.bulk import BulkItemStatus, BulkResult
+from agentex.client.types.events import MessageEvent, StatusEvent, TaskEvent, ToolCallEvent
+from agentex.client.types.tasks import CreateTaskRequest, ModifyTaskRequest
+from agentex.utils.console import get_console
 from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
 
 logger = make_logger(__name__)
-console = Console()
+console = get_console()
 
 
 def submit_task(
@@ -27,6 +35,10 @@ def get_task(agentex: Agentex, task_id: str):
     return agentex.tasks.get(task_id=task_id)
 
 
+def get_task_messages(agentex: Agentex, task_id: str, thread_name: str, count: int):
+    return agentex.tasks.get_messages(task_id=task_id, thread_name=thread_name, tail=count)
+
+
 def list_tasks(agentex: Agentex):
     return agentex.tasks.list()
 
@@ -37,3 +49,90 @@ def delete_task(agentex: Agentex, task_id: str):
 
 def modify_task(agentex: Agentex, task_id: str, request: ModifyTaskRequest):
     return agentex.tasks.modify(task_id=task_id, modification_request=request)
+
+
+def render_task_event(event: TaskEvent) -> None:
+    prefix = f"[dim]{event.offset}[/dim]"
+    if isinstance(event, MessageEvent):
+        content = escape(str(event.message.content))
+        console.print(f"{prefix} [bold]{event.message.role}[/bold] ({event.thread_name}): {content}")
+    elif isinstance(event, ToolCallEvent):
+        console.print(f"{prefix} [cyan]{event.tool_name}[/cyan]({escape(event.arguments)})")
+    elif isinstance(event, StatusEvent):
+        reason = f": {escape(event.status_reason)}" if event.status_reason else ""
+        console.print(f"{prefix} [yellow]{event.status.value}[/yellow]{reason}")
+
+
+async def watch_task(agentex: AsyncAgentex, task_id: str, offset: Optional[int] = None):
+    async with agentex:
+        async for event in agentex.tasks.watch(task_id=task_id, offset=offset):
+            render_task_event(event)
+
+
+class BatchTask(BaseModel):
+    line: int = Field(..., description="The line of the batch file the task was read from.")
+    request: CreateTaskRequest
+
+
+class BatchManifestEntry(BulkResult):
+    line: int = Field(
+        ...,
+        description="The line of the batch file the task was read from. Blank lines are skipped, so this can "
+                    "differ from the index."
+    )
+
+
+def load_task_batch(path: str, default_agent: Optional[str] = None) -> List[BatchTask]:
+    """
+    Reads one task per line of a JSONL file, e.g. {"agent": "hello-world", "prompt": "...", "require_approval": false}.
+    Lines without an agent are submitted to `default_agent`.
+    """
+    tasks = []
+    with open(path) as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if default_agent is not None:
+                    request.setdefault("agent", default_agent)
+                tasks.append(BatchTask(line=line_number, request=CreateTaskRequest.model_validate(request)))
+            except ValueError as e:
+                raise ValueError(f"Invalid task on line {line_number} of {path}: {e}") from e
+    return tasks
+
+
+async def submit_task_batch(
+    agentex: AsyncAgentex,
+    tasks: List[BatchTask],
+    manifest_path: str,
+    concurrency: int,
+    rate_limit: Optional[float],
+    max_retries: int,
+) -> List[BulkResult]:
+    """
+    Submits the batch, writing each submission's result to the JSONL manifest as soon as it finishes. Each entry
+    records the line of the batch file its task was read from.
+    """
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w") as manifest, Progress(console=console) as progress:
+        progress_task = progress.add_task("Submitting tasks", total=len(tasks))
+
+        def on_progress(result: BulkResult) -> None:
+            entry = BatchManifestEntry(line=tasks[result.index].line, **result.to_dict())
+            manifest.write(entry.to_json() + "\n")
+            manifest.flush()
+            progress.advance(progress_task)
+            if result.status == BulkItemStatus.FAILED:
+                progress.console.print(
+                    f"[red]Task on line {entry.line} failed[/red]: {escape(result.error or '')}"
+                )
+
+        async with agentex:
+            return await agentex.tasks.create_many(
+                [task.request for task in tasks],
+                concurrency=concurrency,
+                rate_limit=rate_limit,
+                max_retries=max_retries,
+                on_progress=on_progress,
+            )
@@ -1,19 +1,21 @@
 from __future__ import annotations
 
-import io
-import time
-import shutil
+import os
 import tarfile
-import tempfile
-import subprocess
-from typing import IO, List, Iterator, Optional
+import threading
+import time
+from typing import IO, List, Iterator, Optional, Set
 from pathlib import Path
 from contextlib import contextmanager
 
 from pydantic import Field
 
+from agentex.utils.build_context_cache import BuildContextCache, ContextEntry
+from agentex.utils.compression import ParallelGzipWriter
+from agentex.utils.dockerignore import DockerIgnore
 from agentex.utils.logging import make_logger
 from agentex.utils.model_utils import BaseModel
+from agentex.utils.streams import Pipe, TeeWriter
 
 logger = make_logger(__name__)
 
@@ -91,161 +93,206 @@ class AgentManifestConfig(BaseModel):
 
 class BuildContextManager:
     """
-    A gateway used to manage the build context for a docker image
+    A gateway used to manage the build context for a docker image.
+
+    The context is described by the list of files it contains rather than copied anywhere. Its archive is built
+    by streaming those files straight from their source paths, and is cached by content digest so that an
+    unchanged context is not archived again.
     """
 
-    def __init__(self, agent_manifest: AgentManifestConfig, build_context_root: Path):
+    def __init__(
+        self,
+        agent_manifest: AgentManifestConfig,
+        build_context_root: Path,
+        cache: Optional[BuildContextCache] = None,
+    ):
         self.agent_manifest = agent_manifest
         self.build_context_root = build_context_root
-        self._temp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.cache = cache or BuildContextCache()
 
-        self.path: Optional[Path] = None
         self.dockerfile_path = "Dockerfile"
         self.dockerignore_path = ".dockerignore"
         self.directory_paths: List[Path] = []
+        self.entries: List[ContextEntry] = []
+        self._arcnames: Set[str] = set()
 
     def __enter__(self) -> BuildContextManager:
-        self._temp_dir = tempfile.TemporaryDirectory()
-        self.path = Path(self._temp_dir.name)
+        self.entries = []
+        self.directory_paths = []
+        self._arcnames = set()
 
         dockerfile_path = self.build_context_root / self.agent_manifest.build.context.dockerfile
-        self.add_dockerfile(root_path=self.path, dockerfile_path=dockerfile_path)
+        self.add_dockerfile(dockerfile_path=dockerfile_path)
 
-        ignore_patterns = []
+        dockerignore = None
         if self.agent_manifest.build.context.dockerignore:
             dockerignore_path = self.build_context_root / self.agent_manifest.build.context.dockerignore
-            self.add_dockerignore(root_path=self.path, dockerignore_path=dockerignore_path)
-            ignore_patterns = _extract_dockerignore_patterns(dockerignore_path)
+            self.add_dockerignore(dockerignore_path=dockerignore_path)
+            dockerignore = DockerIgnore.from_file(dockerignore_path)
 
         for directory in self.agent_manifest.build.context.include_paths:
             directory_path = self.build_context_root / directory
             self.add_directory(
-                root_path=self.path,
                 directory_path=directory_path,
                 context_root=self.build_context_root,
-                ignore_patterns=ignore_patterns,
+                dockerignore=dockerignore,
             )
 
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._temp_dir:
-            self._temp_dir.cleanup()
+        pass
 
-    def add_dockerfile(self, root_path: Path, dockerfile_path: Path) -> None:
+    @property
+    def size(self) -> int:
+        """The total size of the files in the build context, before compression."""
+        return sum(entry.size for entry in self.entries)
+
+    def _add_entry(self, path: Path, arcname: str) -> bool:
         """
-        Copies a dockerfile to the temporary context directory root
+        Adds a file to the build context unless a file was already added under the same name, e.g. because the
+        include paths overlap. Returns whether it was added.
         """
-        shutil.copy2(dockerfile_path, root_path / self.dockerfile_path)
+        if arcname in self._arcnames:
+            return False
+        self._arcnames.add(arcname)
+        self.entries.append(ContextEntry.from_path(path, arcname=arcname))
+        return True
 
-    def add_dockerignore(self, root_path: Path, dockerignore_path: Path) -> None:
+    def add_dockerfile(self, dockerfile_path: Path) -> None:
         """
-        Copies a dockerignore to the temporary context directory root
+        Adds a dockerfile to the build context root
         """
-        shutil.copy2(str(dockerignore_path), root_path / self.dockerignore_path)
+        self._add_entry(dockerfile_path, arcname=self.dockerfile_path)
+
+    def add_dockerignore(self, dockerignore_path: Path) -> None:
+        """
+        Adds a dockerignore to the build context root
+        """
+        self._add_entry(dockerignore_path, arcname=self.dockerignore_path)
 
     def add_directory(
         self,
-        root_path: Path,
         directory_path: Path,
         context_root: Path,
-        ignore_patterns: Optional[List[str]] = None,
+        dockerignore: Optional[DockerIgnore] = None,
     ) -> None:
         """
-        Copies a directory to the temporary context directory root while maintaining its relative
-        path to the context root.
-        """
-        directory_copy_start_time = time.time()
-        last_log_time = directory_copy_start_time
-
-        def copy_function_with_progress(src, dst):
-            nonlocal directory_copy_start_time
-            nonlocal last_log_time
-            logger.debug(f"Adding {src} to build context...")
-            shutil.copy2(src, dst)
-            current_time = time.time()
-            time_elapsed = current_time - directory_copy_start_time
-
-            if time_elapsed > 1 and current_time - last_log_time >= 1:
-                logger.info(f"Time elapsed copying ({directory_path}): {time_elapsed} " f"seconds")
-                last_log_time = current_time
-            if time_elapsed > 5:
-                logger.warning(
-                    f"This may take a while... "
-                    f"Consider adding {directory_path} or {src} to your .dockerignore file."
-                )
-
+        Adds the files of a directory to the build context while maintaining their relative path to the context
+        root. Paths matched by the dockerignore are left out, and ignored directories are not descended into
+        unless a negated pattern might re-include something inside them.
+        """
+        start_time = time.time()
+        dockerignore = dockerignore or DockerIgnore([])
         directory_path_relative_to_root = directory_path.relative_to(context_root)
-        all_ignore_patterns = [f"{root_path}*"]
-        if ignore_patterns:
-            all_ignore_patterns += ignore_patterns
-        shutil.copytree(
-            src=directory_path,
-            dst=root_path / directory_path_relative_to_root,
-            ignore=shutil.ignore_patterns(*all_ignore_patterns),
-            dirs_exist_ok=True,
-            copy_function=copy_function_with_progress,
+        file_count = 0
+        pruned_count = 0
+        for current, dir_names, file_names in os.walk(directory_path):
+            current_path = Path(current)
+            relative_path = current_path.relative_to(context_root).as_posix()
+            relative_prefix = "" if relative_path == "." else relative_path + "/"
+            kept_dir_names = [name for name in dir_names if not dockerignore.can_prune(relative_prefix + name)]
+            pruned_count += len(dir_names) - len(kept_dir_names)
+            dir_names[:] = kept_dir_names
+            for name in file_names:
+                arcname = relative_prefix + name
+                if dockerignore.is_ignored(arcname):
+                    continue
+                path = current_path / name
+                if not path.is_file():
+                    continue
+                if self._add_entry(path, arcname=arcname):
+                    file_count += 1
+        logger.debug(
+            f"Added {file_count} files from {directory_path}, skipping {pruned_count} ignored directories, "
+            f"in {time.time() - start_time:.2f}s"
         )
         self.directory_paths.append(directory_path_relative_to_root)
 
+    def digest(self) -> str:
+        """The content digest of the build context."""
+        return self.cache.digest(self.entries)
+
+    def write_archive(self, fileobj: IO[bytes]) -> None:
+        """
+        Writes the build context as a tar.gz archive to the given stream, reading every file from its source path
+        and compressing on all cores.
+        """
+        with ParallelGzipWriter(fileobj) as gzip_writer:
+            with tarfile.open(fileobj=gzip_writer, mode="w|") as tar_file:
+                for entry in self.entries:
+                    tar_file.add(entry.path, arcname=entry.arcname, recursive=False)
+
     @contextmanager
-    def zip_stream(self, root_path: Optional[Path] = None) -> Iterator[IO[bytes]]:
-        """
-        Creates a tar archive of the temporary context directory
-        and returns a stream of the archive.
-        """
-        if not root_path:
-            raise ValueError("root_path must be provided")
-        context = str(root_path.absolute())
-        folders_to_include = "."
-        tar_command = ["tar", "-C", context, "-cf", "-"]
-        tar_command.extend(folders_to_include)
-
-        logger.info(f"Creating archive: {' '.join(tar_command)}")
-
-        with subprocess.Popen(
-            tar_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-        ) as proc:
-            assert proc.stdout is not None
+    def archive(self) -> Iterator[IO[bytes]]:
+        """
+        Yields the tar.gz archive of the build context, building it only if no archive of the same content is
+        cached.
+        """
+        archive_path = self.cache.archive_path(self.digest())
+        if archive_path.exists():
+            logger.info(f"Build context unchanged, reusing {archive_path}")
+            archive_path.touch()
+        else:
+            start_time = time.time()
+            archive_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.tmp")
             try:
-                yield proc.stdout
+                with open(temp_path, "wb") as file:
+                    self.write_archive(file)
+                os.replace(temp_path, archive_path)
             finally:
-                pass
+                temp_path.unlink(missing_ok=True)
+            logger.info(
+                f"Archived {len(self.entries)} files ({self.size} bytes) into {archive_path.stat().st_size} bytes "
+                f"in {time.time() - start_time:.2f}s"
+            )
+            self.cache.prune()
+        with open(archive_path, "rb") as file:
+            yield file
 
-    @staticmethod
     @contextmanager
-    def zipped(root_path: Optional[Path] = None) -> Iterator[IO[bytes]]:
+    def archive_stream(self) -> Iterator[IO[bytes]]:
         """
-        Creates a tar.gz archive of the temporary context directory
-        and returns a stream of the archive.
+        Yields the tar.gz archive of the build context as a stream that can be read while it is still being built,
+        so that uploading it overlaps with compressing it. The archive is cached as it is written, and a cached
+        archive of the same content is yielded as is.
         """
-        if not root_path:
-            raise ValueError("root_path must be provided")
-
-        tar_buffer = io.BytesIO()
-
-        with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tar_file:
-            for path in Path(root_path).rglob('*'):  # Recursively add files to the tar.gz
-                if path.is_file():  # Ensure that we're only adding files
-                    tar_file.add(path, arcname=path.relative_to(root_path))
-
-        tar_buffer.seek(0)  # Reset the buffer position to the beginning
-        yield tar_buffer
-
+        archive_path = self.cache.archive_path(self.digest())
+        if archive_path.exists():
+            logger.info(f"Build context unchanged, reusing {archive_path}")
+            archive_path.touch()
+            with open(archive_path, "rb") as file:
+                yield file
+            return
+
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.tmp")
+        pipe = Pipe()
+
+        def produce() -> None:
+            start_time = time.time()
+            try:
+                with open(temp_path, "wb") as file:
+                    self.write_archive(TeeWriter(file, pipe))
+                os.replace(temp_path, archive_path)
+            except BaseException as error:
+                pipe.close_writer(error)
+                return
+            logger.info(
+                f"Archived {len(self.entries)} files ({self.size} bytes) into {archive_path.stat().st_size} bytes "
+                f"in {time.time() - start_time:.2f}s"
+            )
+            pipe.close_writer()
+
+        producer = threading.Thread(target=produce, name="agentex-archive", daemon=True)
+        producer.start()
+        try:
+            yield pipe
+        finally:
+            # Closing the pipe makes a producer whose output is no longer read stop with BrokenPipeError
+            pipe.close()
+            producer.join()
+            temp_path.unlink(missing_ok=True)
+            self.cache.prune()
 
-def _extract_dockerignore_patterns(dockerignore_path: Path) -> List[str]:
-    """
-    Extracts glob patterns to ignore from the dockerignore into a list of patterns
-    :param dockerignore_path: Path to the dockerignore to extract patterns from
-    :return: List of glob patterns to ignore
-    :rtype: List[str]
-    """
-    ignore_patterns = []
-    with open(dockerignore_path, "r") as file:
-        for line in file:
-            ignored_filepath = line.split("#", 1)[0].strip()
-            if ignored_filepath:
-                ignore_patterns.append(ignored_filepath)
-    return ignore_patterns
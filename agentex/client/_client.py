@@ -1,76 +1,338 @@
+import asyncio
+import contextlib
+import importlib.util
 import os
-from typing import Union
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Iterator, Optional, Union
 
 import httpx
 from httpx import Timeout
+from pydantic import Field
 
+from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
+
+logger = make_logger(__name__)
+
+DEFAULT_BASE_URL = "http://localhost:5003/"
 DEFAULT_TIMEOUT = httpx.Timeout(timeout=60.0, connect=5.0)
 DEFAULT_MAX_RETRIES = 2
+DEFAULT_INITIAL_RETRY_DELAY = 0.5
+DEFAULT_MAX_RETRY_DELAY = 8.0
+DEFAULT_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+# HTTP/2 needs the optional `h2` package (`httpx[http2]`)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# The server turned these away before doing any work, so even non-idempotent requests may be resent
+REJECTED_STATUS_CODES = frozenset({429, 503})
+
+
+class RequestTiming(BaseModel):
+    method: str = Field(..., description="The HTTP method of the request.")
+    url: str = Field(..., description="The full URL of the request.")
+    status_code: Optional[int] = Field(
+        None,
+        description="The status code of the final response, or None if the request failed without one."
+    )
+    http_version: Optional[str] = Field(None, description="The HTTP version the final response was received over.")
+    attempts: int = Field(1, description="The number of attempts made, including retries.")
+    elapsed: float = Field(..., description="Seconds from the first attempt until the final response or error.")
+    error: Optional[str] = Field(None, description="The transport error of the final attempt, if any.")
 
 
-class SyncAPIClient:
+RequestTimingHook = Callable[[RequestTiming], None]
+
+
+class BaseAPIClient:
+    """
+    The transport shared by the sync and async clients.
+
+    A single pooled httpx client is kept per instance, so connections (and TLS sessions) are reused across
+    calls; reuse one client instead of constructing one per request. Failed requests are retried with
+    exponential backoff and jitter when it is safe to do so: idempotent requests on transport errors and
+    429/5xx responses, and any request the server turned away (429/503) or that never reached it.
+    """
+
     def __init__(
         self,
         *,
         base_url: str | httpx.URL | None = None,
         timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+        http2: Optional[bool] = None,
+        on_request_timing: Optional[RequestTimingHook] = None,
     ) -> None:
-        """Construct a new synchronous agentex client instance."""
-        if base_url is None:
-            self.base_url = os.environ.get("AGENTEX_BASE_URL")
-        if base_url is None:
-            self.base_url = f"http://localhost:5003/"
+        """
+        :param base_url: The URL of the Agentex server. Defaults to $AGENTEX_BASE_URL, then localhost.
+        :param timeout: The request timeout, in seconds or as an httpx.Timeout.
+        :param max_retries: How often a failed request may be retried.
+        :param limits: The connection pool limits, including how long idle connections are kept alive.
+        :param http2: Whether to negotiate HTTP/2. Defaults to enabled when the `h2` package is installed.
+        :param on_request_timing: Called with the timing of every request once it completes or fails.
+        """
+        self.base_url = base_url or os.environ.get("AGENTEX_BASE_URL") or DEFAULT_BASE_URL
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limits = limits
+        if http2 is None:
+            http2 = HTTP2_AVAILABLE
+        elif http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 was requested but the `h2` package is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.on_request_timing = on_request_timing
 
-        self._client = httpx.Client(
+    @staticmethod
+    def _should_retry(
+        method: str,
+        response: Optional[httpx.Response] = None,
+        error: Optional[httpx.TransportError] = None,
+    ) -> bool:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if error is not None:
+            # A request that could not even connect was never sent
+            return idempotent or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+        if response.status_code in REJECTED_STATUS_CODES:
+            return True
+        return idempotent and response.status_code in RETRYABLE_STATUS_CODES
+
+    @staticmethod
+    def _retry_delay(retry: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, DEFAULT_MAX_RETRY_DELAY)
+        delay = min(DEFAULT_INITIAL_RETRY_DELAY * 2 ** retry, DEFAULT_MAX_RETRY_DELAY)
+        # Full jitter keeps many clients that failed together from retrying together
+        return random.uniform(0, delay)
+
+    def _report(
+        self,
+        request: httpx.Request,
+        started_at: float,
+        attempts: int,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        if self.on_request_timing is None:
+            return
+        timing = RequestTiming(
+            method=request.method,
+            url=str(request.url),
+            status_code=response.status_code if response is not None else None,
+            http_version=response.http_version if response is not None else None,
+            attempts=attempts,
+            elapsed=time.perf_counter() - started_at,
+            error=repr(error) if error is not None else None,
+        )
+        try:
+            self.on_request_timing(timing)
+        except Exception as e:
+            logger.warning(f"Request timing hook failed: {e}")
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class SyncAPIClient(BaseAPIClient):
+    def __init__(
+        self,
+        *,
+        base_url: str | httpx.URL | None = None,
+        timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+        http2: Optional[bool] = None,
+        on_request_timing: Optional[RequestTimingHook] = None,
+    ) -> None:
+        """Construct a new synchronous agentex client instance."""
+        super().__init__(
             base_url=base_url,
             timeout=timeout,
+            max_retries=max_retries,
+            limits=limits,
+            http2=http2,
+            on_request_timing=on_request_timing,
+        )
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
         )
 
+    def request(self, method: str, path: str, max_retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        Sends a request, retrying it when that is safe.
+
+        :param max_retries: Overrides the client's `max_retries` for this request, e.g. 0 where the caller retries.
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+        request = self._client.build_request(method, path, **kwargs)
+        started_at = time.perf_counter()
+        retry = 0
+        while True:
+            try:
+                response = self._client.send(request)
+            except httpx.TransportError as e:
+                if retry >= max_retries or not self._should_retry(method, error=e):
+                    self._report(request, started_at, retry + 1, error=e)
+                    raise
+                delay = self._retry_delay(retry)
+                logger.debug(f"{method} {request.url} failed with {e!r}, retrying in {delay:.2f}s")
+            else:
+                if retry >= max_retries or not self._should_retry(method, response=response):
+                    self._report(request, started_at, retry + 1, response=response)
+                    return response
+                delay = self._retry_delay(retry, response)
+                logger.debug(f"{method} {request.url} returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+            time.sleep(delay)
+            retry += 1
+
     def get(self, path: str, **kwargs) -> httpx.Response:
-        return self._client.get(path, **kwargs)
+        return self.request("GET", path, **kwargs)
 
     def post(self, path: str, **kwargs) -> httpx.Response:
-        return self._client.post(path, **kwargs)
+        return self.request("POST", path, **kwargs)
 
     def patch(self, path: str, **kwargs) -> httpx.Response:
-        return self._client.patch(path, **kwargs)
+        return self.request("PATCH", path, **kwargs)
 
     def put(self, path: str, **kwargs) -> httpx.Response:
-        return self._client.put(path, **kwargs)
+        return self.request("PUT", path, **kwargs)
 
     def delete(self, path: str, **kwargs) -> httpx.Response:
-        return self._client.delete(path, **kwargs)
+        return self.request("DELETE", path, **kwargs)
+
+    @contextlib.contextmanager
+    def stream(self, method: str, path: str, **kwargs) -> Iterator[httpx.Response]:
+        """
+        Sends a request whose response body is read incrementally. Streamed requests are not retried, since part
+        of the body may already have been consumed.
+        """
+        with self._client.stream(method, path, **kwargs) as response:
+            yield response
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self):
+        return self
 
+    def __exit__(self, *args) -> None:
+        self.close()
 
-class AsyncAPIClient:
+
+class AsyncAPIClient(BaseAPIClient):
     def __init__(
         self,
         *,
         base_url: str | httpx.URL | None = None,
         timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+        http2: Optional[bool] = None,
+        on_request_timing: Optional[RequestTimingHook] = None,
     ) -> None:
         """Construct a new asynchronous agentex client instance."""
-        if base_url is None:
-            self.base_url = os.environ.get("AGENTEX_BASE_URL")
-        if base_url is None:
-            self.base_url = f"http://localhost:5003/"
-
-        self._client = httpx.AsyncClient(
+        super().__init__(
             base_url=base_url,
             timeout=timeout,
+            max_retries=max_retries,
+            limits=limits,
+            http2=http2,
+            on_request_timing=on_request_timing,
         )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+    async def request(self, method: str, path: str, max_retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        Sends a request, retrying it when that is safe.
+
+        :param max_retries: Overrides the client's `max_retries` for this request, e.g. 0 where the caller retries.
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+        request = self._client.build_request(method, path, **kwargs)
+        started_at = time.perf_counter()
+        retry = 0
+        while True:
+            try:
+                response = await self._client.send(request)
+            except httpx.TransportError as e:
+                if retry >= max_retries or not self._should_retry(method, error=e):
+                    self._report(request, started_at, retry + 1, error=e)
+                    raise
+                delay = self._retry_delay(retry)
+                logger.debug(f"{method} {request.url} failed with {e!r}, retrying in {delay:.2f}s")
+            else:
+                if retry >= max_retries or not self._should_retry(method, response=response):
+                    self._report(request, started_at, retry + 1, response=response)
+                    return response
+                delay = self._retry_delay(retry, response)
+                logger.debug(f"{method} {request.url} returned {response.status_code}, retrying in {delay:.2f}s")
+                await response.aclose()
+            await asyncio.sleep(delay)
+            retry += 1
 
     async def get(self, path: str, **kwargs) -> httpx.Response:
-        return await self._client.get(path, **kwargs)
+        return await self.request("GET", path, **kwargs)
 
     async def post(self, path: str, **kwargs) -> httpx.Response:
-        return await self._client.post(path, **kwargs)
+        return await self.request("POST", path, **kwargs)
 
     async def patch(self, path: str, **kwargs) -> httpx.Response:
-        return await self._client.patch(path, **kwargs)
+        return await self.request("PATCH", path, **kwargs)
 
     async def put(self, path: str, **kwargs) -> httpx.Response:
-        return await self._client.put(path, **kwargs)
+        return await self.request("PUT", path, **kwargs)
 
     async def delete(self, path: str, **kwargs) -> httpx.Response:
-        return await self._client.delete(path, **kwargs)
+        return await self.request("DELETE", path, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method: str, path: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Sends a request whose response body is read incrementally. Streamed requests are not retried, since part
+        of the body may already have been consumed.
+        """
+        async with self._client.stream(method, path, **kwargs) as response:
+            yield response
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -0,0 +1,42 @@
+from typing import AsyncIterator, List, Optional
+
+from pydantic import Field
+
+from agentex.utils.model_utils import BaseModel
+
+SSE_CONTENT_TYPE = "text/event-stream"
+
+
+class ServerSentEvent(BaseModel):
+    event: str = Field("message", description="The event type.")
+    data: str = Field("", description="The event data, with multiple data lines joined by newlines.")
+    id: Optional[str] = Field(None, description="The event ID, sent back as Last-Event-ID when reconnecting.")
+    retry: Optional[int] = Field(None, description="The reconnection delay requested by the server, in milliseconds.")
+
+
+async def aiter_sse(lines: AsyncIterator[str]) -> AsyncIterator[ServerSentEvent]:
+    """Parses a text/event-stream body, yielding each event once the blank line that ends it arrives."""
+    event: Optional[str] = None
+    data: List[str] = []
+    event_id: Optional[str] = None
+    retry: Optional[int] = None
+    async for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            if data or event is not None or event_id is not None or retry is not None:
+                yield ServerSentEvent(event=event or "message", data="\n".join(data), id=event_id, retry=retry)
+            event, data, event_id, retry = None, [], None, None
+            continue
+        if line.startswith(":"):
+            # Comments are used as keep-alives
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+        elif field == "id":
+            event_id = value
+        elif field == "retry" and value.isdigit():
+            retry = int(value)
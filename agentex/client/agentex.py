@@ -1,11 +1,18 @@
-from typing import Union
+from typing import Optional, Union
 
 import httpx
 from httpx import Timeout
 
-from agentex.client._client import SyncAPIClient, DEFAULT_TIMEOUT, AsyncAPIClient
-from agentex.client.resources.agents import AgentsResource
-from agentex.client.resources.tasks import TasksResource
+from agentex.client._client import (
+    DEFAULT_CONNECTION_LIMITS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+    AsyncAPIClient,
+    RequestTimingHook,
+    SyncAPIClient,
+)
+from agentex.client.resources.agents import AgentsResource, AsyncAgentsResource
+from agentex.client.resources.tasks import TasksResource, AsyncTasksResource
 from agentex.constants import AGENTEX_BASE_URL
 
 
@@ -16,16 +23,35 @@ class Agentex(SyncAPIClient):
         *,
         base_url: str | httpx.URL | None = AGENTEX_BASE_URL,
         timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+        http2: Optional[bool] = None,
+        on_request_timing: Optional[RequestTimingHook] = None,
     ) -> None:
         """Construct a new synchronous agentex client instance."""
 
-        super().__init__(base_url=base_url, timeout=timeout)
+        super().__init__(
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=max_retries,
+            limits=limits,
+            http2=http2,
+            on_request_timing=on_request_timing,
+        )
 
         self.agents = AgentsResource(self)
         self.tasks = TasksResource(self)
 
-    def get(self, path: str, **kwargs) -> httpx.Response:
-        return self._client.get(path, **kwargs)
+    def to_async(self) -> "AsyncAgentex":
+        """An async client with the same settings, e.g. to run concurrent requests from synchronous code."""
+        return AsyncAgentex(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            limits=self.limits,
+            http2=self.http2,
+            on_request_timing=self.on_request_timing,
+        )
 
 
 class AsyncAgentex(AsyncAPIClient):
@@ -35,10 +61,21 @@ class AsyncAgentex(AsyncAPIClient):
         *,
         base_url: str | httpx.URL | None = AGENTEX_BASE_URL,
         timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        limits: httpx.Limits = DEFAULT_CONNECTION_LIMITS,
+        http2: Optional[bool] = None,
+        on_request_timing: Optional[RequestTimingHook] = None,
     ) -> None:
         """Construct a new asynchronous agentex client instance."""
 
-        super().__init__(base_url=base_url, timeout=timeout)
+        super().__init__(
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=max_retries,
+            limits=limits,
+            http2=http2,
+            on_request_timing=on_request_timing,
+        )
 
-        self.agents = AgentsResource(self)
-        self.tasks = TasksResource(self)
+        self.agents = AsyncAgentsResource(self)
+        self.tasks = AsyncTasksResource(self)
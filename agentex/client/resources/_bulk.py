@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Coroutine, Iterable, List, Optional, TypeVar
+
+import httpx
+
+from agentex.client._client import DEFAULT_INITIAL_RETRY_DELAY, DEFAULT_MAX_RETRY_DELAY, BaseAPIClient
+from agentex.client.types.bulk import BulkItemStatus, BulkResult
+from agentex.utils.logging import make_logger
+
+logger = make_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_BULK_CONCURRENCY = 16
+DEFAULT_BULK_MAX_RETRIES = 3
+
+BulkProgressHook = Callable[[BulkResult], None]
+
+
+class RateLimiter:
+    """Spaces calls out to at most `rate` per second across all workers."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(self.next_at, now) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _is_transient(error: Exception) -> bool:
+    # Only failures where the server did not process the request, so resubmitting cannot create duplicates
+    if isinstance(error, httpx.HTTPStatusError):
+        return BaseAPIClient._should_retry("POST", response=error.response)
+    if isinstance(error, httpx.TransportError):
+        return BaseAPIClient._should_retry("POST", error=error)
+    return False
+
+
+async def run_bulk(
+    items: Iterable[T],
+    operation: Callable[[T], Awaitable[str]],
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    rate_limit: Optional[float] = None,
+    max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+    on_progress: Optional[BulkProgressHook] = None,
+) -> List[BulkResult]:
+    """
+    Applies `operation` to every item with at most `concurrency` in flight and at most `rate_limit` started per
+    second. Items are pulled from the iterable only as workers free up, so large batches are never materialized.
+    Transient failures are retried here, with exponential backoff and through the rate limiter, so `operation`
+    must send its request with the transport's own retries disabled. Failures do not stop the batch; they are
+    reported in the results, which are returned in item order.
+
+    :param operation: Performs the request for one item, without retries, and returns the ID of the affected task.
+    :param on_progress: Called with each item's result as soon as the item finishes.
+    """
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    pending = iter(enumerate(items))
+    results: List[BulkResult] = []
+
+    async def process(index: int, item: T) -> BulkResult:
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                task_id = await operation(item)
+                return BulkResult(index=index, status=BulkItemStatus.SUCCEEDED, task_id=task_id, attempts=attempt)
+            except Exception as e:
+                if attempt > max_retries or not _is_transient(e):
+                    return BulkResult(index=index, status=BulkItemStatus.FAILED, attempts=attempt, error=repr(e))
+                delay = random.uniform(0, min(DEFAULT_INITIAL_RETRY_DELAY * 2 ** attempt, DEFAULT_MAX_RETRY_DELAY))
+                logger.debug(f"Bulk item {index} failed with {e!r}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def worker() -> None:
+        for index, item in pending:
+            result = await process(index, item)
+            results.append(result)
+            if on_progress is not None:
+                on_progress(result)
+
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return sorted(results, key=lambda result: result.index)
+
+
+def run_sync(run: Callable[[], Coroutine[None, None, T]]) -> T:
+    """
+    Runs the coroutine returned by `run` to completion from synchronous code. When called from a thread that
+    already runs an event loop, e.g. in a notebook, the coroutine gets its own loop on a separate thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="agentex-bulk") as pool:
+        return pool.submit(lambda: asyncio.run(run())).result()
@@ -0,0 +1,43 @@
+from typing import Any, AsyncIterator, Collection, Dict, Iterator, Optional, Type, TypeVar
+
+from agentex.client.types.pagination import NDJSON_CONTENT_TYPE
+from agentex.utils.model_utils import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+NDJSON_HEADERS = {"Accept": NDJSON_CONTENT_TYPE}
+
+
+def projection_params(fields: Optional[Collection[str]] = None) -> Dict[str, str]:
+    """
+    Query parameters that ask the server to return only the given top level fields. The id is always included so
+    projected items can still be told apart.
+    """
+    if not fields:
+        return {}
+    names = ["id"] + [str(getattr(field, "value", field)) for field in fields if field != "id"]
+    return {"fields": ",".join(dict.fromkeys(names))}
+
+
+def page_params(
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"limit": limit, **projection_params(fields)}
+    if cursor is not None:
+        params["cursor"] = cursor
+    return params
+
+
+def parse_ndjson(lines: Iterator[str], model: Type[T]) -> Iterator[T]:
+    """Validates one item per line as it arrives, so only the current line is held in memory."""
+    for line in lines:
+        if line.strip():
+            yield model.model_validate_json(line)
+
+
+async def aparse_ndjson(lines: AsyncIterator[str], model: Type[T]) -> AsyncIterator[T]:
+    async for line in lines:
+        if line.strip():
+            yield model.model_validate_json(line)
@@ -1,10 +1,57 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, Type, TypeVar
+
+import httpx
+
+from agentex.utils.model_utils import BaseModel
 
 if TYPE_CHECKING:
     from agentex.client.agentex import Agentex, AsyncAgentex
 
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+
+class APIRequest(Generic[T]):
+    """
+    A single endpoint call: the HTTP request to send and how to turn its response into a result.
+
+    Each endpoint is defined once as a function returning an APIRequest. The sync and async resources only differ
+    in how they send it, so both clients always build identical requests and parse responses identically.
+    """
+
+    def __init__(self, method: str, path: str, parse: Callable[[httpx.Response], T], **kwargs: Any) -> None:
+        self.method = method
+        self.path = path
+        self.parse = parse
+        self.kwargs = kwargs
+
+
+def parse_model(model: Type[M]) -> Callable[[httpx.Response], M]:
+    def parse(response: httpx.Response) -> M:
+        response.raise_for_status()
+        return model.model_validate_json(response.content)
+    return parse
+
+
+def parse_model_list(model: Type[M]) -> Callable[[httpx.Response], list[M]]:
+    def parse(response: httpx.Response) -> list[M]:
+        response.raise_for_status()
+        return [model.model_validate(item) for item in response.json()]
+    return parse
+
+
+def parse_none(response: httpx.Response) -> None:
+    response.raise_for_status()
+
+
+def parse_optional_json(response: httpx.Response) -> Optional[Any]:
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
 
 class SyncAPIResource:
 
@@ -15,6 +62,11 @@ class SyncAPIResource:
         self._patch = client.patch
         self._put = client.put
         self._delete = client.delete
+        self._stream = client.stream
+
+    def _send(self, request: APIRequest[T], max_retries: Optional[int] = None) -> T:
+        response = self._client.request(request.method, request.path, max_retries=max_retries, **request.kwargs)
+        return request.parse(response)
 
 
 class AsyncAPIResource:
@@ -26,3 +78,8 @@ class AsyncAPIResource:
         self._patch = client.patch
         self._put = client.put
         self._delete = client.delete
+        self._stream = client.stream
+
+    async def _send(self, request: APIRequest[T], max_retries: Optional[int] = None) -> T:
+        response = await self._client.request(request.method, request.path, max_retries=max_retries, **request.kwargs)
+        return request.parse(response)
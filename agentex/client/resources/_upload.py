@@ -0,0 +1,95 @@
+from typing import IO, Callable, Optional, Tuple
+
+from agentex.utils.logging import make_logger
+from agentex.utils.streams import read_chunk, skip
+
+logger = make_logger(__name__)
+
+DEFAULT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_UPLOAD_CHUNK_RETRIES = 3
+
+UploadProgressHook = Callable[[int], None]
+
+
+def content_range(offset: int, size: int, total: Optional[int]) -> str:
+    total_str = "*" if total is None else str(total)
+    if size == 0:
+        return f"bytes */{total_str}"
+    return f"bytes {offset}-{offset + size - 1}/{total_str}"
+
+
+class ChunkedUpload:
+    """
+    The client side of a resumable chunked upload, shared by the sync and async resources.
+
+    The package is read one chunk ahead, so the total size is only needed once the last chunk is sent and the
+    package can be a stream that is still being produced. Only the chunk in flight and the next one are held in
+    memory. If a chunk fails, the upload resumes from the offset the server reports; a new process can resume an
+    upload the same way, as long as it reads the same package.
+    """
+
+    def __init__(
+        self,
+        package: IO[bytes],
+        upload_id: str,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        on_progress: Optional[UploadProgressHook] = None,
+    ):
+        self.package = package
+        self.upload_id = upload_id
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.offset = 0
+        self.chunk = b""
+        self.next_chunk = b""
+
+    def start(self, offset: int) -> None:
+        """Positions the upload at the offset the server already has. Reads from the package, so it may block."""
+        logger.info(f"Uploading package as {self.upload_id} from offset {offset}; pass this ID to resume it")
+        skip(self.package, offset)
+        self.offset = offset
+        self.chunk = read_chunk(self.package, self.chunk_size)
+        self.next_chunk = read_chunk(self.package, self.chunk_size)
+        self._report()
+
+    @property
+    def is_last(self) -> bool:
+        return not self.next_chunk
+
+    def pending(self) -> Tuple[int, bytes, Optional[int]]:
+        """The offset, content and, for the last chunk, total size of the chunk to send next."""
+        total = self.offset + len(self.chunk) if self.is_last else None
+        return self.offset, self.chunk, total
+
+    def advance(self) -> bool:
+        """Records that the pending chunk was received. Returns whether the upload is complete. May block."""
+        self.offset += len(self.chunk)
+        self._report()
+        if self.is_last:
+            return True
+        self.chunk = self.next_chunk
+        self.next_chunk = read_chunk(self.package, self.chunk_size)
+        return False
+
+    @property
+    def is_received(self) -> bool:
+        """
+        Whether the server already has all of the pending chunk, e.g. because only the response to it was lost. The
+        chunk then needs no request of its own; only the last one is still sent, empty, to complete the upload.
+        """
+        return not self.chunk and not self.is_last
+
+    def resume_from(self, server_offset: int) -> bool:
+        """
+        Drops the part of the pending chunk the server already received. Returns False if the server's offset is
+        outside the pending chunk, in which case the data it needs is no longer available.
+        """
+        if not self.offset <= server_offset <= self.offset + len(self.chunk):
+            return False
+        self.chunk = self.chunk[server_offset - self.offset:]
+        self.offset = server_offset
+        return True
+
+    def _report(self) -> None:
+        if self.on_progress is not None:
+            self.on_progress(self.offset)
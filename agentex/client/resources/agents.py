@@ -2,49 +2,244 @@ from __future__ import annotations
 
 __all__ = ["AgentsResource", "AsyncAgentsResource"]
 
-from agentex.client.resources._resource import SyncAPIResource, AsyncAPIResource
+import asyncio
+from typing import IO, AsyncIterator, Collection, Iterator, List, Optional, Type, Union
+
+import httpx
+
+from agentex.client.resources._pagination import (
+    NDJSON_HEADERS,
+    aparse_ndjson,
+    page_params,
+    parse_ndjson,
+    projection_params,
+)
+from agentex.client.resources._resource import (
+    APIRequest,
+    AsyncAPIResource,
+    SyncAPIResource,
+    parse_model,
+    parse_model_list,
+    parse_none,
+)
+from agentex.client.resources._upload import (
+    DEFAULT_UPLOAD_CHUNK_RETRIES,
+    DEFAULT_UPLOAD_CHUNK_SIZE,
+    ChunkedUpload,
+    UploadProgressHook,
+    content_range,
+)
 from agentex.client.types._types import FileTypes
-from agentex.client.types.agents import CreateAgentRequest, AgentModel
+from agentex.client.types.agents import (
+    AgentField,
+    AgentModel,
+    AgentPackageUpload,
+    CreateAgentRequest,
+    PartialAgentModel,
+)
+from agentex.client.types.pagination import DEFAULT_PAGE_SIZE, Page
 
+ListedAgent = Union[AgentModel, PartialAgentModel]
 
-class AgentsResource(SyncAPIResource):
 
+def _agent_model(fields: Optional[Collection[AgentField]]) -> Type[ListedAgent]:
+    return PartialAgentModel if fields else AgentModel
+
+
+class _AgentRequests:
+    """The agent endpoints, shared by AgentsResource and AsyncAgentsResource."""
+
+    @staticmethod
     def create(
-        self,
-        *,
-        agent_package: FileTypes,
         request: CreateAgentRequest,
-    ) -> AgentModel:
-        body = {"request": request.to_json()}
-        response = self._post(
+        agent_package: Optional[FileTypes],
+        upload_id: Optional[str],
+    ) -> APIRequest[AgentModel]:
+        if (agent_package is None) == (upload_id is None):
+            raise ValueError("Exactly one of agent_package and upload_id must be given")
+        if upload_id is not None:
+            return APIRequest(
+                "POST",
+                "/agents",
+                parse_model(AgentModel),
+                data={"request": request.to_json(), "upload_id": upload_id},
+            )
+        return APIRequest(
+            "POST",
             "/agents",
-            data=body,
+            parse_model(AgentModel),
+            data={"request": request.to_json()},
             files=[("agent_package", agent_package)],
         )
-        response = response.json()
-        print("AGENT RESPONSE",
-            response
-        )
-        return AgentModel.from_dict(response)
 
-    def get(self, agent_id: str) -> AgentModel:
-        response = self._get(
-            f"/agents/{agent_id}",
+    @staticmethod
+    def start_upload() -> APIRequest[AgentPackageUpload]:
+        return APIRequest("POST", "/agents/uploads", parse_model(AgentPackageUpload))
+
+    @staticmethod
+    def get_upload(upload_id: str) -> APIRequest[AgentPackageUpload]:
+        return APIRequest("GET", f"/agents/uploads/{upload_id}", parse_model(AgentPackageUpload))
+
+    @staticmethod
+    def upload_chunk(upload_id: str, offset: int, chunk: bytes, total: Optional[int]) -> APIRequest[AgentPackageUpload]:
+        return APIRequest(
+            "PUT",
+            f"/agents/uploads/{upload_id}",
+            parse_model(AgentPackageUpload),
+            content=chunk,
+            headers={
+                "Content-Range": content_range(offset, len(chunk), total),
+                "Content-Type": "application/octet-stream",
+            },
         )
-        response = response.json()
-        return AgentModel.from_dict(response)
 
-    def list(self):
-        response = self._get(
+    @staticmethod
+    def get(agent_id: str) -> APIRequest[AgentModel]:
+        return APIRequest("GET", f"/agents/{agent_id}", parse_model(AgentModel))
+
+    @staticmethod
+    def list() -> APIRequest[List[AgentModel]]:
+        return APIRequest("GET", "/agents", parse_model_list(AgentModel))
+
+    @staticmethod
+    def list_page(
+        limit: int,
+        cursor: Optional[str],
+        fields: Optional[Collection[AgentField]],
+    ) -> APIRequest[Page[ListedAgent]]:
+        return APIRequest(
+            "GET",
             "/agents",
+            parse_model(Page[_agent_model(fields)]),
+            params=page_params(limit=limit, cursor=cursor, fields=fields),
         )
-        response = response.json()
-        return [AgentModel.from_dict(agent) for agent in response]
+
+    @staticmethod
+    def stream(fields: Optional[Collection[AgentField]]) -> APIRequest[Type[ListedAgent]]:
+        # Streamed responses are parsed line by line by the caller; `parse` only checks the status
+        def parse(response: httpx.Response) -> Type[ListedAgent]:
+            response.raise_for_status()
+            return _agent_model(fields)
+        return APIRequest("GET", "/agents", parse, params=projection_params(fields), headers=NDJSON_HEADERS)
+
+    @staticmethod
+    def delete(agent_name: str) -> APIRequest[None]:
+        return APIRequest("DELETE", f"/agents/{agent_name}", parse_none)
+
+
+class AgentsResource(SyncAPIResource):
+
+    def create(
+        self,
+        *,
+        request: CreateAgentRequest,
+        agent_package: Optional[FileTypes] = None,
+        upload_id: Optional[str] = None,
+    ) -> AgentModel:
+        """
+        Create an agent from its package, either sent along in the request or uploaded beforehand.
+
+        :param agent_package: The tar.gz build context to send in a single multipart request.
+        :param upload_id: The ID of a completed upload_package.
+        """
+        return self._send(_AgentRequests.create(request, agent_package, upload_id))
+
+    def upload_package(
+        self,
+        package: IO[bytes],
+        *,
+        upload_id: Optional[str] = None,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        max_chunk_retries: int = DEFAULT_UPLOAD_CHUNK_RETRIES,
+        on_progress: Optional[UploadProgressHook] = None,
+    ) -> str:
+        """
+        Upload an agent package in chunks and return the upload ID to create the agent with.
+
+        The package is read as it is sent, so it can be a stream that is still being written, and only two chunks
+        are held in memory. A failed chunk is resent from the offset the server confirms.
+
+        :param package: The package to upload, read from its current position.
+        :param upload_id: Resume this upload instead of starting a new one. The package must be the same one, and
+            is skipped ahead to the offset the server already has.
+        :param chunk_size: The size of the chunks to send.
+        :param max_chunk_retries: How often a chunk may fail in a row before the upload is given up.
+        :param on_progress: Called with the number of bytes the server has received after every chunk.
+        """
+        if upload_id is None:
+            status = self._send(_AgentRequests.start_upload())
+        else:
+            status = self._send(_AgentRequests.get_upload(upload_id))
+        if status.complete:
+            return status.upload_id
+        upload = ChunkedUpload(package, status.upload_id, chunk_size=chunk_size, on_progress=on_progress)
+        upload.start(status.offset)
+        failures = 0
+        while True:
+            try:
+                status = self._send(_AgentRequests.upload_chunk(upload.upload_id, *upload.pending()))
+            except (httpx.HTTPStatusError, httpx.TransportError):
+                failures += 1
+                if failures > max_chunk_retries:
+                    raise
+                status = self._send(_AgentRequests.get_upload(upload.upload_id))
+                if status.complete:
+                    return upload.upload_id
+                if not upload.resume_from(status.offset):
+                    raise
+                if upload.is_received:
+                    upload.advance()
+                continue
+            failures = 0
+            if upload.advance():
+                return upload.upload_id
+
+    def get(self, agent_id: str) -> AgentModel:
+        return self._send(_AgentRequests.get(agent_id))
+
+    def list(self) -> List[AgentModel]:
+        return self._send(_AgentRequests.list())
+
+    def list_page(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Collection[AgentField]] = None,
+    ) -> Page[ListedAgent]:
+        """
+        Fetch one page of agents.
+
+        :param limit: The maximum number of agents on the page.
+        :param cursor: The `next_cursor` of the previous page, or None for the first page.
+        :param fields: Only return these fields, e.g. `[AgentField.STATUS]`.
+            Agents are then returned as PartialAgentModel.
+        """
+        return self._send(_AgentRequests.list_page(limit, cursor, fields))
+
+    def iter(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Collection[AgentField]] = None,
+    ) -> Iterator[ListedAgent]:
+        """Iterate over all agents, fetching the next page only once the previous one is consumed."""
+        cursor = None
+        while True:
+            page = self.list_page(limit=page_size, cursor=cursor, fields=fields)
+            yield from page.items
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    def stream(self, *, fields: Optional[Collection[AgentField]] = None) -> Iterator[ListedAgent]:
+        """Stream all agents as NDJSON in a single response, parsing each agent as its line arrives."""
+        request = _AgentRequests.stream(fields)
+        with self._stream(request.method, request.path, **request.kwargs) as response:
+            yield from parse_ndjson(response.iter_lines(), request.parse(response))
 
     def delete(self, agent_name: str) -> None:
-        self._delete(
-            f"/agents/{agent_name}",
-        )
+        self._send(_AgentRequests.delete(agent_name))
 
 
 class AsyncAgentsResource(AsyncAPIResource):
@@ -52,33 +247,104 @@ class AsyncAgentsResource(AsyncAPIResource):
     async def create(
         self,
         *,
-        agent_package: FileTypes,
         request: CreateAgentRequest,
+        agent_package: Optional[FileTypes] = None,
+        upload_id: Optional[str] = None,
     ) -> AgentModel:
-        body = {"request": request.to_json()}
-        response = await self._post(
-            "/agents",
-            data=body,
-            files={"agent_package": agent_package},
-        )
-        response = response.json()
-        return AgentModel.from_dict(response)
+        """
+        Create an agent from its package, either sent along in the request or uploaded beforehand.
+
+        :param agent_package: The tar.gz build context to send in a single multipart request.
+        :param upload_id: The ID of a completed upload_package.
+        """
+        return await self._send(_AgentRequests.create(request, agent_package, upload_id))
+
+    async def upload_package(
+        self,
+        package: IO[bytes],
+        *,
+        upload_id: Optional[str] = None,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        max_chunk_retries: int = DEFAULT_UPLOAD_CHUNK_RETRIES,
+        on_progress: Optional[UploadProgressHook] = None,
+    ) -> str:
+        """
+        Upload an agent package in chunks and return the upload ID to create the agent with. See
+        AgentsResource.upload_package. The package is read on a worker thread, so it may be a blocking stream.
+        """
+        if upload_id is None:
+            status = await self._send(_AgentRequests.start_upload())
+        else:
+            status = await self._send(_AgentRequests.get_upload(upload_id))
+        if status.complete:
+            return status.upload_id
+        upload = ChunkedUpload(package, status.upload_id, chunk_size=chunk_size, on_progress=on_progress)
+        await asyncio.to_thread(upload.start, status.offset)
+        failures = 0
+        while True:
+            try:
+                status = await self._send(_AgentRequests.upload_chunk(upload.upload_id, *upload.pending()))
+            except (httpx.HTTPStatusError, httpx.TransportError):
+                failures += 1
+                if failures > max_chunk_retries:
+                    raise
+                status = await self._send(_AgentRequests.get_upload(upload.upload_id))
+                if status.complete:
+                    return upload.upload_id
+                if not upload.resume_from(status.offset):
+                    raise
+                if upload.is_received:
+                    await asyncio.to_thread(upload.advance)
+                continue
+            failures = 0
+            if await asyncio.to_thread(upload.advance):
+                return upload.upload_id
 
     async def get(self, agent_id: str) -> AgentModel:
-        response = await self._get(
-            f"/agents/{agent_id}",
-        )
-        response = response.json()
-        return AgentModel.from_dict(response)
+        return await self._send(_AgentRequests.get(agent_id))
 
-    async def list(self):
-        response = await self._get(
-            "/agents",
-        )
-        response = response.json()
-        return [AgentModel.from_dict(agent) for agent in response]
+    async def list(self) -> List[AgentModel]:
+        return await self._send(_AgentRequests.list())
+
+    async def list_page(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Collection[AgentField]] = None,
+    ) -> Page[ListedAgent]:
+        """
+        Fetch one page of agents.
+
+        :param limit: The maximum number of agents on the page.
+        :param cursor: The `next_cursor` of the previous page, or None for the first page.
+        :param fields: Only return these fields, e.g. `[AgentField.STATUS]`.
+            Agents are then returned as PartialAgentModel.
+        """
+        return await self._send(_AgentRequests.list_page(limit, cursor, fields))
+
+    async def iter(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Collection[AgentField]] = None,
+    ) -> AsyncIterator[ListedAgent]:
+        """Iterate over all agents, fetching the next page only once the previous one is consumed."""
+        cursor = None
+        while True:
+            page = await self.list_page(limit=page_size, cursor=cursor, fields=fields)
+            for agent in page.items:
+                yield agent
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    async def stream(self, *, fields: Optional[Collection[AgentField]] = None) -> AsyncIterator[ListedAgent]:
+        """Stream all agents as NDJSON in a single response, parsing each agent as its line arrives."""
+        request = _AgentRequests.stream(fields)
+        async with self._stream(request.method, request.path, **request.kwargs) as response:
+            async for agent in aparse_ndjson(response.aiter_lines(), request.parse(response)):
+                yield agent
 
     async def delete(self, agent_name: str) -> None:
-        await self._delete(
-            f"/agents/{agent_name}",
-        )
+        await self._send(_AgentRequests.delete(agent_name))
@@ -2,98 +2,487 @@ from __future__ import annotations
 
 __all__ = ["TasksResource", "AsyncTasksResource"]
 
-from typing import Optional
+import asyncio
+from typing import Any, AsyncIterator, Collection, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 
-from ._resource import SyncAPIResource, AsyncAPIResource
-from ..types.tasks import CreateTaskResponse, ModifyTaskRequest
+import httpx
+from pydantic import TypeAdapter
+
+from .._client import RETRYABLE_STATUS_CODES, _parse_retry_after
+from .._sse import SSE_CONTENT_TYPE, aiter_sse
+from ._bulk import DEFAULT_BULK_CONCURRENCY, DEFAULT_BULK_MAX_RETRIES, BulkProgressHook, run_bulk, run_sync
+from ._pagination import NDJSON_HEADERS, aparse_ndjson, page_params, parse_ndjson, projection_params
+from ._resource import (
+    APIRequest,
+    AsyncAPIResource,
+    SyncAPIResource,
+    parse_model,
+    parse_model_list,
+    parse_none,
+    parse_optional_json,
+)
+from ..types.bulk import BulkResult
+from ..types.events import StatusEvent, TaskEvent
+from ..types.pagination import DEFAULT_PAGE_SIZE, Page
+from ..types.tasks import CreateTaskRequest, CreateTaskResponse, ModifyTaskRequest, PartialTaskModel, TaskField
+from ...constants import DEFAULT_ROOT_THREAD_NAME
+from ...utils.logging import make_logger
+from ...src.entities.actions import ArtifactSummary
+from ...src.entities.state import ThreadSlice
 from ...src.entities.task import TaskModel
 
+logger = make_logger(__name__)
 
-class TasksResource(SyncAPIResource):
+ListedTask = Union[TaskModel, PartialTaskModel]
 
-    def create(
-        self,
-        *,
-        agent_name: str,
-        prompt: str,
-        require_approval: Optional[bool] = False,
-    ) -> CreateTaskResponse:
-        response = self._post(
+STATUS_FIELDS = (TaskField.STATUS, TaskField.STATUS_REASON)
+DEFAULT_RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+_task_event_adapter = TypeAdapter(TaskEvent)
+
+
+def _task_model(fields: Optional[Collection[TaskField]]) -> Type[ListedTask]:
+    return PartialTaskModel if fields else TaskModel
+
+
+def _slice_params(tail: Optional[int], since_version: Optional[int]) -> Dict[str, int]:
+    params = {}
+    if tail is not None:
+        params["tail"] = tail
+    if since_version is not None:
+        params["since_version"] = since_version
+    return params
+
+
+class _TaskRequests:
+    """The task endpoints, shared by TasksResource and AsyncTasksResource."""
+
+    @staticmethod
+    def create(agent_name: str, prompt: str, require_approval: Optional[bool]) -> APIRequest[CreateTaskResponse]:
+        return APIRequest(
+            "POST",
             "/tasks",
+            parse_model(CreateTaskResponse),
             json={
                 "agent_name": agent_name,
                 "prompt": prompt,
                 "require_approval": require_approval,
             },
         )
-        response = response.json()
-        return CreateTaskResponse.from_dict(response)
 
-    def get(self, task_id: str) -> TaskModel:
-        response = self._get(
+    @staticmethod
+    def get(task_id: str, fields: Optional[Collection[TaskField]]) -> APIRequest[ListedTask]:
+        return APIRequest(
+            "GET",
             f"/tasks/{task_id}",
+            parse_model(_task_model(fields)),
+            params=projection_params(fields),
         )
-        response = response.json()
-        return TaskModel.from_dict(response)
 
-    def list(self):
-        response = self._get(
-            "/tasks",
+    @staticmethod
+    def get_messages(
+        task_id: str,
+        thread_name: str,
+        tail: Optional[int],
+        since_version: Optional[int],
+    ) -> APIRequest[ThreadSlice]:
+        return APIRequest(
+            "GET",
+            f"/tasks/{task_id}/threads/{thread_name}/messages",
+            parse_model(ThreadSlice),
+            params=_slice_params(tail, since_version),
         )
-        response = response.json()
-        return [TaskModel.from_dict(task) for task in response]
 
-    def delete(self, task_id: str) -> None:
-        self._delete(
-            f"/tasks/{task_id}",
+    @staticmethod
+    def get_context_value(task_id: str, key: str) -> APIRequest[Optional[Any]]:
+        return APIRequest("GET", f"/tasks/{task_id}/context/{key}", parse_optional_json)
+
+    @staticmethod
+    def list_artifacts(task_id: str) -> APIRequest[List[ArtifactSummary]]:
+        return APIRequest("GET", f"/tasks/{task_id}/artifacts", parse_model_list(ArtifactSummary))
+
+    @staticmethod
+    def list() -> APIRequest[List[TaskModel]]:
+        return APIRequest("GET", "/tasks", parse_model_list(TaskModel))
+
+    @staticmethod
+    def list_page(
+        limit: int,
+        cursor: Optional[str],
+        fields: Optional[Collection[TaskField]],
+    ) -> APIRequest[Page[ListedTask]]:
+        return APIRequest(
+            "GET",
+            "/tasks",
+            parse_model(Page[_task_model(fields)]),
+            params=page_params(limit=limit, cursor=cursor, fields=fields),
         )
 
-    def modify(self, task_id: str, modification_request: ModifyTaskRequest) -> None:
-        self._post(
+    @staticmethod
+    def stream(fields: Optional[Collection[TaskField]]) -> APIRequest[Type[ListedTask]]:
+        # Streamed responses are parsed line by line by the caller; `parse` only checks the status
+        def parse(response: httpx.Response) -> Type[ListedTask]:
+            response.raise_for_status()
+            return _task_model(fields)
+        return APIRequest("GET", "/tasks", parse, params=projection_params(fields), headers=NDJSON_HEADERS)
+
+    @staticmethod
+    def delete(task_id: str) -> APIRequest[None]:
+        return APIRequest("DELETE", f"/tasks/{task_id}", parse_none)
+
+    @staticmethod
+    def modify(task_id: str, modification_request: ModifyTaskRequest) -> APIRequest[None]:
+        return APIRequest(
+            "POST",
             f"/tasks/{task_id}/modify",
+            parse_none,
             json=modification_request.to_dict(),
         )
 
 
+class TasksResource(SyncAPIResource):
+
+    def create(
+        self,
+        *,
+        agent_name: str,
+        prompt: str,
+        require_approval: Optional[bool] = False,
+    ) -> CreateTaskResponse:
+        return self._send(_TaskRequests.create(agent_name, prompt, require_approval))
+
+    def get(self, task_id: str, fields: Optional[Collection[TaskField]] = None) -> ListedTask:
+        return self._send(_TaskRequests.get(task_id, fields))
+
+    def get_status(self, task_id: str) -> PartialTaskModel:
+        """Fetch only the task's status and status reason."""
+        return self.get(task_id, fields=STATUS_FIELDS)
+
+    def get_messages(
+        self,
+        task_id: str,
+        thread_name: str = DEFAULT_ROOT_THREAD_NAME,
+        *,
+        tail: Optional[int] = None,
+        since_version: Optional[int] = None,
+    ) -> ThreadSlice:
+        """
+        Fetch part of a thread of the task.
+
+        :param tail: Only return the last `tail` messages.
+        :param since_version: Only return the messages added after this version of the thread, as returned by a
+            previous call. If the thread was rewritten since, the whole thread is returned with `reset` set.
+        """
+        return self._send(_TaskRequests.get_messages(task_id, thread_name, tail, since_version))
+
+    def get_context_value(self, task_id: str, key: str) -> Optional[Any]:
+        """Fetch a single value of the task's context, or None if it is not set."""
+        return self._send(_TaskRequests.get_context_value(task_id, key))
+
+    def list_artifacts(self, task_id: str) -> List[ArtifactSummary]:
+        """List the task's artifacts without their content."""
+        return self._send(_TaskRequests.list_artifacts(task_id))
+
+    def list(self) -> List[TaskModel]:
+        return self._send(_TaskRequests.list())
+
+    def list_page(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Collection[TaskField]] = None,
+    ) -> Page[ListedTask]:
+        """
+        Fetch one page of tasks.
+
+        :param limit: The maximum number of tasks on the page.
+        :param cursor: The `next_cursor` of the previous page, or None for the first page.
+        :param fields: Only return these fields, e.g. `[TaskField.STATUS]` to leave out threads and context.
+            Tasks are then returned as PartialTaskModel.
+        """
+        return self._send(_TaskRequests.list_page(limit, cursor, fields))
+
+    def iter(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Collection[TaskField]] = None,
+    ) -> Iterator[ListedTask]:
+        """Iterate over all tasks, fetching the next page only once the previous one is consumed."""
+        cursor = None
+        while True:
+            page = self.list_page(limit=page_size, cursor=cursor, fields=fields)
+            yield from page.items
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    def stream(self, *, fields: Optional[Collection[TaskField]] = None) -> Iterator[ListedTask]:
+        """Stream all tasks as NDJSON in a single response, parsing each task as its line arrives."""
+        request = _TaskRequests.stream(fields)
+        with self._stream(request.method, request.path, **request.kwargs) as response:
+            yield from parse_ndjson(response.iter_lines(), request.parse(response))
+
+    def delete(self, task_id: str) -> None:
+        self._send(_TaskRequests.delete(task_id))
+
+    def modify(self, task_id: str, modification_request: ModifyTaskRequest) -> None:
+        self._send(_TaskRequests.modify(task_id, modification_request))
+
+    def create_many(
+        self,
+        requests: Iterable[CreateTaskRequest],
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+        on_progress: Optional[BulkProgressHook] = None,
+    ) -> List[BulkResult]:
+        """Submit many tasks concurrently. See AsyncTasksResource.create_many."""
+        async def run() -> List[BulkResult]:
+            async with self._client.to_async() as agentex:
+                return await agentex.tasks.create_many(
+                    requests,
+                    concurrency=concurrency,
+                    rate_limit=rate_limit,
+                    max_retries=max_retries,
+                    on_progress=on_progress,
+                )
+        return run_sync(run)
+
+    def modify_many(
+        self,
+        modifications: Iterable[Tuple[str, ModifyTaskRequest]],
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+        on_progress: Optional[BulkProgressHook] = None,
+    ) -> List[BulkResult]:
+        """Modify many tasks concurrently. See AsyncTasksResource.modify_many."""
+        async def run() -> List[BulkResult]:
+            async with self._client.to_async() as agentex:
+                return await agentex.tasks.modify_many(
+                    modifications,
+                    concurrency=concurrency,
+                    rate_limit=rate_limit,
+                    max_retries=max_retries,
+                    on_progress=on_progress,
+                )
+        return run_sync(run)
+
+
 class AsyncTasksResource(AsyncAPIResource):
 
     async def create(
         self,
         *,
-        agent: str,
+        agent_name: str,
         prompt: str,
+        require_approval: Optional[bool] = False,
     ) -> CreateTaskResponse:
-        response = await self._post(
-            "/tasks",
-            json={
-                "agent": agent,
-                "prompt": prompt,
-            },
-        )
-        response = response.json()
-        return CreateTaskResponse.from_dict(response)
+        return await self._send(_TaskRequests.create(agent_name, prompt, require_approval))
 
-    async def get(self, task_id: str) -> TaskModel:
-        response = await self._get(
-            f"/tasks/{task_id}",
-        )
-        response = response.json()
-        return TaskModel.from_dict(response)
+    async def get(self, task_id: str, fields: Optional[Collection[TaskField]] = None) -> ListedTask:
+        return await self._send(_TaskRequests.get(task_id, fields))
 
-    async def list(self):
-        response = await self._get(
-            "/tasks",
-        )
-        response = response.json()
-        return [TaskModel.from_dict(task) for task in response]
+    async def get_status(self, task_id: str) -> PartialTaskModel:
+        """Fetch only the task's status and status reason."""
+        return await self.get(task_id, fields=STATUS_FIELDS)
+
+    async def get_messages(
+        self,
+        task_id: str,
+        thread_name: str = DEFAULT_ROOT_THREAD_NAME,
+        *,
+        tail: Optional[int] = None,
+        since_version: Optional[int] = None,
+    ) -> ThreadSlice:
+        """
+        Fetch part of a thread of the task.
+
+        :param tail: Only return the last `tail` messages.
+        :param since_version: Only return the messages added after this version of the thread, as returned by a
+            previous call. If the thread was rewritten since, the whole thread is returned with `reset` set.
+        """
+        return await self._send(_TaskRequests.get_messages(task_id, thread_name, tail, since_version))
+
+    async def get_context_value(self, task_id: str, key: str) -> Optional[Any]:
+        """Fetch a single value of the task's context, or None if it is not set."""
+        return await self._send(_TaskRequests.get_context_value(task_id, key))
+
+    async def list_artifacts(self, task_id: str) -> List[ArtifactSummary]:
+        """List the task's artifacts without their content."""
+        return await self._send(_TaskRequests.list_artifacts(task_id))
+
+    async def list(self) -> List[TaskModel]:
+        return await self._send(_TaskRequests.list())
+
+    async def list_page(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Collection[TaskField]] = None,
+    ) -> Page[ListedTask]:
+        """
+        Fetch one page of tasks.
+
+        :param limit: The maximum number of tasks on the page.
+        :param cursor: The `next_cursor` of the previous page, or None for the first page.
+        :param fields: Only return these fields, e.g. `[TaskField.STATUS]` to leave out threads and context.
+            Tasks are then returned as PartialTaskModel.
+        """
+        return await self._send(_TaskRequests.list_page(limit, cursor, fields))
+
+    async def iter(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Collection[TaskField]] = None,
+    ) -> AsyncIterator[ListedTask]:
+        """Iterate over all tasks, fetching the next page only once the previous one is consumed."""
+        cursor = None
+        while True:
+            page = await self.list_page(limit=page_size, cursor=cursor, fields=fields)
+            for task in page.items:
+                yield task
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    async def stream(self, *, fields: Optional[Collection[TaskField]] = None) -> AsyncIterator[ListedTask]:
+        """Stream all tasks as NDJSON in a single response, parsing each task as its line arrives."""
+        request = _TaskRequests.stream(fields)
+        async with self._stream(request.method, request.path, **request.kwargs) as response:
+            async for task in aparse_ndjson(response.aiter_lines(), request.parse(response)):
+                yield task
+
+    async def watch(
+        self,
+        task_id: str,
+        *,
+        offset: Optional[int] = None,
+        reconnect: bool = True,
+    ) -> AsyncIterator[TaskEvent]:
+        """
+        Subscribe to the task's events as server-sent events: new messages, tool calls and status changes.
+
+        Only events after `offset` are sent, so a watcher that stopped can resume where it left off by passing the
+        offset of the last event it received. Dropped connections are resumed the same way. The subscription ends
+        once the task reaches a terminal status.
+
+        :param offset: Resume after the event with this offset. With None, the stream starts from the beginning.
+        :param reconnect: Whether to reconnect when the connection drops or the server is unavailable (429/5xx), with
+            growing delays while it keeps failing.
+        """
+        base_delay = delay = DEFAULT_RECONNECT_DELAY
+        while True:
+            params = {"offset": offset} if offset is not None else {}
+            try:
+                async with self._stream(
+                    "GET",
+                    f"/tasks/{task_id}/events",
+                    params=params,
+                    headers={"Accept": SSE_CONTENT_TYPE},
+                ) as response:
+                    response.raise_for_status()
+                    async for sse in aiter_sse(response.aiter_lines()):
+                        if sse.retry is not None:
+                            base_delay = delay = sse.retry / 1000
+                        if not sse.data:
+                            continue
+                        event = _task_event_adapter.validate_json(sse.data)
+                        offset = event.offset
+                        delay = base_delay
+                        yield event
+                        if isinstance(event, StatusEvent) and event.is_terminal:
+                            return
+            except httpx.TransportError as e:
+                if not reconnect:
+                    raise
+                logger.warning(f"Event stream of task {task_id} dropped ({e!r}), reconnecting in {delay:.1f}s")
+            except httpx.HTTPStatusError as e:
+                # A server that is restarting or overloaded is waited out like a dropped connection
+                if not reconnect or e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise
+                retry_after = _parse_retry_after(e.response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    delay = min(max(delay, retry_after), MAX_RECONNECT_DELAY)
+                logger.warning(
+                    f"Event stream of task {task_id} is unavailable ({e.response.status_code}), "
+                    f"reconnecting in {delay:.1f}s"
+                )
+            else:
+                if not reconnect:
+                    return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
 
     async def delete(self, task_id: str) -> None:
-        await self._delete(
-            f"/tasks/{task_id}",
-        )
+        await self._send(_TaskRequests.delete(task_id))
 
     async def modify(self, task_id: str, modification_request: ModifyTaskRequest) -> None:
-        await self._post(
-            f"/tasks/{task_id}/modify",
-            json=modification_request.to_dict(),
+        await self._send(_TaskRequests.modify(task_id, modification_request))
+
+    async def create_many(
+        self,
+        requests: Iterable[CreateTaskRequest],
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+        on_progress: Optional[BulkProgressHook] = None,
+    ) -> List[BulkResult]:
+        """
+        Submit many tasks concurrently. A failed submission does not stop the others; each one's outcome is
+        reported in the returned results, in request order.
+
+        :param concurrency: The maximum number of submissions in flight.
+        :param rate_limit: The maximum number of submissions started per second.
+        :param max_retries: How often a submission the server turned away (429/503) or never received is retried.
+        :param on_progress: Called with each submission's result as soon as it finishes.
+        """
+        async def create(request: CreateTaskRequest) -> str:
+            response = await self._send(
+                _TaskRequests.create(request.agent, request.prompt, request.require_approval),
+                max_retries=0,
+            )
+            return response.id
+
+        return await run_bulk(
+            requests,
+            create,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            max_retries=max_retries,
+            on_progress=on_progress,
+        )
+
+    async def modify_many(
+        self,
+        modifications: Iterable[Tuple[str, ModifyTaskRequest]],
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+        on_progress: Optional[BulkProgressHook] = None,
+    ) -> List[BulkResult]:
+        """
+        Send many (task ID, modification) pairs concurrently, with the same guarantees as create_many.
+        """
+        async def modify(modification: Tuple[str, ModifyTaskRequest]) -> str:
+            task_id, modification_request = modification
+            await self._send(_TaskRequests.modify(task_id, modification_request), max_retries=0)
+            return task_id
+
+        return await run_bulk(
+            modifications,
+            modify,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            max_retries=max_retries,
+            on_progress=on_progress,
         )
@@ -57,3 +57,50 @@ class AgentModel(BaseModel):
         None,
         description="The reason for the status of the action."
     )
+
+
+class AgentField(str, Enum):
+    ID = "id"
+    NAME = "name"
+    DESCRIPTION = "description"
+    STATUS = "status"
+    STATUS_REASON = "status_reason"
+
+
+class PartialAgentModel(BaseModel):
+    """An agent listed with a field projection. Only the requested fields are set, the others are None."""
+    id: str = Field(
+        ...,
+        description="The unique identifier of the agent."
+    )
+    name: Optional[str] = Field(
+        None,
+        description="The unique name of the agent."
+    )
+    description: Optional[str] = Field(
+        None,
+        description="The description of the action."
+    )
+    status: Optional[AgentStatus] = Field(
+        None,
+        description="The status of the action, indicating if it's building, ready, failed, etc."
+    )
+    status_reason: Optional[str] = Field(
+        None,
+        description="The reason for the status of the action."
+    )
+
+
+class AgentPackageUpload(BaseModel):
+    upload_id: str = Field(
+        ...,
+        description="The unique identifier of the upload session."
+    )
+    offset: int = Field(
+        0,
+        description="The number of bytes of the package the server has received so far."
+    )
+    complete: bool = Field(
+        False,
+        description="Whether the server has received the whole package."
+    )
@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import Field
+
+from agentex.utils.model_utils import BaseModel
+
+
+class BulkItemStatus(str, Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class BulkResult(BaseModel):
+    index: int = Field(
+        ...,
+        description="The position of the item in the submitted batch."
+    )
+    status: BulkItemStatus = Field(
+        ...,
+        description="Whether the item succeeded after all retries."
+    )
+    task_id: Optional[str] = Field(
+        None,
+        description="The ID of the created or modified task."
+    )
+    attempts: int = Field(
+        1,
+        description="The number of attempts made for the item."
+    )
+    error: Optional[str] = Field(
+        None,
+        description="The error of the last attempt, if the item failed."
+    )
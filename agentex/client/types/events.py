@@ -0,0 +1,89 @@
+from enum import Enum
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import Field
+
+from agentex.src.entities.llm import Message
+from agentex.src.entities.task import TaskStatus
+from agentex.utils.model_utils import BaseModel
+
+
+class TaskEventType(str, Enum):
+    MESSAGE = "message"
+    TOOL_CALL = "tool_call"
+    STATUS = "status"
+
+
+class BaseTaskEvent(BaseModel):
+    offset: int = Field(
+        ...,
+        description="The position of the event in the task's event stream. Pass the offset of the last received "
+                    "event to resume the stream after it."
+    )
+    task_id: str = Field(
+        ...,
+        description="The ID of the task the event belongs to."
+    )
+
+
+class MessageEvent(BaseTaskEvent):
+    type: Literal[TaskEventType.MESSAGE] = Field(
+        TaskEventType.MESSAGE,
+        description="The type of the event."
+    )
+    thread_name: str = Field(
+        ...,
+        description="The thread the message was added to."
+    )
+    message: Message = Field(
+        ...,
+        description="The new message."
+    )
+
+
+class ToolCallEvent(BaseTaskEvent):
+    type: Literal[TaskEventType.TOOL_CALL] = Field(
+        TaskEventType.TOOL_CALL,
+        description="The type of the event."
+    )
+    thread_name: str = Field(
+        ...,
+        description="The thread the tool call was made in."
+    )
+    tool_call_id: str = Field(
+        ...,
+        description="The ID of the tool call."
+    )
+    tool_name: str = Field(
+        ...,
+        description="The name of the tool being called."
+    )
+    arguments: str = Field(
+        "",
+        description="The JSON encoded arguments of the tool call."
+    )
+
+
+class StatusEvent(BaseTaskEvent):
+    type: Literal[TaskEventType.STATUS] = Field(
+        TaskEventType.STATUS,
+        description="The type of the event."
+    )
+    status: TaskStatus = Field(
+        ...,
+        description="The new status of the task."
+    )
+    status_reason: Optional[str] = Field(
+        None,
+        description="The reason for the new status."
+    )
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status != TaskStatus.RUNNING
+
+
+TaskEvent = Annotated[
+    Union[MessageEvent, ToolCallEvent, StatusEvent],
+    Field(discriminator="type")
+]
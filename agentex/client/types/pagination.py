@@ -0,0 +1,25 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import Field
+
+from agentex.utils.model_utils import BaseModel
+
+T = TypeVar("T")
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T] = Field(
+        default_factory=list,
+        description="The items of this page, in listing order."
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="The cursor to pass to fetch the next page, or None if this is the last page."
+    )
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import Optional, Literal, Annotated, Union
+from typing import Optional, Literal, Annotated, Union, Dict, Any
 
 from pydantic import Field
 
+from agentex.src.entities.state import Thread
+from agentex.src.entities.task import TaskStatus
 from agentex.utils.model_utils import BaseModel
 
 
@@ -72,3 +74,45 @@ ModifyTaskRequest = Annotated[
     Union[ApproveTaskRequest, CancelTaskRequest, InstructTaskRequest],
     Field(discriminator="type")
 ]
+
+
+class TaskField(str, Enum):
+    ID = "id"
+    AGENT_ID = "agent_id"
+    PROMPT = "prompt"
+    STATUS = "status"
+    STATUS_REASON = "status_reason"
+    THREADS = "threads"
+    CONTEXT = "context"
+
+
+class PartialTaskModel(BaseModel):
+    """A task listed with a field projection. Only the requested fields are set, the others are None."""
+    id: str = Field(
+        ...,
+        title="Unique Task ID",
+    )
+    agent_id: Optional[str] = Field(
+        None,
+        title="The ID of the agent that is responsible for this task",
+    )
+    prompt: Optional[str] = Field(
+        None,
+        title="The user's text prompt for the task",
+    )
+    status: Optional[TaskStatus] = Field(
+        None,
+        title="The current status of the task",
+    )
+    status_reason: Optional[str] = Field(
+        None,
+        title="The reason for the current task status",
+    )
+    threads: Optional[Dict[str, Thread]] = Field(
+        None,
+        title="The task's threads, if requested",
+    )
+    context: Optional[Dict[str, Any]] = Field(
+        None,
+        title="The task's context, if requested",
+    )
@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import contextvars
+import inspect
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from agentex.sdk.execution.loop_monitor import DEFAULT_LOOP_LAG_THRESHOLD, LoopLagMonitor
+from agentex.src.entities.actions import Action, ActionResponse
+from agentex.utils.logging import make_logger
+
+logger = make_logger(__name__)
+
+DEFAULT_BLOCKING_ACTION_WORKERS = 8
+DEFAULT_BLOCKING_ACTION_CONCURRENCY = 4
+
+# The pool futures started within the current `track_threads` block
+_started_threads: contextvars.ContextVar[Optional[List[Future]]] = contextvars.ContextVar(
+    "agentex_action_threads", default=None
+)
+
+
+def is_blocking(action: Action) -> bool:
+    """Whether the action must run off the event loop: declared `blocking`, or a synchronous `execute`."""
+    return action.blocking or not inspect.iscoroutinefunction(action.execute)
+
+
+def _execute_in_thread(action: Action) -> ActionResponse:
+    if inspect.iscoroutinefunction(action.execute):
+        # A coroutine that does blocking work gets a private event loop on the pool thread
+        return asyncio.run(action.execute())
+    return action.execute()
+
+
+@contextlib.contextmanager
+def track_threads() -> Iterator[List[Future]]:
+    """Collects the pool futures of the blocking actions started within the block, including by child tasks."""
+    threads: List[Future] = []
+    token = _started_threads.set(threads)
+    try:
+        yield threads
+    finally:
+        _started_threads.reset(token)
+
+
+def release_when_finished(threads: List[Future], release: Callable[[], None]) -> None:
+    """
+    Calls `release` once every thread has finished, right away if they all have.
+
+    A pool thread cannot be interrupted, so an execution that timed out or was cancelled may still be running
+    on it. Its permits are only returned, on the event loop, once it actually stops occupying the thread.
+    """
+    pending = [thread for thread in threads if not thread.done()]
+    if not pending:
+        release()
+        return
+    loop = asyncio.get_running_loop()
+    remaining = len(pending)
+
+    def on_finished() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if remaining == 0:
+            release()
+
+    def on_done(_: Future) -> None:
+        try:
+            loop.call_soon_threadsafe(on_finished)
+        except RuntimeError:
+            # The loop has closed, so nothing is waiting for the permit anymore
+            pass
+
+    for thread in pending:
+        thread.add_done_callback(on_done)
+
+
+class ActionExecutor:
+    """
+    Runs actions for take_action.
+
+    Non-blocking actions are awaited on the worker's event loop. Blocking actions run on a bounded thread pool
+    dedicated to actions, so they neither stall the loop nor starve the activity executor, and each action
+    class may only occupy a limited number of those threads at once. A loop-lag monitor reports when an
+    action that runs on the loop blocks it anyway, naming the actions that were in flight.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_BLOCKING_ACTION_WORKERS,
+        default_action_concurrency: int = DEFAULT_BLOCKING_ACTION_CONCURRENCY,
+        action_concurrency: Optional[Dict[str, int]] = None,
+        loop_lag_threshold: timedelta = DEFAULT_LOOP_LAG_THRESHOLD,
+    ):
+        """
+        :param max_workers: The number of threads available to blocking actions.
+        :param default_action_concurrency: The number of threads a single blocking action class may use at once.
+        :param action_concurrency: Per action name overrides of `default_action_concurrency`.
+        :param loop_lag_threshold: The event loop lag above which a warning is logged.
+        """
+        self.max_workers = max_workers
+        self.default_action_concurrency = default_action_concurrency
+        self.action_concurrency = action_concurrency or {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Counter = Counter()
+        self.loop_monitor = LoopLagMonitor(threshold=loop_lag_threshold, suspects=self._inline_actions_since)
+        self._inline: Counter = Counter()
+        self._inline_finished_at: Dict[str, float] = {}
+
+    def _inline_actions_since(self, since: float) -> List[str]:
+        # The monitor only wakes up once the blocking action has returned, so recently finished ones count too
+        return sorted(
+            name for name, count in self._inline.items()
+            if count > 0 or self._inline_finished_at.get(name, 0.0) >= since
+        )
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agentex-action")
+        return self._pool
+
+    def _semaphore(self, action_name: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(action_name)
+        if semaphore is None:
+            limit = self.action_concurrency.get(action_name, self.default_action_concurrency)
+            semaphore = asyncio.Semaphore(max(min(limit, self.max_workers), 1))
+            self._semaphores[action_name] = semaphore
+        return semaphore
+
+    async def execute(self, action: Action) -> ActionResponse:
+        self.loop_monitor.start()
+        action_name = action.action_name()
+        self.in_flight[action_name] += 1
+        try:
+            if is_blocking(action):
+                return await self._execute_blocking(action_name, action)
+            self._inline[action_name] += 1
+            try:
+                return await action.execute()
+            finally:
+                self._inline[action_name] -= 1
+                self._inline_finished_at[action_name] = time.monotonic()
+        finally:
+            self.in_flight[action_name] -= 1
+
+    async def _execute_blocking(self, action_name: str, action: Action) -> ActionResponse:
+        semaphore = self._semaphore(action_name)
+        await semaphore.acquire()
+        try:
+            # Carry the activity context over so heartbeats and cancellation checks work on the pool thread
+            context = contextvars.copy_context()
+            thread = self.pool.submit(context.run, _execute_in_thread, action)
+        except BaseException:
+            semaphore.release()
+            raise
+        threads = _started_threads.get()
+        if threads is not None:
+            threads.append(thread)
+        # Hold the permit until the thread is free again, even if this execution is abandoned before then
+        release_when_finished([thread], semaphore.release)
+        return await asyncio.wrap_future(thread)
+
+    def shutdown(self) -> None:
+        self.loop_monitor.stop()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,269 @@
+import asyncio
+import time
+from datetime import timedelta
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import Field
+from temporalio.common import MetricMeter
+
+from agentex.sdk.execution.action_executor import release_when_finished, track_threads
+from agentex.src.entities.actions import ActionPolicy, ActionRegistry, ActionResponse
+from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
+
+logger = make_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+
+    def __init__(self, action_name: str, retry_after: timedelta):
+        super().__init__(
+            f"Circuit for action {action_name} is open after repeated failures, "
+            f"retry in {retry_after.total_seconds():.1f}s"
+        )
+        self.action_name = action_name
+        self.retry_after = retry_after
+
+
+class ActionPolicyState(BaseModel):
+    action_name: str
+    in_flight: int = Field(0, description="Executions currently running.")
+    waiting: int = Field(0, description="Executions waiting for a concurrency slot or a rate limit token.")
+    circuit_state: CircuitState = Field(CircuitState.CLOSED, description="The state of the circuit breaker.")
+    consecutive_failures: int = Field(0, description="Failures since the last successful execution.")
+    executions: int = Field(0, description="Executions started since the worker started.")
+    failures: int = Field(0, description="Executions that raised, timed out or returned an unsuccessful response.")
+    timeouts: int = Field(0, description="Executions abandoned because they exceeded the policy timeout.")
+    rejections: int = Field(0, description="Executions rejected because the circuit was open.")
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+
+    def __init__(self, action_name: str, failure_threshold: int, reset_timeout: timedelta):
+        self.action_name = action_name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    def retry_after(self) -> timedelta:
+        if self.opened_at is None:
+            return timedelta(0)
+        remaining = self.reset_timeout.total_seconds() - (time.monotonic() - self.opened_at)
+        return timedelta(seconds=max(remaining, 0.0))
+
+    def before_call(self) -> bool:
+        """
+        Raises CircuitOpenError if the call must be rejected. Returns whether the call is the half-open trial.
+        """
+        if self.state == CircuitState.OPEN:
+            if self.retry_after() > timedelta(0):
+                raise CircuitOpenError(self.action_name, self.retry_after())
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN:
+            if self.trial_in_flight:
+                raise CircuitOpenError(self.action_name, self.reset_timeout)
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                logger.warning(
+                    f"Opening circuit for action {self.action_name} after "
+                    f"{self.consecutive_failures} consecutive failures"
+                )
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        self.trial_in_flight = False
+
+
+class ActionGuard:
+    """Enforces one action's policy across every execution of that action on this worker."""
+
+    def __init__(self, action_name: str, policy: ActionPolicy):
+        self.action_name = action_name
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy.max_concurrency) if policy.max_concurrency else None
+        self.bucket = TokenBucket(rate=policy.rate_limit, burst=policy.burst) if policy.rate_limit else None
+        self.breaker = (
+            CircuitBreaker(action_name, policy.failure_threshold, policy.reset_timeout)
+            if policy.failure_threshold else None
+        )
+        self.state = ActionPolicyState(action_name=action_name)
+
+    def snapshot(self) -> ActionPolicyState:
+        if self.breaker is not None:
+            self.state.circuit_state = self.breaker.state
+            self.state.consecutive_failures = self.breaker.consecutive_failures
+        return self.state.model_copy()
+
+    def _record_failure(self) -> None:
+        self.state.failures += 1
+        if self.breaker is not None:
+            self.breaker.record_failure()
+
+    async def _run_with_timeout(self, run: Callable[[], Awaitable[ActionResponse]]) -> ActionResponse:
+        if self.policy.timeout is None:
+            return await run()
+        timeout = self.policy.timeout.total_seconds()
+        try:
+            return await asyncio.wait_for(run(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.state.timeouts += 1
+            raise TimeoutError(f"Action {self.action_name} did not finish within {timeout}s") from None
+
+    async def execute(
+        self,
+        run: Callable[[], Awaitable[ActionResponse]],
+        metric_meter: Optional[MetricMeter] = None,
+    ) -> ActionResponse:
+        try:
+            is_trial = self.breaker.before_call() if self.breaker is not None else False
+        except CircuitOpenError:
+            self.state.rejections += 1
+            self.publish(metric_meter)
+            raise
+
+        outcome_recorded = False
+        waiting = True
+        acquired = False
+        threads = []
+        self.state.waiting += 1
+        self.publish(metric_meter)
+        try:
+            if self.semaphore is not None:
+                await self.semaphore.acquire()
+                acquired = True
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            waiting = False
+            self.state.waiting -= 1
+            self.state.in_flight += 1
+            self.state.executions += 1
+            self.publish(metric_meter)
+            try:
+                with track_threads() as threads:
+                    response = await self._run_with_timeout(run)
+            except Exception:
+                self._record_failure()
+                outcome_recorded = True
+                raise
+            finally:
+                self.state.in_flight -= 1
+
+            if response.success:
+                if self.breaker is not None:
+                    self.breaker.record_success()
+            else:
+                self._record_failure()
+            outcome_recorded = True
+            return response
+        finally:
+            if acquired:
+                # An execution abandoned by the timeout keeps its slot while its thread is still running
+                release_when_finished(threads, self.semaphore.release)
+            if waiting:
+                # Cancelled while still waiting for a slot or token
+                self.state.waiting -= 1
+            if is_trial and not outcome_recorded:
+                self.breaker.release_trial()
+            self.publish(metric_meter)
+
+    def publish(self, metric_meter: Optional[MetricMeter]) -> None:
+        if metric_meter is None:
+            return
+        state = self.snapshot()
+        attributes = {"action": self.action_name}
+        metric_meter.create_gauge(
+            "agentex_action_in_flight", "Executions of the action currently running."
+        ).set(state.in_flight, attributes)
+        metric_meter.create_gauge(
+            "agentex_action_waiting", "Executions of the action waiting for a concurrency slot or token."
+        ).set(state.waiting, attributes)
+        metric_meter.create_gauge(
+            "agentex_action_circuit_open", "1 while the action's circuit is open or half open, otherwise 0."
+        ).set(int(state.circuit_state != CircuitState.CLOSED), attributes)
+        metric_meter.create_gauge(
+            "agentex_action_failures", "Failed executions of the action since the worker started."
+        ).set(state.failures, attributes)
+        metric_meter.create_gauge(
+            "agentex_action_timeouts", "Timed out executions of the action since the worker started."
+        ).set(state.timeouts, attributes)
+        metric_meter.create_gauge(
+            "agentex_action_rejections", "Executions rejected by the open circuit since the worker started."
+        ).set(state.rejections, attributes)
+
+
+class ActionPolicyEnforcer:
+    """Applies the ActionRegistry's per-action policies in take_action. Actions without a policy run unguarded."""
+
+    def __init__(self, action_registry: ActionRegistry):
+        self.action_registry = action_registry
+        self._guards: Dict[str, ActionGuard] = {}
+
+    def guard(self, action_name: str) -> Optional[ActionGuard]:
+        guard = self._guards.get(action_name)
+        if guard is None:
+            policy = self.action_registry.get_policy(action_name)
+            if policy is None:
+                return None
+            guard = ActionGuard(action_name, policy)
+            self._guards[action_name] = guard
+        return guard
+
+    async def execute(
+        self,
+        action_name: str,
+        run: Callable[[], Awaitable[ActionResponse]],
+        metric_meter: Optional[MetricMeter] = None,
+    ) -> ActionResponse:
+        guard = self.guard(action_name)
+        if guard is None:
+            return await run()
+        return await guard.execute(run, metric_meter=metric_meter)
+
+    def snapshot(self) -> List[ActionPolicyState]:
+        return [guard.snapshot() for guard in self._guards.values()]
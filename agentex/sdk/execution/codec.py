@@ -0,0 +1,264 @@
+import asyncio
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+from agentex.src.adapters.kv_store.port import KeyValueRepository
+from agentex.utils.logging import make_logger
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd is opt-in, installed with the `zstd` extra
+    zstandard = None
+
+logger = make_logger(__name__)
+
+COMPRESSED_ENCODING = b"binary/agentex-compressed"
+EXTERNAL_ENCODING = b"binary/agentex-external"
+
+DEFAULT_COMPRESSION_THRESHOLD = 4 * 1024
+DEFAULT_EXTERNAL_STORAGE_THRESHOLD = 128 * 1024
+DEFAULT_PAYLOAD_KEY_PREFIX = "payloads"
+DEFAULT_BLOB_CLEANUP_INTERVAL = timedelta(hours=1)
+
+
+class PayloadCompression(str, Enum):
+    ZLIB = "zlib"
+    ZSTD = "zstd"
+
+
+ZSTD_COMPRESSION = PayloadCompression.ZSTD.value.encode()
+ZLIB_COMPRESSION = PayloadCompression.ZLIB.value.encode()
+
+
+def _compress(data: bytes, compression: bytes) -> bytes:
+    if compression == ZSTD_COMPRESSION:
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(data: bytes, compression: bytes) -> bytes:
+    if compression == ZSTD_COMPRESSION:
+        if zstandard is None:
+            raise RuntimeError("Payload was compressed with zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == ZLIB_COMPRESSION:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown payload compression: {compression!r}")
+
+
+class PayloadStore(ABC):
+    """
+    Where payloads above the external storage threshold are kept, addressed by content hash.
+
+    A stored payload is needed for as long as a workflow history referencing it can be read or replayed, so a
+    store's `ttl` has to exceed the namespace's history retention plus the longest workflow run. Storing a
+    payload again refreshes its expiry.
+    """
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+
+class KeyValuePayloadStore(PayloadStore):
+
+    def __init__(
+        self,
+        kv_store: KeyValueRepository,
+        prefix: str = DEFAULT_PAYLOAD_KEY_PREFIX,
+        ttl: Optional[timedelta] = None,
+    ):
+        """
+        :param kv_store: The key-value store to keep payloads in.
+        :param prefix: The prefix of the payload keys.
+        :param ttl: How long payloads are kept after they were last stored. Kept until deleted if None.
+        """
+        self.kv_store = kv_store
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def put(self, key: str, data: bytes) -> None:
+        await self.kv_store.set(f"{self.prefix}:{key}", data, ttl=self.ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.kv_store.get(f"{self.prefix}:{key}")
+
+
+class LocalBlobPayloadStore(PayloadStore):
+    """Keeps payloads as files in a directory. Only suitable when every worker and client shares the directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: Optional[timedelta] = None,
+        cleanup_interval: timedelta = DEFAULT_BLOB_CLEANUP_INTERVAL,
+    ):
+        """
+        :param directory: The directory to keep payloads in.
+        :param ttl: How long payloads are kept after they were last stored. Kept until deleted if None.
+        :param cleanup_interval: How often storing a payload also deletes the expired ones, when `ttl` is set.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._last_cleanup = time.monotonic()
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self.directory / key
+        if path.exists():
+            # Refresh the expiry of a payload that is stored again
+            os.utime(path)
+            return
+        # Write then rename so concurrent readers never see a partial blob. The temporary file gets a unique
+        # name, since threads of one process may write the same payload at once.
+        tmp_file = tempfile.NamedTemporaryFile(dir=self.directory, prefix=f"{key}.", suffix=".tmp", delete=False)
+        try:
+            with tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_file.name, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_file.name)
+            raise
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self.directory / key
+        if not path.exists():
+            return None
+        return path.read_bytes()
+
+    def delete_expired(self) -> int:
+        """Deletes the payloads stored longer than `ttl` ago. Returns the number of payloads deleted."""
+        if self.ttl is None:
+            return 0
+        self._last_cleanup = time.monotonic()
+        cutoff = time.time() - self.ttl.total_seconds()
+        deleted = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                # Deleted by another process sharing the directory
+                continue
+        if deleted:
+            logger.info(f"Deleted {deleted} expired payloads from {self.directory}")
+        return deleted
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, key, data)
+        if self.ttl is not None and time.monotonic() - self._last_cleanup >= self.cleanup_interval.total_seconds():
+            await asyncio.to_thread(self.delete_expired)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+
+class LargePayloadCodec(PayloadCodec):
+    """
+    Compresses Temporal payloads and moves oversized ones out of the workflow history.
+
+    Payloads above `compression_threshold` are compressed with zlib, or with zstd if asked to. If the compressed
+    payload is still above `external_storage_threshold` it is written to the payload store under its content hash
+    and replaced by a small reference payload. Payloads without one of these encodings are passed through on
+    decode, so histories written before the codec was enabled still replay.
+
+    Every client that reads these payloads (workers, and anything that starts, queries or fetches the result
+    of the workflows) has to be configured with the same codec and store. With zstd, that includes having the
+    zstandard package (the `zstd` extra) installed.
+    """
+
+    def __init__(
+        self,
+        store: Optional[PayloadStore] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        external_storage_threshold: int = DEFAULT_EXTERNAL_STORAGE_THRESHOLD,
+        compression: PayloadCompression = PayloadCompression.ZLIB,
+    ):
+        """
+        :param store: Where to keep payloads above `external_storage_threshold`. Without one, they stay inline.
+        :param compression_threshold: The payload size from which payloads are compressed.
+        :param external_storage_threshold: The compressed size from which payloads are moved to the store.
+        :param compression: The compression to encode payloads with. Payloads are decoded with whichever
+            compression they were encoded with.
+        """
+        if compression == PayloadCompression.ZSTD and zstandard is None:
+            raise ImportError(
+                "zstd payload compression needs the zstandard package, installed with the `zstd` extra"
+            )
+        self.store = store
+        self.compression_threshold = compression_threshold
+        self.external_storage_threshold = external_storage_threshold
+        self.compression = PayloadCompression(compression).value.encode()
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._encode_payload(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._decode_payload(payload) for payload in payloads]
+
+    async def _encode_payload(self, payload: Payload) -> Payload:
+        if payload.ByteSize() < self.compression_threshold:
+            return payload
+
+        serialized = payload.SerializeToString()
+        compressed = _compress(serialized, self.compression)
+        if len(compressed) >= len(serialized):
+            compressed, compression = serialized, b""
+        else:
+            compression = self.compression
+
+        if self.store is None or len(compressed) < self.external_storage_threshold:
+            if not compression:
+                return payload
+            return Payload(
+                metadata={"encoding": COMPRESSED_ENCODING, "compression": compression},
+                data=compressed,
+            )
+
+        key = hashlib.sha256(compressed).hexdigest()
+        await self.store.put(key, compressed)
+        logger.debug(f"Stored {len(compressed)} byte payload externally under {key}")
+        return Payload(
+            metadata={"encoding": EXTERNAL_ENCODING, "compression": compression},
+            data=key.encode(),
+        )
+
+    async def _decode_payload(self, payload: Payload) -> Payload:
+        encoding = payload.metadata.get("encoding")
+        if encoding == COMPRESSED_ENCODING:
+            data = payload.data
+        elif encoding == EXTERNAL_ENCODING:
+            if self.store is None:
+                raise RuntimeError("Received an externally stored payload but the codec has no payload store")
+            key = payload.data.decode()
+            data = await self.store.get(key)
+            if data is None:
+                raise KeyError(f"Externally stored payload {key} was not found")
+        else:
+            return payload
+
+        compression = payload.metadata.get("compression", b"")
+        if compression:
+            data = _decompress(data, compression)
+        decoded = Payload()
+        decoded.ParseFromString(data)
+        return decoded
@@ -0,0 +1,75 @@
+from typing import Any, Dict, Optional, Type
+
+import pydantic_core
+from pydantic import TypeAdapter
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import (
+    AdvancedJSONEncoder,
+    CompositePayloadConverter,
+    DefaultPayloadConverter,
+    EncodingPayloadConverter,
+    JSONPlainPayloadConverter,
+)
+
+JSON_PLAIN_ENCODING = "json/plain"
+
+_type_adapters: Dict[Any, TypeAdapter] = {}
+_fallback_encoder = AdvancedJSONEncoder()
+
+
+def get_type_adapter(type_hint: Any) -> TypeAdapter:
+    """Returns a TypeAdapter for the type hint, building it only the first time the hint is seen."""
+    try:
+        adapter = _type_adapters.get(type_hint)
+    except TypeError:
+        # Unhashable hints cannot be cached
+        return TypeAdapter(type_hint)
+    if adapter is None:
+        adapter = TypeAdapter(type_hint)
+        _type_adapters[type_hint] = adapter
+    return adapter
+
+
+def _encode_unknown(value: Any) -> Any:
+    return _fallback_encoder.default(value)
+
+
+class PydanticJSONPayloadConverter(EncodingPayloadConverter):
+    """
+    A `json/plain` payload converter backed by pydantic-core.
+
+    Pydantic models, datetimes, enums and dataclasses are serialized natively in Rust instead of being
+    turned into dicts and passed through the stdlib encoder. When the caller provides a type hint the payload
+    is validated straight into that type with a cached TypeAdapter, so discriminated unions such as `Message`
+    decode without an intermediate dict. Payloads stay plain JSON and remain compatible with histories
+    written by the default converter.
+    """
+
+    @property
+    def encoding(self) -> str:
+        return JSON_PLAIN_ENCODING
+
+    def to_payload(self, value: Any) -> Optional[Payload]:
+        return Payload(
+            metadata={"encoding": JSON_PLAIN_ENCODING.encode()},
+            data=pydantic_core.to_json(value, by_alias=False, fallback=_encode_unknown),
+        )
+
+    def from_payload(self, payload: Payload, type_hint: Optional[Type] = None) -> Any:
+        if type_hint is None or type_hint is Any:
+            try:
+                return pydantic_core.from_json(payload.data)
+            except ValueError as error:
+                raise RuntimeError("Failed parsing") from error
+        return get_type_adapter(type_hint).validate_json(payload.data)
+
+
+class PydanticPayloadConverter(CompositePayloadConverter):
+    def __init__(self) -> None:
+        json_converter = PydanticJSONPayloadConverter()
+        super().__init__(
+            *[
+                c if not isinstance(c, JSONPlainPayloadConverter) else json_converter
+                for c in DefaultPayloadConverter.default_encoding_payload_converters
+            ]
+        )
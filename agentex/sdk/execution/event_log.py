@@ -0,0 +1,177 @@
+from collections import deque
+from enum import Enum
+from typing import Annotated, Deque, List, Literal, Optional, Union
+
+from pydantic import Field
+
+from agentex.utils.model_utils import BaseModel
+
+DEFAULT_EVENT_LOG_SIZE = 1000
+DEFAULT_EVENT_LOG_PAGE_SIZE = 100
+
+
+class EventType(str, Enum):
+    TASK_RECEIVED = "task_received"
+    TOOL_LOOP_STARTED = "tool_loop_started"
+    DECISION_MADE = "decision_made"
+    EXECUTING_TOOL_CALLS = "executing_tool_calls"
+    EXECUTING_TOOL_CALL = "executing_tool_call"
+    HUMAN_INSTRUCTION_RECEIVED = "human_instruction_received"
+    TASK_APPROVED = "task_approved"
+    TASK_COMPLETED = "task_completed"
+    TASK_CANCELED = "task_canceled"
+
+
+class BaseEvent(BaseModel):
+    offset: int = Field(
+        -1,
+        description="The position of the event in the workflow's event log. Assigned when the event is logged."
+    )
+    detail_key: Optional[str] = Field(
+        None,
+        description="The key-value store key holding the full event detail, if it was spilled."
+    )
+
+
+class TaskReceivedEvent(BaseEvent):
+    event: Literal[EventType.TASK_RECEIVED] = EventType.TASK_RECEIVED
+    task_id: str
+    prompt_size: int
+
+
+class ToolLoopStartedEvent(BaseEvent):
+    event: Literal[EventType.TOOL_LOOP_STARTED] = EventType.TOOL_LOOP_STARTED
+    thread_name: Optional[str] = None
+
+
+class DecisionMadeEvent(BaseEvent):
+    event: Literal[EventType.DECISION_MADE] = EventType.DECISION_MADE
+    finish_reason: str
+    tool_call_count: int
+    content_size: int
+    total_tokens: Optional[int] = None
+
+
+class ExecutingToolCallsEvent(BaseEvent):
+    event: Literal[EventType.EXECUTING_TOOL_CALLS] = EventType.EXECUTING_TOOL_CALLS
+    tool_call_count: int
+
+
+class ExecutingToolCallEvent(BaseEvent):
+    event: Literal[EventType.EXECUTING_TOOL_CALL] = EventType.EXECUTING_TOOL_CALL
+    tool_call_id: str
+    tool_name: str
+    arguments_size: int
+
+
+class HumanInstructionReceivedEvent(BaseEvent):
+    event: Literal[EventType.HUMAN_INSTRUCTION_RECEIVED] = EventType.HUMAN_INSTRUCTION_RECEIVED
+    thread_name: str
+    prompt_size: int
+
+
+class TaskApprovedEvent(BaseEvent):
+    event: Literal[EventType.TASK_APPROVED] = EventType.TASK_APPROVED
+
+
+class TaskCompletedEvent(BaseEvent):
+    event: Literal[EventType.TASK_COMPLETED] = EventType.TASK_COMPLETED
+    status: str
+
+
+class TaskCanceledEvent(BaseEvent):
+    event: Literal[EventType.TASK_CANCELED] = EventType.TASK_CANCELED
+    error: Optional[str] = None
+
+
+Event = Annotated[
+    Union[
+        TaskReceivedEvent,
+        ToolLoopStartedEvent,
+        DecisionMadeEvent,
+        ExecutingToolCallsEvent,
+        ExecutingToolCallEvent,
+        HumanInstructionReceivedEvent,
+        TaskApprovedEvent,
+        TaskCompletedEvent,
+        TaskCanceledEvent,
+    ],
+    Field(
+        discriminator="event"
+    )
+]
+
+
+class GetEventLogParams(BaseModel):
+    cursor: int = Field(
+        0,
+        description="The offset of the first event to return. Use the `next_cursor` of the previous page."
+    )
+    limit: int = Field(
+        DEFAULT_EVENT_LOG_PAGE_SIZE,
+        description="The maximum number of events to return."
+    )
+
+
+class EventLogPage(BaseModel):
+    events: List[Event] = Field(
+        default_factory=list,
+        description="The events at or after the requested cursor, oldest first."
+    )
+    next_cursor: int = Field(
+        ...,
+        description="The cursor to pass to fetch the events after this page."
+    )
+    first_offset: int = Field(
+        ...,
+        description="The offset of the oldest event still retained. Older events were evicted from the log."
+    )
+    has_more: bool = Field(
+        ...,
+        description="Whether more events are available after this page."
+    )
+
+
+def event_detail_key(task_id: str, offset: int) -> str:
+    return f"{task_id}:events:{offset}"
+
+
+class EventLog:
+    """
+    A bounded ring buffer of compact workflow events.
+
+    Every event gets a monotonically increasing offset, so readers can page through the log with a cursor
+    and detect when events they have not seen yet were evicted.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_EVENT_LOG_SIZE, next_offset: int = 0):
+        self.events: Deque[Event] = deque(maxlen=max_events)
+        self.next_offset = next_offset
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def first_offset(self) -> int:
+        if not self.events:
+            return self.next_offset
+        return self.events[0].offset
+
+    def append(self, event: Event) -> Event:
+        event.offset = self.next_offset
+        self.next_offset += 1
+        self.events.append(event)
+        return event
+
+    def page(self, cursor: int = 0, limit: int = DEFAULT_EVENT_LOG_PAGE_SIZE) -> EventLogPage:
+        first_offset = self.first_offset
+        start = max(cursor, first_offset) - first_offset
+        end = min(start + max(limit, 0), len(self.events))
+        events = [self.events[i] for i in range(start, end)]
+        next_cursor = events[-1].offset + 1 if events else max(cursor, first_offset)
+        return EventLogPage(
+            events=events,
+            next_cursor=next_cursor,
+            first_offset=first_offset,
+            has_more=next_cursor < self.next_offset,
+        )
@@ -0,0 +1,239 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from pydantic import Field
+from temporalio.client import Client
+from temporalio.worker import ActivityInboundInterceptor, ExecuteActivityInput, Interceptor, Worker
+
+from agentex.src.adapters.kv_store.port import KeyValueRepository
+from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
+
+logger = make_logger(__name__)
+
+DEFAULT_HEALTH_CHECK_PORT = 80
+DEFAULT_HEALTH_CHECK_INTERVAL = timedelta(seconds=10)
+DEFAULT_HEALTH_CHECK_TIMEOUT = timedelta(seconds=2)
+DEFAULT_SATURATION_THRESHOLD = 0.9
+DEFAULT_SATURATION_WINDOW = timedelta(seconds=30)
+
+
+class DependencyHealth(BaseModel):
+    name: str = Field(
+        ...,
+        description="The name of the dependency that was checked."
+    )
+    healthy: bool = Field(
+        ...,
+        description="Whether the dependency responded successfully to the last check."
+    )
+    error: Optional[str] = Field(
+        None,
+        description="The error raised by the last check, if it failed."
+    )
+    checked_at: float = Field(
+        ...,
+        description="The monotonic time at which the dependency was last checked."
+    )
+
+
+class SlotUtilization(BaseModel):
+    in_flight: int = Field(
+        ...,
+        description="The number of activities currently executing on this worker."
+    )
+    max_concurrent: int = Field(
+        ...,
+        description="The maximum number of activities this worker runs concurrently."
+    )
+    utilization: float = Field(
+        ...,
+        description="The fraction of activity slots in use."
+    )
+    saturated_for_seconds: float = Field(
+        0.0,
+        description="How long utilization has continuously been at or above the saturation threshold."
+    )
+
+
+class HealthReport(BaseModel):
+    healthy: bool
+    worker_running: bool
+    saturated: bool
+    dependencies: Dict[str, DependencyHealth] = Field(default_factory=dict)
+    activity_slots: SlotUtilization
+
+
+class ActivitySlotTracker(Interceptor):
+    """
+    Worker interceptor that counts in-flight activities so the health server can report slot utilization
+    and detect sustained saturation.
+    """
+
+    def __init__(self, max_concurrent_activities: int, saturation_threshold: float = DEFAULT_SATURATION_THRESHOLD):
+        self.max_concurrent_activities = max(max_concurrent_activities, 1)
+        self.saturation_threshold = saturation_threshold
+        self.in_flight = 0
+        self.saturated_since: Optional[float] = None
+        # Sync activities run their interceptors on executor threads
+        self._lock = threading.Lock()
+
+    @property
+    def utilization(self) -> float:
+        return self.in_flight / self.max_concurrent_activities
+
+    def saturated_for(self) -> float:
+        saturated_since = self.saturated_since
+        if saturated_since is None:
+            return 0.0
+        return time.monotonic() - saturated_since
+
+    def acquire(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self._update_saturation()
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._update_saturation()
+
+    def _update_saturation(self) -> None:
+        if self.utilization >= self.saturation_threshold:
+            if self.saturated_since is None:
+                self.saturated_since = time.monotonic()
+        else:
+            self.saturated_since = None
+
+    def snapshot(self) -> SlotUtilization:
+        return SlotUtilization(
+            in_flight=self.in_flight,
+            max_concurrent=self.max_concurrent_activities,
+            utilization=self.utilization,
+            saturated_for_seconds=self.saturated_for(),
+        )
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _SlotTrackingActivityInboundInterceptor(next, self)
+
+
+class _SlotTrackingActivityInboundInterceptor(ActivityInboundInterceptor):
+
+    def __init__(self, next: ActivityInboundInterceptor, tracker: ActivitySlotTracker):
+        super().__init__(next)
+        self._tracker = tracker
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        self._tracker.acquire()
+        try:
+            return await self.next.execute_activity(input)
+        finally:
+            self._tracker.release()
+
+
+class HealthMonitor:
+    """
+    Computes liveness and readiness for an AgentexWorker.
+
+    Only readiness checks dependencies. The checks are cached for `check_interval` so that frequent probes
+    do not turn into a load source for Redis or Temporal. Readiness additionally fails while activity slots
+    have been saturated for longer than `saturation_window`, so the orchestrator stops routing work to an
+    overloaded pod.
+    """
+
+    def __init__(
+        self,
+        slot_tracker: ActivitySlotTracker,
+        kv_store: Optional[KeyValueRepository] = None,
+        check_interval: timedelta = DEFAULT_HEALTH_CHECK_INTERVAL,
+        check_timeout: timedelta = DEFAULT_HEALTH_CHECK_TIMEOUT,
+        saturation_window: timedelta = DEFAULT_SATURATION_WINDOW,
+    ):
+        self.slot_tracker = slot_tracker
+        self.kv_store = kv_store
+        self.temporal_client: Optional[Client] = None
+        self.worker: Optional[Worker] = None
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.saturation_window = saturation_window
+
+        self.worker_failed = False
+        self._dependencies: Dict[str, DependencyHealth] = {}
+        self._last_checked: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def worker_running(self) -> bool:
+        return self.worker is not None and self.worker.is_running and not self.worker.is_shutdown
+
+    async def _check_temporal(self) -> None:
+        if self.temporal_client is None:
+            raise ConnectionError("Temporal client is not connected yet")
+        serving = await self.temporal_client.service_client.check_health(timeout=self.check_timeout)
+        if not serving:
+            raise ConnectionError("Temporal workflow service is not serving")
+
+    async def _check_kv_store(self) -> None:
+        if not await self.kv_store.ping():
+            raise ConnectionError("Key-value store did not respond to ping")
+
+    async def _run_check(self, name: str, check) -> DependencyHealth:
+        try:
+            await asyncio.wait_for(check(), timeout=self.check_timeout.total_seconds())
+            return DependencyHealth(name=name, healthy=True, checked_at=time.monotonic())
+        except Exception as error:
+            logger.warning(f"Health check for {name} failed: {error!r}")
+            return DependencyHealth(name=name, healthy=False, error=repr(error), checked_at=time.monotonic())
+
+    async def check_dependencies(self) -> Dict[str, DependencyHealth]:
+        async with self._lock:
+            now = time.monotonic()
+            if self._last_checked is not None and now - self._last_checked < self.check_interval.total_seconds():
+                return self._dependencies
+
+            checks = {"temporal": self._check_temporal}
+            if self.kv_store is not None:
+                checks["kv_store"] = self._check_kv_store
+            results = await asyncio.gather(*[self._run_check(name, check) for name, check in checks.items()])
+            self._dependencies = {result.name: result for result in results}
+            self._last_checked = now
+            return self._dependencies
+
+    def is_saturated(self) -> bool:
+        if self.slot_tracker.saturated_since is None:
+            return False
+        return self.slot_tracker.saturated_for() >= self.saturation_window.total_seconds()
+
+    def liveness(self) -> HealthReport:
+        """
+        Reports only the process itself. Nothing is awaited, so the probe answers as soon as the event loop runs
+        its handler and fails by timing out only when the loop is blocked. Dependencies are left to readiness:
+        a slow Redis or Temporal must not get a healthy worker restarted.
+        """
+        return HealthReport(
+            # The process is live until the worker itself has crashed
+            healthy=not self.worker_failed,
+            worker_running=self.worker_running,
+            saturated=self.is_saturated(),
+            activity_slots=self.slot_tracker.snapshot(),
+        )
+
+    async def readiness(self) -> HealthReport:
+        dependencies = await self.check_dependencies()
+        saturated = self.is_saturated()
+        healthy = (
+            self.worker_running
+            and not self.worker_failed
+            and not saturated
+            and all(dependency.healthy for dependency in dependencies.values())
+        )
+        return HealthReport(
+            healthy=healthy,
+            worker_running=self.worker_running,
+            saturated=saturated,
+            dependencies=dependencies,
+            activity_slots=self.slot_tracker.snapshot(),
+        )
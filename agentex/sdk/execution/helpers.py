@@ -1,13 +1,42 @@
 from datetime import timedelta
-from typing import Union, Optional, Type, List, TypeVar, get_origin, get_args, Dict, Tuple, Any
+from enum import Enum
+from typing import Union, Optional, Type, List, TypeVar, get_origin, get_args, Dict, Tuple, Any, Generic
 
-from pydantic import TypeAdapter
 from temporalio import workflow
 from temporalio.common import RetryPolicy
 
+from agentex.sdk.execution.converter import get_type_adapter
 from agentex.utils.model_utils import BaseModel
 
 T = TypeVar("T", bound="BaseModel")
+RequestT = TypeVar("RequestT")
+ResponseT = TypeVar("ResponseT")
+
+DEFAULT_START_TO_CLOSE_TIMEOUT = timedelta(seconds=60)
+DEFAULT_RETRY_POLICY = RetryPolicy(maximum_attempts=5)
+
+# Local activities run in the worker that executes the workflow, so they should be short and retry quickly
+DEFAULT_LOCAL_START_TO_CLOSE_TIMEOUT = timedelta(seconds=5)
+DEFAULT_LOCAL_RETRY_POLICY = RetryPolicy(
+    initial_interval=timedelta(milliseconds=100),
+    maximum_interval=timedelta(seconds=2),
+    maximum_attempts=5,
+)
+
+# Recorded in the history of workflows that run local activities, so histories written before the fast
+# path existed keep replaying the activities as regular activities
+LOCAL_ACTIVITIES_PATCH_ID = "agentex-local-activities"
+
+# Recorded in the history of workflows that read thread deltas: appends return a ThreadAppendResult and
+# wait_for_approval reads only the last user message. Older histories replay the full-thread reads
+THREAD_DELTAS_PATCH_ID = "agentex-thread-deltas"
+
+
+class ActivityExecutionMode(str, Enum):
+    # Scheduled on the task queue and picked up by any worker
+    REMOTE = "remote"
+    # Run directly by the worker executing the workflow, skipping task queue matching
+    LOCAL = "local"
 
 
 class WorkflowHelper:
@@ -19,18 +48,84 @@ class WorkflowHelper:
         response_type: Any,
         start_to_close_timeout: Optional[timedelta],
         retry_policy: Optional[RetryPolicy] = None,
+        mode: ActivityExecutionMode = ActivityExecutionMode.REMOTE,
+        heartbeat_timeout: Optional[timedelta] = None,
     ) -> Any:
         if start_to_close_timeout is None:
             start_to_close_timeout = timedelta(seconds=10)
         if retry_policy is None:
             retry_policy = RetryPolicy(maximum_attempts=0)
 
-        response = await workflow.execute_activity(
+        # The payload converter decodes the result straight into the response type
+        if mode == ActivityExecutionMode.LOCAL and workflow.patched(LOCAL_ACTIVITIES_PATCH_ID):
+            return await workflow.execute_local_activity(
+                activity=activity_name,
+                arg=request,
+                result_type=response_type,
+                start_to_close_timeout=start_to_close_timeout,
+                retry_policy=retry_policy,
+            )
+        return await workflow.execute_activity(
             activity=activity_name,
             arg=request,
+            result_type=response_type,
             start_to_close_timeout=start_to_close_timeout,
+            heartbeat_timeout=heartbeat_timeout,
             retry_policy=retry_policy,
         )
 
-        adapter = TypeAdapter(response_type)
-        return adapter.validate_python(response)
+
+class ActivityStub(Generic[RequestT, ResponseT]):
+    """
+    A typed handle to an activity, declared once and called like a function from workflow code.
+
+    The response type's TypeAdapter is built when the stub is declared, so calls made inside the workflow
+    loop only look it up. Timeouts, retry policies and the execution mode default to the stub's and can be
+    overridden per call. Cheap, idempotent activities such as key-value reads and writes should be declared
+    with `ActivityExecutionMode.LOCAL` to skip the task queue round trip.
+    """
+
+    def __init__(
+        self,
+        activity_name: str,
+        request_type: Type[RequestT],
+        response_type: Any,
+        start_to_close_timeout: Optional[timedelta] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        mode: ActivityExecutionMode = ActivityExecutionMode.REMOTE,
+        heartbeat_timeout: Optional[timedelta] = None,
+    ):
+        if mode == ActivityExecutionMode.LOCAL:
+            start_to_close_timeout = start_to_close_timeout or DEFAULT_LOCAL_START_TO_CLOSE_TIMEOUT
+            retry_policy = retry_policy or DEFAULT_LOCAL_RETRY_POLICY
+        self.activity_name = activity_name
+        self.request_type = request_type
+        self.response_type = response_type
+        self.start_to_close_timeout = start_to_close_timeout or DEFAULT_START_TO_CLOSE_TIMEOUT
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.mode = mode
+        self.heartbeat_timeout = heartbeat_timeout
+        if response_type is not None:
+            get_type_adapter(response_type)
+
+    async def __call__(
+        self,
+        request: RequestT,
+        start_to_close_timeout: Optional[timedelta] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        mode: Optional[ActivityExecutionMode] = None,
+    ) -> ResponseT:
+        if not isinstance(request, self.request_type):
+            raise TypeError(
+                f"Activity {self.activity_name} expects {self.request_type.__name__}, "
+                f"got {type(request).__name__}"
+            )
+        return await WorkflowHelper.execute_activity(
+            activity_name=self.activity_name,
+            request=request,
+            response_type=self.response_type,
+            start_to_close_timeout=start_to_close_timeout or self.start_to_close_timeout,
+            retry_policy=retry_policy or self.retry_policy,
+            mode=mode or self.mode,
+            heartbeat_timeout=self.heartbeat_timeout,
+        )
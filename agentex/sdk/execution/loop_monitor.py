@@ -0,0 +1,71 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+from agentex.utils.logging import make_logger
+
+logger = make_logger(__name__)
+
+DEFAULT_LOOP_LAG_CHECK_INTERVAL = timedelta(milliseconds=250)
+DEFAULT_LOOP_LAG_THRESHOLD = timedelta(milliseconds=500)
+
+
+class LoopLagMonitor:
+    """
+    Detects code that blocks the worker's event loop.
+
+    A background task sleeps for `check_interval` and measures how late it wakes up. Anything above
+    `threshold` means some coroutine ran synchronous work for that long, during which no other activity,
+    heartbeat or poll on this worker could make progress.
+    """
+
+    def __init__(
+        self,
+        threshold: timedelta = DEFAULT_LOOP_LAG_THRESHOLD,
+        check_interval: timedelta = DEFAULT_LOOP_LAG_CHECK_INTERVAL,
+        suspects: Optional[Callable[[float], List[str]]] = None,
+    ):
+        """
+        :param threshold: The lag above which a warning is logged.
+        :param check_interval: How often the loop is sampled.
+        :param suspects: Given the monotonic time the blocked interval started, returns the names of the work that
+            ran on the loop since then, to include in the warning.
+        """
+        self.threshold = threshold
+        self.check_interval = check_interval
+        self.suspects = suspects
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.blocked_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        interval = self.check_interval.total_seconds()
+        threshold = self.threshold.total_seconds()
+        while True:
+            started_at = time.monotonic()
+            await asyncio.sleep(interval)
+            lag = max(time.monotonic() - started_at - interval, 0.0)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= threshold:
+                self.blocked_count += 1
+                suspects = self.suspects(started_at) if self.suspects is not None else []
+                logger.warning(
+                    f"Event loop was blocked for {lag:.3f}s"
+                    + (f" while running: {', '.join(suspects)}" if suspects else "")
+                )
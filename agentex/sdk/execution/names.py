@@ -7,4 +7,6 @@ class SignalName(str, Enum):
 
 
 class QueryName(str, Enum):
+    # Returns every retained event as a list of dicts, as it did before the log was paginated
     GET_EVENT_LOG = "get_event_log"
+    GET_EVENT_LOG_PAGE = "get_event_log_page"
@@ -3,6 +3,7 @@ import datetime
 import os
 import uuid
 from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Any, Optional, Type, Union, Callable
 from typing import List
 
@@ -15,11 +16,22 @@ from temporalio.converter import (
     DefaultPayloadConverter,
     JSONPlainPayloadConverter,
     JSONTypeConverter,
+    PayloadCodec,
     _JSONTypeConverterUnhandled,
 )
 from temporalio.runtime import OpenTelemetryConfig, Runtime, TelemetryConfig
 from temporalio.worker import UnsandboxedWorkflowRunner, Worker
 
+from agentex.sdk.execution.converter import PydanticPayloadConverter
+from agentex.sdk.execution.health import (
+    DEFAULT_HEALTH_CHECK_INTERVAL,
+    DEFAULT_HEALTH_CHECK_PORT,
+    DEFAULT_SATURATION_THRESHOLD,
+    DEFAULT_SATURATION_WINDOW,
+    ActivitySlotTracker,
+    HealthMonitor,
+)
+from agentex.src.adapters.kv_store.port import KeyValueRepository
 from agentex.utils.logging import make_logger
 
 logger = make_logger(__name__)
@@ -57,37 +69,77 @@ class DateTimePayloadConverter(CompositePayloadConverter):
 
 custom_data_converter = dataclasses.replace(
     DataConverter.default,
-    payload_converter_class=DateTimePayloadConverter,
+    payload_converter_class=PydanticPayloadConverter,
 )
 
 
-async def get_temporal_client(temporal_address: str, metrics_url: str = None) -> Client:
+def get_data_converter(payload_codec: Optional[PayloadCodec] = None) -> DataConverter:
+    if payload_codec is None:
+        return custom_data_converter
+    return dataclasses.replace(custom_data_converter, payload_codec=payload_codec)
+
+
+async def get_temporal_client(
+    temporal_address: str,
+    metrics_url: str = None,
+    data_converter: DataConverter = custom_data_converter,
+) -> Client:
     if not metrics_url:
         client = await Client.connect(
-            target_host=temporal_address, data_converter=custom_data_converter
+            target_host=temporal_address, data_converter=data_converter
         )
     else:
         runtime = Runtime(telemetry=TelemetryConfig(metrics=OpenTelemetryConfig(url=metrics_url)))
         client = await Client.connect(
-            target_host=temporal_address, data_converter=custom_data_converter, runtime=runtime
+            target_host=temporal_address, data_converter=data_converter, runtime=runtime
         )
     return client
 
 
+def shutdown_activities(activities: List[Callable]) -> None:
+    """Shuts down the objects whose methods were registered as activities, for those that own resources."""
+    owners = {}
+    for function in activities:
+        owner = getattr(function, "__self__", None)
+        if callable(getattr(owner, "shutdown", None)):
+            owners[id(owner)] = owner
+    for owner in owners.values():
+        owner.shutdown()
+
+
 class AgentexWorker:
 
     def __init__(
         self,
         task_queue,
         max_workers: int = 10,
-        max_concurrent_activities: int = 10
+        max_concurrent_activities: int = 10,
+        health_check_port: Optional[int] = None,
+        kv_store: Optional[KeyValueRepository] = None,
+        health_check_interval: timedelta = DEFAULT_HEALTH_CHECK_INTERVAL,
+        saturation_threshold: float = DEFAULT_SATURATION_THRESHOLD,
+        saturation_window: timedelta = DEFAULT_SATURATION_WINDOW,
+        payload_codec: Optional[PayloadCodec] = None,
     ):
         self.task_queue = task_queue
+        self.data_converter = get_data_converter(payload_codec)
         self.activity_handles = []
         self.max_workers = max_workers
         self.max_concurrent_activities = max_concurrent_activities
+        if health_check_port is None:
+            health_check_port = int(os.environ.get("HEALTH_CHECK_PORT", DEFAULT_HEALTH_CHECK_PORT))
+        self.health_check_port = health_check_port
         self.health_check_server_running = False
-        self.healthy = False
+        self.slot_tracker = ActivitySlotTracker(
+            max_concurrent_activities=max_concurrent_activities,
+            saturation_threshold=saturation_threshold,
+        )
+        self.health_monitor = HealthMonitor(
+            slot_tracker=self.slot_tracker,
+            kv_store=kv_store,
+            check_interval=health_check_interval,
+            saturation_window=saturation_window,
+        )
 
     async def run(
         self,
@@ -98,7 +150,9 @@ class AgentexWorker:
         try:
             temporal_client = await get_temporal_client(
                 temporal_address=os.environ.get("TEMPORAL_ADDRESS"),
+                data_converter=self.data_converter,
             )
+            self.health_monitor.temporal_client = temporal_client
             worker = Worker(
                 client=temporal_client,
                 task_queue=self.task_queue,
@@ -107,30 +161,38 @@ class AgentexWorker:
                 activities=activities,
                 workflow_runner=UnsandboxedWorkflowRunner(),
                 max_concurrent_activities=self.max_concurrent_activities,
+                interceptors=[self.slot_tracker],
                 build_id=str(uuid.uuid4()),
             )
+            # Readiness follows the worker's own running state rather than being set eagerly
+            self.health_monitor.worker = worker
 
-            logger.info(f"Starting workers for task queue: {self.task_queue}")
-            # Eagerly set the worker status to healthy
-            self.healthy = True
             logger.info(f"Running workers for task queue: {self.task_queue}")
             await worker.run()
 
         except Exception as e:
             logger.error(f"Agent task worker encountered an error: {e}")
-            self.healthy = False
+            self.health_monitor.worker_failed = True
+        finally:
+            shutdown_activities(activities)
+
+    async def _liveness_check(self):
+        report = self.health_monitor.liveness()
+        return web.json_response(report.to_dict(), status=200 if report.healthy else 503)
 
-    async def _health_check(self):
-        return web.json_response(self.healthy)
+    async def _readiness_check(self):
+        report = await self.health_monitor.readiness()
+        return web.json_response(report.to_dict(), status=200 if report.healthy else 503)
 
     async def start_health_check_server(self):
         if not self.health_check_server_running:
             app = web.Application()
-            app.router.add_get('/readyz', lambda request: self._health_check())
+            app.router.add_get('/livez', lambda request: self._liveness_check())
+            app.router.add_get('/readyz', lambda request: self._readiness_check())
 
             runner = web.AppRunner(app)
             await runner.setup()
-            site = web.TCPSite(runner, '0.0.0.0', 80)  # Expose on port 80
+            site = web.TCPSite(runner, '0.0.0.0', self.health_check_port)
             await site.start()
-            logger.info("Health check server running on http://0.0.0.0:80/readyz")
+            logger.info(f"Health check server running on http://0.0.0.0:{self.health_check_port}/readyz")
             self.health_check_server_running = True
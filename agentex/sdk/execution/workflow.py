@@ -1,18 +1,32 @@
 from abc import ABC, abstractmethod
-from datetime import timedelta
 from enum import Enum
-from typing import Optional, Any, List, Dict
+from typing import Optional, Any, Dict, List
 
+from pydantic import Field
 from temporalio import workflow
-from temporalio.common import RetryPolicy
 
 from agentex.constants import DEFAULT_ROOT_THREAD_NAME
-from agentex.sdk.execution.helpers import WorkflowHelper
+from agentex.sdk.execution.event_log import (
+    DEFAULT_EVENT_LOG_SIZE,
+    Event,
+    EventLog,
+    EventLogPage,
+    GetEventLogParams,
+    HumanInstructionReceivedEvent,
+    TaskApprovedEvent,
+    event_detail_key,
+)
+from agentex.sdk.execution.helpers import THREAD_DELTAS_PATCH_ID
 from agentex.sdk.execution.names import SignalName, QueryName
-from agentex.sdk.lib.activities.names import ActivityName
-from agentex.sdk.lib.activities.state import AppendMessagesToThreadParams, GetMessagesFromThreadParams
+from agentex.sdk.lib.activities import stubs
+from agentex.sdk.lib.activities.event_log import StoreEventDetailParams
+from agentex.sdk.lib.activities.state import (
+    AppendMessagesToThreadParams,
+    GetLastMessageParams,
+    GetMessagesFromThreadParams,
+)
 from agentex.src.entities.agents import Agent
-from agentex.src.entities.llm import Message, UserMessage
+from agentex.src.entities.llm import UserMessage
 from agentex.src.entities.notifications import NotificationRequest
 from agentex.src.entities.task import Task
 from agentex.utils.logging import make_logger
@@ -20,16 +34,33 @@ from agentex.utils.model_utils import BaseModel
 
 logger = make_logger(__name__)
 
+# Continue-as-new well before Temporal's hard limits (50K events / 50MB) so replay stays cheap
+DEFAULT_MAX_HISTORY_LENGTH = 10_000
+DEFAULT_MAX_HISTORY_SIZE = 10 * 1024 * 1024
+
 
 class ExecutionStatus(str, Enum):
     IDLE = "idle"
     ACTIVE = "active"
 
 
+class WorkflowCheckpoint(BaseModel):
+    """The minimal state carried from one run segment to the next when a workflow continues as new."""
+    task_approved: bool = False
+    waiting_for_instruction: bool = False
+    event_log_offset: int = 0
+    run_segment: int = 0
+    state: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Workflow specific state needed to resume, see BaseWorkflow.checkpoint_state."
+    )
+
+
 class AgentTaskWorkflowParams(BaseModel):
     task: Task
     agent: Agent
     require_approval: Optional[bool] = False
+    checkpoint: Optional[WorkflowCheckpoint] = None
 
 
 class HumanInstruction(BaseModel):
@@ -43,38 +74,125 @@ class BaseWorkflow(ABC):
     def __init__(
         self,
         display_name: str,
+        max_event_log_size: int = DEFAULT_EVENT_LOG_SIZE,
+        spill_event_details: bool = False,
+        max_history_length: int = DEFAULT_MAX_HISTORY_LENGTH,
+        max_history_size: int = DEFAULT_MAX_HISTORY_SIZE,
     ):
         self.display_name = display_name
+        self.max_history_length = max_history_length
+        self.max_history_size = max_history_size
+
+        self.params: Optional[AgentTaskWorkflowParams] = None
+        self.run_segment = 0
+        # Subclasses record whatever they need to resume here; it is carried over on continue-as-new
+        self.checkpoint_state: Dict[str, Any] = {}
 
         self.waiting_for_instruction = False
         self.task_approved = False
-        self.event_log: List[Dict[str, Any]] = []
+        self.event_log = EventLog(max_events=max_event_log_size)
+        # Requires the worker to register EventLogActivities.store_event_detail
+        self.spill_event_details = spill_event_details
+
+    def restore(self, params: AgentTaskWorkflowParams) -> bool:
+        """
+        Must be called at the start of `run`. Restores the state carried over from the previous run segment.
+
+        :return: True if this run continues a previous one, in which case one-time setup (such as seeding
+            the thread with the task prompt) must be skipped.
+        """
+        self.params = params
+        checkpoint = params.checkpoint
+        if checkpoint is None:
+            return False
+
+        self.task_approved = checkpoint.task_approved
+        self.waiting_for_instruction = checkpoint.waiting_for_instruction
+        self.event_log.next_offset = checkpoint.event_log_offset
+        self.run_segment = checkpoint.run_segment
+        self.checkpoint_state = dict(checkpoint.state)
+        logger.info(f"Resumed workflow {self.display_name} at run segment {self.run_segment}")
+        return True
+
+    def should_continue_as_new(self) -> bool:
+        info = workflow.info()
+        return (
+            info.is_continue_as_new_suggested()
+            or info.get_current_history_length() >= self.max_history_length
+            or info.get_current_history_size() >= self.max_history_size
+        )
+
+    async def continue_as_new_if_needed(self) -> None:
+        """
+        Continues the workflow as a new run once its history grows past the configured thresholds. Only call
+        this at points where the workflow can be resumed from `checkpoint_state`, with no activities in flight.
+        """
+        if self.params is None or not self.should_continue_as_new():
+            return
+
+        # Let in-flight signal handlers (e.g. instruct appending to the thread) finish so nothing is lost
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        info = workflow.info()
+        logger.info(
+            f"Continuing workflow {self.display_name} as new after {info.get_current_history_length()} events "
+            f"({info.get_current_history_size()} bytes)"
+        )
+        workflow.continue_as_new(AgentTaskWorkflowParams(
+            task=self.params.task,
+            agent=self.params.agent,
+            require_approval=self.params.require_approval,
+            checkpoint=WorkflowCheckpoint(
+                task_approved=self.task_approved,
+                waiting_for_instruction=self.waiting_for_instruction,
+                event_log_offset=self.event_log.next_offset,
+                run_segment=self.run_segment + 1,
+                state=self.checkpoint_state,
+            ),
+        ))
 
     @workflow.query(name=QueryName.GET_EVENT_LOG)
-    async def get_event_log(self) -> List[Dict[str, Any]]:
-        return self.event_log
+    def get_event_log(self) -> List[Dict[str, Any]]:
+        """All events still retained by the log. Prefer get_event_log_page, which bounds the query result."""
+        return [event.to_dict() for event in self.event_log.events]
+
+    @workflow.query(name=QueryName.GET_EVENT_LOG_PAGE)
+    def get_event_log_page(self, params: Optional[GetEventLogParams] = None) -> EventLogPage:
+        if params is None:
+            params = GetEventLogParams()
+        return self.event_log.page(cursor=params.cursor, limit=params.limit)
+
+    async def log_event(self, event: Event, task_id: Optional[str] = None, detail: Optional[Any] = None) -> Event:
+        """
+        Appends a compact event to the event log. If detail spilling is enabled, the full detail is
+        written to the key-value store and referenced from the event instead of being kept in memory.
+        """
+        event = self.event_log.append(event)
+        if self.spill_event_details and task_id is not None and detail is not None:
+            key = event_detail_key(task_id=task_id, offset=event.offset)
+            await stubs.store_event_detail(StoreEventDetailParams(key=key, detail=detail))
+            event.detail_key = key
+        return event
 
     @workflow.signal(name=SignalName.INSTRUCT)
     async def instruct(self, instruction: HumanInstruction) -> None:
         logger.info(f"Received instruction: {instruction}")
-        await WorkflowHelper.execute_activity(
-            activity_name=ActivityName.APPEND_MESSAGES_TO_THREAD,
-            request=AppendMessagesToThreadParams(
+        await stubs.append_messages_to_thread(
+            AppendMessagesToThreadParams(
                 task_id=instruction.task_id,
                 thread_name=instruction.thread_name,
                 messages=[UserMessage(content=instruction.prompt)]
-            ),
-            response_type=List[Message],
-            start_to_close_timeout=timedelta(seconds=60),
-            retry_policy=RetryPolicy(maximum_attempts=5),
+            )
         )
-        self.event_log.append({"event": "human_instruction_received", "instruction": instruction})
+        self.event_log.append(HumanInstructionReceivedEvent(
+            thread_name=instruction.thread_name,
+            prompt_size=len(instruction.prompt),
+        ))
         self.waiting_for_instruction = False
 
     @workflow.signal(name=SignalName.APPROVE)
     async def approve(self, _: Optional[Any] = None) -> None:
         logger.info("Received approval")
-        self.event_log.append({"event": "task_approved"})
+        self.event_log.append(TaskApprovedEvent())
         self.task_approved = True
 
     @abstractmethod
@@ -85,33 +203,35 @@ class BaseWorkflow(ABC):
         logger.info("Waiting for instruction or approval")
         self.waiting_for_instruction = True
         if self.waiting_for_instruction and not self.task_approved:
-            messages = await WorkflowHelper.execute_activity(
-                activity_name=ActivityName.GET_MESSAGES_FROM_THREAD,
-                request=GetMessagesFromThreadParams(
-                    task_id=task.id,
-                    thread_name=DEFAULT_ROOT_THREAD_NAME,
-                ),
-                response_type=List[Message],
-                start_to_close_timeout=timedelta(seconds=60),
-                retry_policy=RetryPolicy(maximum_attempts=5),
-            )
-            # Find latest user message
-            last_user_message = next((m for m in reversed(messages) if isinstance(m, UserMessage)), None)
+            if workflow.patched(THREAD_DELTAS_PATCH_ID):
+                # Only fetch the latest user message rather than the whole thread
+                last_user_message = await stubs.get_last_message(
+                    GetLastMessageParams(
+                        task_id=task.id,
+                        thread_name=DEFAULT_ROOT_THREAD_NAME,
+                        role="user",
+                    )
+                )
+            else:
+                messages = await stubs.get_messages_from_thread(
+                    GetMessagesFromThreadParams(
+                        task_id=task.id,
+                        thread_name=DEFAULT_ROOT_THREAD_NAME,
+                    )
+                )
+                last_user_message = next((m for m in reversed(messages) if isinstance(m, UserMessage)), None)
+            last_request = last_user_message.content if last_user_message is not None else task.prompt
             notification_message = (
                 f'Agent {self.display_name} has acted and is now waiting for your input...\n\n'
-                f'[Your last request]:\n{last_user_message.content}\n\n'
+                f'[Your last request]:\n{last_request}\n\n'
                 f'[{self.display_name}]:\n{content}'
             )
-            await WorkflowHelper.execute_activity(
-                activity_name=ActivityName.SEND_NOTIFICATION,
-                request=NotificationRequest(
+            await stubs.send_notification(
+                NotificationRequest(
                     topic=agent.name,
                     message=notification_message,
                     title=f'Message from [{self.display_name}]',
                     tags=["wave"],
-                ),
-                response_type=None,
-                start_to_close_timeout=timedelta(seconds=60),
-                retry_policy=RetryPolicy(maximum_attempts=5),
+                )
             )
         await workflow.wait_condition(lambda: not self.waiting_for_instruction or self.task_approved)
@@ -1,10 +1,17 @@
+import asyncio
+import contextvars
 import json
+from datetime import timedelta
+from typing import Any, Dict, Optional
 
 from temporalio import activity
+from temporalio.exceptions import ApplicationError
 
+from agentex.sdk.execution.action_executor import ActionExecutor
+from agentex.sdk.execution.action_policy import ActionPolicyEnforcer, CircuitOpenError
 from agentex.sdk.lib.activities.names import ActivityName
 from agentex.src.adapters.llm.port import LLMGateway
-from agentex.src.entities.actions import ActionResponse, ActionRegistry
+from agentex.src.entities.actions import ActionContext, ActionResponse, ActionRegistry
 from agentex.src.entities.llm import LLMConfig, ToolMessage, SystemMessage, UserMessage
 from agentex.src.entities.state import Completion
 from agentex.src.services.agent_state_service import AgentStateService
@@ -28,6 +35,72 @@ class TakeActionParams(BaseModel):
     tool_call_id: str
     tool_name: str
     tool_args: str
+    # Background tool calls leave their tool message to the workflow, which records it between decisions
+    record_tool_message: bool = True
+
+
+class TemporalActionContext(ActionContext):
+    """
+    Backs an action's context with the running Temporal activity. Heartbeat details carry the latest progress
+    and checkpoint, so a retried attempt can resume from `checkpoint` and a cancelled workflow is noticed on
+    the next heartbeat.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._activity_context = contextvars.copy_context()
+        info = activity.info()
+        self._attempt = info.attempt
+        self._heartbeat_timeout = info.heartbeat_timeout
+        previous_details = info.heartbeat_details[0] if info.heartbeat_details else None
+        self._checkpoint = previous_details.get("checkpoint") if isinstance(previous_details, dict) else None
+        self._details: Dict[str, Any] = {"progress": None, "checkpoint": self._checkpoint}
+
+    @property
+    def attempt(self) -> int:
+        return self._attempt
+
+    @property
+    def checkpoint(self) -> Optional[Any]:
+        return self._checkpoint
+
+    @property
+    def heartbeat_interval(self) -> Optional[timedelta]:
+        if not self._heartbeat_timeout:
+            return None
+        return self._heartbeat_timeout / 3
+
+    def is_cancelled(self) -> bool:
+        return activity.is_cancelled()
+
+    def heartbeat(self, progress: Optional[str] = None, checkpoint: Optional[Any] = None) -> None:
+        if progress is not None:
+            self._details["progress"] = progress
+        if checkpoint is not None:
+            self._details["checkpoint"] = checkpoint
+        if self._on_activity_loop():
+            activity.heartbeat(self._details)
+        else:
+            # Blocking actions run on a pool thread and must hand the heartbeat back to the activity's loop
+            self._loop.call_soon_threadsafe(
+                activity.heartbeat, dict(self._details), context=self._activity_context
+            )
+
+    def _on_activity_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def keep_alive(self) -> None:
+        """
+        Heartbeats the latest details in the background so that actions which never heartbeat themselves
+        still receive cancellation and are not mistaken for a dead worker.
+        """
+        interval = self.heartbeat_interval.total_seconds()
+        while True:
+            await asyncio.sleep(interval)
+            activity.heartbeat(self._details)
 
 
 class ActionLoopActivities:
@@ -37,11 +110,18 @@ class ActionLoopActivities:
         llm_gateway: LLMGateway,
         agent_state: AgentStateService,
         action_class_registry: ActionRegistry,
+        action_executor: Optional[ActionExecutor] = None,
     ):
         super().__init__()
         self.llm = llm_gateway
         self.agent_state = agent_state
         self.action_class_registry = action_class_registry
+        self.action_executor = action_executor or ActionExecutor()
+        self.policy_enforcer = ActionPolicyEnforcer(action_class_registry)
+
+    def shutdown(self) -> None:
+        """Stops the action executor's thread pool and loop-lag monitor once the worker has stopped."""
+        self.action_executor.shutdown()
 
     @activity.defn(name=ActivityName.DECIDE_ACTION)
     async def decide_action(
@@ -116,16 +196,30 @@ class ActionLoopActivities:
         params: TakeActionParams
     ) -> ActionResponse:
         task_id = params.task_id
-        thread_name = params.thread_name
         tool_call_id = params.tool_call_id
         tool_name = params.tool_name
         tool_args = params.tool_args
         action_registry_key = params.action_registry_key
 
+        # A previous attempt may have completed the action and then failed before the result was returned
+        recorded_response = await self.agent_state.action_results.get(task_id=task_id, tool_call_id=tool_call_id)
+        if recorded_response is not None:
+            logger.info(f"Reusing the recorded result of tool call {tool_call_id}")
+            await self._record_tool_message(params, recorded_response)
+            return recorded_response
+
+        context = TemporalActionContext()
+        keep_alive = asyncio.create_task(context.keep_alive()) if context.heartbeat_interval else None
+
         exception = None
         try:
             action_class = self.action_class_registry.get(key=action_registry_key, action_name=tool_name)
-            action_response = await action_class(**json.loads(tool_args)).execute()
+            action = action_class(**json.loads(tool_args)).bind_context(context)
+            action_response = await self.policy_enforcer.execute(
+                action_name=tool_name,
+                run=lambda: self.action_executor.execute(action),
+                metric_meter=activity.metric_meter(),
+            )
         except Exception as error:
             # Log the error so the agent can fix it if possible (the activity retry loop should handle)
             action_response = ActionResponse(
@@ -133,20 +227,38 @@ class ActionLoopActivities:
                 success=False,
             )
             exception = error
+            if isinstance(error, CircuitOpenError):
+                # Hold off the retry until the circuit lets a trial execution through
+                exception = ApplicationError(str(error), next_retry_delay=error.retry_after)
+        finally:
+            if keep_alive is not None:
+                keep_alive.cancel()
 
-        tool_call_message = ToolMessage(
-            content=str(action_response.message),
-            tool_call_id=tool_call_id,
-            name=tool_name,
-        )
-        await self.agent_state.threads.append_message(
-            task_id=task_id,
-            thread_name=thread_name,
-            message=tool_call_message,
-        )
+        if not exception:
+            # Memoize before recording so a crash in between cannot execute the action a second time
+            await self.agent_state.action_results.set(
+                task_id=task_id,
+                tool_call_id=tool_call_id,
+                response=action_response,
+            )
+        await self._record_tool_message(params, action_response)
 
         # Raise the exception, this will trigger a temporal retry
         if exception:
             raise exception
 
         return action_response
+
+    async def _record_tool_message(self, params: TakeActionParams, action_response: ActionResponse) -> None:
+        if not params.record_tool_message:
+            return
+        # Upsert so that retries replace the failed attempt's message instead of adding another one
+        await self.agent_state.threads.upsert_tool_message(
+            task_id=params.task_id,
+            thread_name=params.thread_name,
+            message=ToolMessage(
+                content=str(action_response.message),
+                tool_call_id=params.tool_call_id,
+                name=params.tool_name,
+            ),
+        )
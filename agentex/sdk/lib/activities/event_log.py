@@ -0,0 +1,24 @@
+import json
+from typing import Any
+
+from temporalio import activity
+
+from agentex.sdk.lib.activities.names import ActivityName
+from agentex.src.adapters.kv_store.port import KeyValueRepository
+from agentex.utils.model_utils import BaseModel
+
+
+class StoreEventDetailParams(BaseModel):
+    key: str
+    detail: Any
+
+
+class EventLogActivities:
+
+    def __init__(self, kv_store: KeyValueRepository):
+        super().__init__()
+        self.kv_store = kv_store
+
+    @activity.defn(name=ActivityName.STORE_EVENT_DETAIL)
+    async def store_event_detail(self, params: StoreEventDetailParams) -> None:
+        await self.kv_store.set(params.key, json.dumps(params.detail, default=str))
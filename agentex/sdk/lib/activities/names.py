@@ -8,9 +8,15 @@ class ActivityName(str, Enum):
 
     # Agent state activities
     APPEND_MESSAGES_TO_THREAD = "append_messages_to_thread"
+    UPSERT_TOOL_MESSAGES_IN_THREAD = "upsert_tool_messages_in_thread"
     GET_MESSAGES_FROM_THREAD = "get_messages_from_thread"
+    GET_THREAD_SLICE = "get_thread_slice"
+    GET_LAST_MESSAGE = "get_last_message"
     ADD_ARTIFACT_TO_CONTEXT = "add_artifact_to_context"
 
+    # Event log activities
+    STORE_EVENT_DETAIL = "store_event_detail"
+
     # Notification activities
     SEND_NOTIFICATION = "send_notification"
 
@@ -1,23 +1,27 @@
-from enum import Enum
-from typing import List
+from typing import List, Optional, Literal, Union
 
 from temporalio import activity
 
 from agentex.sdk.lib.activities.names import ActivityName
 from agentex.src.entities.actions import Artifact
-from agentex.src.entities.llm import Message
+from agentex.src.entities.llm import Message, ToolMessage
+from agentex.src.entities.state import ContextKey, ThreadAppendResult, ThreadSlice
 from agentex.src.services.agent_state_service import AgentStateService
 from agentex.utils.model_utils import BaseModel
 
 
-class ContextKey(str, Enum):
-    ARTIFACTS = "artifacts"
-
-
 class AppendMessagesToThreadParams(BaseModel):
     task_id: str
     thread_name: str
     messages: List[Message]
+    # Only set by workflows whose history predates ThreadAppendResult, which expect the whole thread back
+    return_thread: bool = False
+
+
+class UpsertToolMessagesInThreadParams(BaseModel):
+    task_id: str
+    thread_name: str
+    messages: List[ToolMessage]
 
 
 class GetMessagesFromThreadParams(BaseModel):
@@ -25,6 +29,19 @@ class GetMessagesFromThreadParams(BaseModel):
     thread_name: str
 
 
+class GetThreadSliceParams(BaseModel):
+    task_id: str
+    thread_name: str
+    tail: Optional[int] = None
+    since_version: Optional[int] = None
+
+
+class GetLastMessageParams(BaseModel):
+    task_id: str
+    thread_name: str
+    role: Optional[Literal["system", "user", "assistant", "tool"]] = None
+
+
 class AddArtifactToContextParams(BaseModel):
     task_id: str
     artifact: Artifact
@@ -37,21 +54,29 @@ class AgentStateActivities:
         self.agent_state = agent_state
 
     @activity.defn(name=ActivityName.APPEND_MESSAGES_TO_THREAD)
-    async def append_messages_to_thread(self, params: AppendMessagesToThreadParams) -> List[Message]:
+    async def append_messages_to_thread(
+        self, params: AppendMessagesToThreadParams
+    ) -> Union[ThreadAppendResult, List[Message]]:
         task_id = params.task_id
         thread_name = params.thread_name
         messages = params.messages
 
-        await self.agent_state.threads.batch_append_messages(
+        result = await self.agent_state.threads.batch_append_messages(
             task_id=task_id,
             thread_name=thread_name,
             messages=messages
         )
-        messages = await self.agent_state.threads.get_messages(
-            task_id=task_id,
-            thread_name=thread_name
+        if params.return_thread:
+            return await self.agent_state.threads.get_messages(task_id=task_id, thread_name=thread_name)
+        return result
+
+    @activity.defn(name=ActivityName.UPSERT_TOOL_MESSAGES_IN_THREAD)
+    async def upsert_tool_messages_in_thread(self, params: UpsertToolMessagesInThreadParams) -> ThreadAppendResult:
+        return await self.agent_state.threads.batch_upsert_tool_messages(
+            task_id=params.task_id,
+            thread_name=params.thread_name,
+            messages=params.messages,
         )
-        return messages
 
     @activity.defn(name=ActivityName.GET_MESSAGES_FROM_THREAD)
     async def get_messages_from_thread(self, params: GetMessagesFromThreadParams) -> List[Message]:
@@ -64,6 +89,23 @@ class AgentStateActivities:
         )
         return messages
 
+    @activity.defn(name=ActivityName.GET_THREAD_SLICE)
+    async def get_thread_slice(self, params: GetThreadSliceParams) -> ThreadSlice:
+        return await self.agent_state.threads.get_thread_slice(
+            task_id=params.task_id,
+            thread_name=params.thread_name,
+            tail=params.tail,
+            since_version=params.since_version,
+        )
+
+    @activity.defn(name=ActivityName.GET_LAST_MESSAGE)
+    async def get_last_message(self, params: GetLastMessageParams) -> Optional[Message]:
+        return await self.agent_state.threads.get_last_message(
+            task_id=params.task_id,
+            thread_name=params.thread_name,
+            role=params.role,
+        )
+
     @activity.defn(name=ActivityName.ADD_ARTIFACT_TO_CONTEXT)
     async def add_artifact_to_context(self, params: AddArtifactToContextParams) -> None:
         task_id = params.task_id
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from typing import List, Optional
+
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+
+from agentex.sdk.execution.helpers import (
+    THREAD_DELTAS_PATCH_ID,
+    ActivityExecutionMode,
+    ActivityStub,
+    WorkflowHelper,
+)
+from agentex.sdk.lib.activities.action_loop import DecideActionParams, TakeActionParams
+from agentex.sdk.lib.activities.event_log import StoreEventDetailParams
+from agentex.sdk.lib.activities.names import ActivityName
+from agentex.sdk.lib.activities.state import (
+    AddArtifactToContextParams,
+    AppendMessagesToThreadParams,
+    GetLastMessageParams,
+    GetMessagesFromThreadParams,
+    GetThreadSliceParams,
+    UpsertToolMessagesInThreadParams,
+)
+from agentex.src.entities.actions import ActionResponse
+from agentex.src.entities.llm import LLMConfig, Message
+from agentex.src.entities.notifications import NotificationRequest
+from agentex.src.entities.state import Completion, ThreadAppendResult, ThreadSlice
+
+# Action loop activities
+decide_action: ActivityStub[DecideActionParams, Completion] = ActivityStub(
+    activity_name=ActivityName.DECIDE_ACTION,
+    request_type=DecideActionParams,
+    response_type=Completion,
+)
+# Actions may run external tools for a long time. Liveness is tracked through heartbeats rather than a
+# tight start-to-close timeout, so slow tools are not retried from scratch
+take_action: ActivityStub[TakeActionParams, ActionResponse] = ActivityStub(
+    activity_name=ActivityName.TAKE_ACTION,
+    request_type=TakeActionParams,
+    response_type=ActionResponse,
+    start_to_close_timeout=timedelta(minutes=10),
+    heartbeat_timeout=timedelta(seconds=30),
+)
+
+
+
+class AppendMessagesToThreadStub(ActivityStub[AppendMessagesToThreadParams, ThreadAppendResult]):
+    """
+    Appends return a ThreadAppendResult. Workflows whose history started before that keep making the old call,
+    which returns the whole thread, so that they replay; it returns None to them.
+    """
+
+    async def __call__(
+        self,
+        request: AppendMessagesToThreadParams,
+        start_to_close_timeout: Optional[timedelta] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        mode: Optional[ActivityExecutionMode] = None,
+    ) -> Optional[ThreadAppendResult]:
+        if workflow.patched(THREAD_DELTAS_PATCH_ID):
+            return await super().__call__(request, start_to_close_timeout, retry_policy, mode)
+        await WorkflowHelper.execute_activity(
+            activity_name=self.activity_name,
+            request=request.model_copy(update={"return_thread": True}),
+            response_type=List[Message],
+            start_to_close_timeout=start_to_close_timeout or self.start_to_close_timeout,
+            retry_policy=retry_policy or self.retry_policy,
+            mode=mode or self.mode,
+        )
+        return None
+
+
+# Agent state activities are single key-value reads and writes, so they run as local activities
+append_messages_to_thread: AppendMessagesToThreadStub = AppendMessagesToThreadStub(
+    activity_name=ActivityName.APPEND_MESSAGES_TO_THREAD,
+    request_type=AppendMessagesToThreadParams,
+    response_type=ThreadAppendResult,
+    mode=ActivityExecutionMode.LOCAL,
+)
+upsert_tool_messages_in_thread: ActivityStub[UpsertToolMessagesInThreadParams, ThreadAppendResult] = ActivityStub(
+    activity_name=ActivityName.UPSERT_TOOL_MESSAGES_IN_THREAD,
+    request_type=UpsertToolMessagesInThreadParams,
+    response_type=ThreadAppendResult,
+    mode=ActivityExecutionMode.LOCAL,
+)
+get_messages_from_thread: ActivityStub[GetMessagesFromThreadParams, List[Message]] = ActivityStub(
+    activity_name=ActivityName.GET_MESSAGES_FROM_THREAD,
+    request_type=GetMessagesFromThreadParams,
+    response_type=List[Message],
+    mode=ActivityExecutionMode.LOCAL,
+)
+get_thread_slice: ActivityStub[GetThreadSliceParams, ThreadSlice] = ActivityStub(
+    activity_name=ActivityName.GET_THREAD_SLICE,
+    request_type=GetThreadSliceParams,
+    response_type=ThreadSlice,
+    mode=ActivityExecutionMode.LOCAL,
+)
+get_last_message: ActivityStub[GetLastMessageParams, Optional[Message]] = ActivityStub(
+    activity_name=ActivityName.GET_LAST_MESSAGE,
+    request_type=GetLastMessageParams,
+    response_type=Optional[Message],
+    mode=ActivityExecutionMode.LOCAL,
+)
+add_artifact_to_context: ActivityStub[AddArtifactToContextParams, None] = ActivityStub(
+    activity_name=ActivityName.ADD_ARTIFACT_TO_CONTEXT,
+    request_type=AddArtifactToContextParams,
+    response_type=None,
+    mode=ActivityExecutionMode.LOCAL,
+)
+
+# Event log activities
+store_event_detail: ActivityStub[StoreEventDetailParams, None] = ActivityStub(
+    activity_name=ActivityName.STORE_EVENT_DETAIL,
+    request_type=StoreEventDetailParams,
+    response_type=None,
+    mode=ActivityExecutionMode.LOCAL,
+)
+
+# Notification activities
+send_notification: ActivityStub[NotificationRequest, None] = ActivityStub(
+    activity_name=ActivityName.SEND_NOTIFICATION,
+    request_type=NotificationRequest,
+    response_type=None,
+)
+
+# LLM activities
+ask_llm: ActivityStub[LLMConfig, Completion] = ActivityStub(
+    activity_name=ActivityName.ASK_LLM,
+    request_type=LLMConfig,
+    response_type=Completion,
+)
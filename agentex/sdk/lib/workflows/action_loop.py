@@ -1,43 +1,102 @@
 import asyncio
-from datetime import timedelta
+from typing import Collection, Dict, List, Optional, Set, Tuple
 
-from temporalio.common import RetryPolicy
-
-from agentex.sdk.execution.helpers import WorkflowHelper
+from agentex.sdk.execution.event_log import DecisionMadeEvent, ExecutingToolCallsEvent, ExecutingToolCallEvent
 from agentex.sdk.execution.workflow import BaseWorkflow
+from agentex.sdk.lib.activities import stubs
 from agentex.sdk.lib.activities.action_loop import DecideActionParams, TakeActionParams
-from agentex.sdk.lib.activities.names import ActivityName
-from agentex.src.entities.actions import ActionResponse
-from agentex.src.entities.state import Completion
+from agentex.sdk.lib.activities.state import AppendMessagesToThreadParams, UpsertToolMessagesInThreadParams
+from agentex.src.entities.llm import ToolCallRequest, ToolMessage
 from agentex.utils.logging import make_logger
 
 logger = make_logger(__name__)
 
+PENDING_TOOL_RESULT = (
+    "This tool call is still running in the background. Its result will replace this message once it "
+    "completes. Do not call the tool again for the same request; continue with the other steps in the meantime."
+)
+
+FINISH_REASONS = ("stop", "length", "content_filter")
+
+BackgroundCall = Tuple[ToolCallRequest, asyncio.Task]
+
 
 class ActionLoop:
 
     @staticmethod
     async def run(
-        parent_workflow: BaseWorkflow, task_id: str, thread_name: str, model: str, action_registry_key: str
+        parent_workflow: BaseWorkflow,
+        task_id: str,
+        thread_name: str,
+        model: str,
+        action_registry_key: str,
+        continue_as_new: bool = True,
+        deferred_actions: Optional[Collection[str]] = None,
+        fire_and_forget_actions: Optional[Collection[str]] = None,
     ) -> str:
+        """
+        Runs decide/act iterations on the thread until the model stops calling tools.
+
+        The loop only depends on the thread stored in the agent state, so with `continue_as_new` enabled the
+        parent workflow may continue as new between iterations; rerunning the loop on resume picks up where
+        it left off.
+
+        By default every tool call of a decision has to finish before the next decision. Tools listed in
+        `deferred_actions` or `fire_and_forget_actions` are pipelined instead: a placeholder tool message is
+        recorded for them and the loop keeps deciding while they run. Their results are not written by the
+        tool calls themselves, which would race the decision's own writes to the thread; instead the loop
+        replaces the placeholders of all results that landed in a single write before the next decision, which
+        also makes delta readers reload the thread at most once per decision. Before the loop finishes,
+        outstanding calls are awaited and the model gets another decision if it has not seen a deferred result
+        yet. Fire-and-forget results are recorded but never trigger another decision. Pipelining requires the
+        worker to register AgentStateActivities.upsert_tool_messages_in_thread.
+
+        :param deferred_actions: Names of actions whose results are not needed for the next decision.
+        :param fire_and_forget_actions: Names of actions whose results the model never needs to see.
+        """
+        deferred_actions = set(deferred_actions or [])
+        fire_and_forget_actions = set(fire_and_forget_actions or [])
+        pending: Dict[str, BackgroundCall] = {}
+        unseen_results: Set[str] = set()
+
         content = None
         finish_reason = None
-        while finish_reason not in ("stop", "length", "content_filter"):
+        while True:
+            finishing = finish_reason in FINISH_REASONS
+            if finishing and pending:
+                # Let outstanding background tool calls land before finishing
+                await asyncio.gather(*(task for _, task in pending.values()))
+            landed = [tool_call_id for tool_call_id, (_, task) in pending.items() if task.done()]
+            await ActionLoop._record_results(task_id, thread_name, [pending.pop(i) for i in landed])
+            if finishing and not unseen_results:
+                break
+            # The next decision reads every result recorded so far
+            unseen_results.difference_update(landed)
+
+            # Pending activities cannot be carried over to a new run
+            if continue_as_new and not pending:
+                await parent_workflow.continue_as_new_if_needed()
+
             # Execute decision activity
-            completion = await WorkflowHelper.execute_activity(
-                activity_name=ActivityName.DECIDE_ACTION,
-                request=DecideActionParams(
+            completion = await stubs.decide_action(
+                DecideActionParams(
                     task_id=task_id,
                     thread_name=thread_name,
                     action_registry_key=action_registry_key,
                     model=model,
-                ),
-                response_type=Completion,
-                start_to_close_timeout=timedelta(seconds=60),
-                retry_policy=RetryPolicy(maximum_attempts=5),
+                )
             )
-            parent_workflow.event_log.append({"event": "decision_made", "completion": completion.to_dict()})
             top_choice = completion.choices[0]
+            await parent_workflow.log_event(
+                DecisionMadeEvent(
+                    finish_reason=top_choice.finish_reason,
+                    tool_call_count=len(top_choice.message.tool_calls or []),
+                    content_size=len(top_choice.message.content or ""),
+                    total_tokens=completion.usage.total_tokens,
+                ),
+                task_id=task_id,
+                detail=completion.to_dict(),
+            )
             finish_reason = top_choice.finish_reason
             decision = top_choice.message
             tool_calls = decision.tool_calls
@@ -47,28 +106,76 @@ class ActionLoop:
             take_action_activities = []
             if decision.tool_calls:
                 logger.info(f"Executing tool calls: {tool_calls}")
-                parent_workflow.event_log.append({"event": "executing_tool_calls"})
+                parent_workflow.event_log.append(ExecutingToolCallsEvent(tool_call_count=len(tool_calls)))
+
+                # Placeholders are recorded before the tool calls start, so a result can only replace them
+                background_calls = [
+                    tool_call for tool_call in tool_calls
+                    if tool_call.function.name in deferred_actions | fire_and_forget_actions
+                ]
+                if background_calls:
+                    await stubs.append_messages_to_thread(
+                        AppendMessagesToThreadParams(
+                            task_id=task_id,
+                            thread_name=thread_name,
+                            messages=[
+                                ToolMessage(
+                                    content=PENDING_TOOL_RESULT,
+                                    tool_call_id=tool_call.id,
+                                    name=tool_call.function.name,
+                                )
+                                for tool_call in background_calls
+                            ],
+                        )
+                    )
+
                 for tool_call in tool_calls:
                     take_action_activity = asyncio.create_task(
-                        WorkflowHelper.execute_activity(
-                            activity_name=ActivityName.TAKE_ACTION,
-                            request=TakeActionParams(
+                        stubs.take_action(
+                            TakeActionParams(
                                 task_id=task_id,
                                 thread_name=thread_name,
                                 action_registry_key=action_registry_key,
                                 tool_call_id=tool_call.id,
                                 tool_name=tool_call.function.name,
                                 tool_args=tool_call.function.arguments,
-                            ),
-                            response_type=ActionResponse,
-                            start_to_close_timeout=timedelta(seconds=60),
-                            retry_policy=RetryPolicy(maximum_attempts=5),
+                                record_tool_message=tool_call not in background_calls,
+                            )
                         )
                     )
-                    parent_workflow.event_log.append({"event": "executing_tool_call", "tool_call": tool_call.to_dict()})
-                    take_action_activities.append(take_action_activity)
+                    parent_workflow.event_log.append(ExecutingToolCallEvent(
+                        tool_call_id=tool_call.id,
+                        tool_name=tool_call.function.name,
+                        arguments_size=len(tool_call.function.arguments),
+                    ))
+                    if tool_call in background_calls:
+                        pending[tool_call.id] = (tool_call, take_action_activity)
+                        if tool_call.function.name in deferred_actions:
+                            unseen_results.add(tool_call.id)
+                    else:
+                        take_action_activities.append(take_action_activity)
 
-            # Wait for all tool activities to complete
+            # Wait for all tool activities the next decision depends on to complete
             await asyncio.gather(*take_action_activities)
 
         return content
+
+    @staticmethod
+    async def _record_results(task_id: str, thread_name: str, calls: List[BackgroundCall]) -> None:
+        """Replaces the placeholders of finished background tool calls with their results in one write."""
+        if not calls:
+            return
+        await stubs.upsert_tool_messages_in_thread(
+            UpsertToolMessagesInThreadParams(
+                task_id=task_id,
+                thread_name=thread_name,
+                messages=[
+                    ToolMessage(
+                        content=str(task.result().message),
+                        tool_call_id=tool_call.id,
+                        name=tool_call.function.name,
+                    )
+                    for tool_call, task in calls
+                ],
+            )
+        )
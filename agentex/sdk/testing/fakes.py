@@ -0,0 +1,138 @@
+import json
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+from agentex.src.adapters.llm.port import LLMGateway
+from agentex.src.adapters.notifications.port import NotificationPort
+from agentex.src.entities.llm import AssistantMessage
+from agentex.src.entities.notifications import Notification, NotificationRequest
+from agentex.src.entities.state import Choice, Completion, Usage
+
+
+def _value_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+def _message_field(message: Any, name: str) -> Any:
+    if isinstance(message, dict):
+        return message.get(name)
+    return getattr(message, name, None)
+
+
+def stop_completion(content: str) -> Completion:
+    return Completion(
+        choices=[Choice(finish_reason="stop", index=0, message=AssistantMessage(content=content))],
+        usage=Usage(prompt_tokens=0, completion_tokens=0, total_tokens=0),
+    )
+
+
+class MeteredKeyValueRepository(LocalKeyValueRepository):
+    """
+    An in-memory key-value store that counts the operations and bytes that would have crossed the wire
+    to Redis.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        self.writes += 1
+        self.bytes_written += _value_size(value)
+        await super().set(key, value, ttl=ttl)
+
+    async def batch_set(self, updates: Dict[str, Any]) -> None:
+        self.writes += len(updates)
+        self.bytes_written += sum(_value_size(value) for value in updates.values())
+        await super().batch_set(updates)
+
+    async def get(self, key: str) -> Any:
+        value = await super().get(key)
+        self.reads += 1
+        self.bytes_read += _value_size(value)
+        return value
+
+    async def batch_get(self, keys: List[str]) -> List[Any]:
+        values = await super().batch_get(keys)
+        self.reads += len(keys)
+        self.bytes_read += sum(_value_size(value) for value in values)
+        return values
+
+
+class ScriptedLLMGateway(LLMGateway):
+    """
+    An LLM gateway that replays recorded completions instead of calling a model.
+
+    Conversations are keyed by the first user message of the thread (the task prompt) and the completion
+    returned is chosen by the number of assistant messages already in the thread. Lookups are therefore
+    stateless and deterministic, even when many tasks run concurrently or activities are retried.
+    """
+
+    def __init__(
+        self,
+        conversations: Dict[str, List[Completion]],
+        default_conversation: Optional[List[Completion]] = None,
+        final_content: str = "Done.",
+    ):
+        self.conversations = conversations
+        self.default_conversation = default_conversation or []
+        self.final_content = final_content
+        self.calls = 0
+
+    def _script_for(self, messages: List[Any]) -> List[Completion]:
+        prompt = next(
+            (_message_field(message, "content") for message in messages if _message_field(message, "role") == "user"),
+            None,
+        )
+        return self.conversations.get(prompt, self.default_conversation)
+
+    def _next_completion(self, messages: List[Any], tools: Optional[List[Any]]) -> Completion:
+        self.calls += 1
+        script = self._script_for(messages)
+        turn = sum(1 for message in messages if _message_field(message, "role") == "assistant")
+        if turn >= len(script):
+            # Ran off the end of the recording, finish the action loop
+            return stop_completion(self.final_content)
+
+        completion = script[turn]
+        if tools is None and completion.choices[0].message.tool_calls:
+            # decide_action asks for an explanation of content-less tool calls without offering tools
+            return stop_completion(f"Calling {len(completion.choices[0].message.tool_calls)} tool(s).")
+        return completion.model_copy(deep=True)
+
+    def completion(self, *args, **kwargs) -> Completion:
+        return self._next_completion(messages=kwargs.get("messages", []), tools=kwargs.get("tools"))
+
+    async def acompletion(self, *args, **kwargs) -> Completion:
+        return self._next_completion(messages=kwargs.get("messages", []), tools=kwargs.get("tools"))
+
+
+class RecordingNotificationGateway(NotificationPort):
+    """A notification gateway that keeps sent notifications in memory instead of publishing them."""
+
+    def __init__(self):
+        self.sent: List[NotificationRequest] = []
+
+    async def send(self, notification: NotificationRequest) -> Notification:
+        self.sent.append(notification)
+        return Notification(
+            id=str(uuid.uuid4()),
+            time=int(time.time()),
+            event="message",
+            topic=notification.topic,
+            message=notification.message,
+            title=notification.title,
+            tags=notification.tags,
+        )
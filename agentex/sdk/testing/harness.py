@@ -0,0 +1,294 @@
+import asyncio
+import math
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import Field
+from temporalio import activity
+from temporalio.api.enums.v1 import EventType
+from temporalio.client import WorkflowHandle, WorkflowHistory
+from temporalio.converter import PayloadCodec
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor,
+    Replayer,
+    UnsandboxedWorkflowRunner,
+    Worker,
+)
+
+from agentex.sdk.execution.worker import get_data_converter, shutdown_activities
+from agentex.sdk.execution.workflow import AgentTaskWorkflowParams, BaseWorkflow
+from agentex.sdk.lib.activities.action_loop import ActionLoopActivities
+from agentex.sdk.lib.activities.event_log import EventLogActivities
+from agentex.sdk.lib.activities.llm import LLMActivities
+from agentex.sdk.lib.activities.names import ActivityName
+from agentex.sdk.lib.activities.notifications import NotificationActivities
+from agentex.sdk.lib.activities.state import AgentStateActivities
+from agentex.sdk.testing.fakes import MeteredKeyValueRepository, RecordingNotificationGateway, ScriptedLLMGateway
+from agentex.src.entities.actions import ActionRegistry
+from agentex.src.entities.agents import Agent, AgentStatus
+from agentex.src.entities.state import Completion
+from agentex.src.entities.task import Task
+from agentex.src.services.agent_state_repository import AgentStateRepository
+from agentex.src.services.agent_state_service import AgentStateService
+from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
+
+logger = make_logger(__name__)
+
+HARNESS_TASK_QUEUE = "agentex-harness"
+CONTINUED_AS_NEW = EventType.EVENT_TYPE_WORKFLOW_EXECUTION_CONTINUED_AS_NEW
+
+
+class RecordedConversation(BaseModel):
+    prompt: str = Field(
+        ...,
+        description="The task prompt. Also used to look up the recorded completions during replay."
+    )
+    completions: List[Completion] = Field(
+        default_factory=list,
+        description="The completions the model returned, in order, one per decision."
+    )
+
+
+class HarnessReport(BaseModel):
+    tasks: int
+    failed_tasks: int
+    duration_seconds: float
+    throughput_tasks_per_second: float
+    turns: int
+    turn_latency_p50_seconds: float
+    turn_latency_p99_seconds: float
+    kv_reads: int
+    kv_writes: int
+    kv_bytes_read: int
+    kv_bytes_written: int
+    history_events_total: int
+    history_events_max: int
+    history_bytes_total: int
+    history_bytes_max: int
+    replay_failures: int = 0
+    continued_as_new: int = Field(
+        0,
+        description="The number of runs started by continue-as-new. History figures and replays cover every run."
+    )
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class TurnTimer(Interceptor):
+    """Records when each decide_action activity starts, per task, to derive turn latencies."""
+
+    def __init__(self):
+        self.decision_starts: Dict[str, List[float]] = defaultdict(list)
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _TurnTimingActivityInboundInterceptor(next, self)
+
+    def turn_latencies(self, task_id: str, finished_at: float) -> List[float]:
+        starts = self.decision_starts.get(task_id, [])
+        return [end - start for start, end in zip(starts, [*starts[1:], finished_at])]
+
+
+class _TurnTimingActivityInboundInterceptor(ActivityInboundInterceptor):
+
+    def __init__(self, next: ActivityInboundInterceptor, timer: TurnTimer):
+        super().__init__(next)
+        self._timer = timer
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        if activity.info().activity_type == ActivityName.DECIDE_ACTION and input.args:
+            self._timer.decision_starts[input.args[0].task_id].append(time.perf_counter())
+        return await self.next.execute_activity(input)
+
+
+class WorkflowHarness:
+    """
+    Runs BaseWorkflow subclasses end to end against local stand-ins: an in-memory key-value store, a
+    scripted LLM gateway replaying recorded conversations and a notification gateway that records instead
+    of publishing. Used to establish reproducible throughput, latency, state traffic and history size
+    baselines for the SDK hot paths, and to check that the recorded histories replay deterministically.
+    """
+
+    def __init__(
+        self,
+        workflow: Type[BaseWorkflow],
+        action_registry: ActionRegistry,
+        task_queue: str = HARNESS_TASK_QUEUE,
+        max_concurrent_activities: int = 100,
+        extra_activities: Optional[List[Any]] = None,
+        payload_codec: Optional[PayloadCodec] = None,
+    ):
+        self.workflow = workflow
+        self.action_registry = action_registry
+        self.task_queue = task_queue
+        self.max_concurrent_activities = max_concurrent_activities
+        self.extra_activities = extra_activities or []
+        self.data_converter = get_data_converter(payload_codec)
+
+    def _activities(
+        self,
+        kv_store: MeteredKeyValueRepository,
+        llm_gateway: ScriptedLLMGateway,
+        notification_gateway: RecordingNotificationGateway,
+    ) -> List[Any]:
+        agent_state = AgentStateService(repository=AgentStateRepository(kv_store=kv_store))
+        agent_state_activities = AgentStateActivities(agent_state=agent_state)
+        action_loop_activities = ActionLoopActivities(
+            llm_gateway=llm_gateway,
+            agent_state=agent_state,
+            action_class_registry=self.action_registry,
+        )
+        notification_activities = NotificationActivities(notification_gateway=notification_gateway)
+        llm_activities = LLMActivities(llm_gateway=llm_gateway)
+        event_log_activities = EventLogActivities(kv_store=kv_store)
+        return [
+            agent_state_activities.append_messages_to_thread,
+            agent_state_activities.upsert_tool_messages_in_thread,
+            agent_state_activities.get_messages_from_thread,
+            agent_state_activities.get_thread_slice,
+            agent_state_activities.get_last_message,
+            agent_state_activities.add_artifact_to_context,
+            action_loop_activities.decide_action,
+            action_loop_activities.take_action,
+            llm_activities.ask_llm,
+            notification_activities.send_notification,
+            event_log_activities.store_event_detail,
+            *self.extra_activities,
+        ]
+
+    async def run(
+        self,
+        conversations: List[RecordedConversation],
+        concurrency: int = 10,
+        env: Optional[WorkflowEnvironment] = None,
+        check_determinism: bool = True,
+    ) -> HarnessReport:
+        """
+        Runs one task per recorded conversation and reports aggregate performance.
+
+        :param conversations: The recorded conversations to replay.
+        :param concurrency: The maximum number of tasks in flight at once.
+        :param env: The Temporal environment to use. Defaults to a time-skipping test environment.
+        :param check_determinism: Whether to replay every resulting history through a Replayer.
+        """
+        owns_env = env is None
+        if env is None:
+            env = await WorkflowEnvironment.start_time_skipping(data_converter=self.data_converter)
+
+        kv_store = MeteredKeyValueRepository()
+        llm_gateway = ScriptedLLMGateway(
+            conversations={conversation.prompt: conversation.completions for conversation in conversations},
+        )
+        notification_gateway = RecordingNotificationGateway()
+        turn_timer = TurnTimer()
+        agent = Agent(
+            id=str(uuid.uuid4()),
+            name="agentex-harness",
+            description="Harness agent",
+            status=AgentStatus.READY,
+            workflow_name=self.workflow.__name__,
+            workflow_queue_name=self.task_queue,
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+        histories: List[WorkflowHistory] = []
+        failed_tasks = 0
+
+        async def fetch_histories(handle: WorkflowHandle) -> List[WorkflowHistory]:
+            """The history of every run of the workflow, following continue-as-new."""
+            run_histories = []
+            while True:
+                history = await handle.fetch_history()
+                run_histories.append(history)
+                last_event = history.events[-1] if history.events else None
+                if last_event is None or last_event.event_type != CONTINUED_AS_NEW:
+                    return run_histories
+                attributes = last_event.workflow_execution_continued_as_new_event_attributes
+                handle = env.client.get_workflow_handle(handle.id, run_id=attributes.new_execution_run_id)
+
+        async def run_task(conversation: RecordedConversation) -> None:
+            nonlocal failed_tasks
+            async with semaphore:
+                task = Task(id=str(uuid.uuid4()), agent_id=agent.id, prompt=conversation.prompt)
+                handle = await env.client.start_workflow(
+                    self.workflow.run,
+                    AgentTaskWorkflowParams(task=task, agent=agent),
+                    id=task.id,
+                    task_queue=self.task_queue,
+                )
+                try:
+                    await handle.result()
+                except Exception as error:
+                    logger.warning(f"Harness task {task.id} failed: {error}")
+                    failed_tasks += 1
+                latencies.extend(turn_timer.turn_latencies(task.id, finished_at=time.perf_counter()))
+                histories.extend(await fetch_histories(handle))
+
+        activities = self._activities(kv_store, llm_gateway, notification_gateway)
+        try:
+            async with Worker(
+                env.client,
+                task_queue=self.task_queue,
+                workflows=[self.workflow],
+                activities=activities,
+                activity_executor=ThreadPoolExecutor(max_workers=self.max_concurrent_activities),
+                workflow_runner=UnsandboxedWorkflowRunner(),
+                max_concurrent_activities=self.max_concurrent_activities,
+                interceptors=[turn_timer],
+            ):
+                started_at = time.perf_counter()
+                await asyncio.gather(*[run_task(conversation) for conversation in conversations])
+                duration = time.perf_counter() - started_at
+
+            replay_failures = 0
+            if check_determinism:
+                replayer = Replayer(
+                    workflows=[self.workflow],
+                    workflow_runner=UnsandboxedWorkflowRunner(),
+                    data_converter=self.data_converter,
+                )
+                for history in histories:
+                    result = await replayer.replay_workflow(history, raise_on_replay_failure=False)
+                    if result.replay_failure is not None:
+                        logger.warning(f"Replay of {history.workflow_id} failed: {result.replay_failure}")
+                        replay_failures += 1
+        finally:
+            shutdown_activities(activities)
+            if owns_env:
+                await env.shutdown()
+
+        history_events = [len(history.events) for history in histories]
+        history_bytes = [sum(event.ByteSize() for event in history.events) for history in histories]
+        return HarnessReport(
+            tasks=len(conversations),
+            failed_tasks=failed_tasks,
+            duration_seconds=duration,
+            throughput_tasks_per_second=len(conversations) / duration if duration else 0.0,
+            turns=len(latencies),
+            turn_latency_p50_seconds=percentile(latencies, 50),
+            turn_latency_p99_seconds=percentile(latencies, 99),
+            kv_reads=kv_store.reads,
+            kv_writes=kv_store.writes,
+            kv_bytes_read=kv_store.bytes_read,
+            kv_bytes_written=kv_store.bytes_written,
+            history_events_total=sum(history_events),
+            history_events_max=max(history_events, default=0),
+            history_bytes_total=sum(history_bytes),
+            history_bytes_max=max(history_bytes, default=0),
+            replay_failures=replay_failures,
+            continued_as_new=len(histories) - len(conversations),
+        )
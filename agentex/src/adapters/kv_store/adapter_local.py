@@ -1,4 +1,6 @@
-from typing import Any, List, Dict
+import time
+from datetime import timedelta
+from typing import Any, List, Dict, Optional
 
 from agentex.src.adapters.kv_store.port import KeyValueRepository
 
@@ -6,21 +8,43 @@ from agentex.src.adapters.kv_store.port import KeyValueRepository
 class LocalKeyValueRepository(KeyValueRepository):
     def __init__(self):
         self.store = {}
+        self.expires_at: Dict[str, float] = {}
 
-    async def set(self, key: str, value: Any) -> None:
+    def _expire(self, key: str) -> None:
+        expires_at = self.expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.store.pop(key, None)
+            self.expires_at.pop(key, None)
+
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
         self.store[key] = value
+        if ttl is None:
+            self.expires_at.pop(key, None)
+        else:
+            self.expires_at[key] = time.monotonic() + ttl.total_seconds()
 
     async def batch_set(self, updates: Dict[str, Any]) -> None:
         self.store.update(updates)
+        for key in updates:
+            self.expires_at.pop(key, None)
 
     async def get(self, key: str) -> Any:
+        self._expire(key)
         return self.store.get(key)
 
     async def batch_get(self, keys: List[str]) -> List[Any]:
+        for key in keys:
+            self._expire(key)
         return [self.store.get(key) for key in keys]
 
     async def delete(self, key: str) -> Any:
+        self.expires_at.pop(key, None)
         return self.store.pop(key, None)
 
     async def batch_delete(self, keys: List[str]) -> List[Any]:
+        for key in keys:
+            self.expires_at.pop(key, None)
         return [self.store.pop(key, None) for key in keys]
+
+    async def ping(self) -> bool:
+        return True
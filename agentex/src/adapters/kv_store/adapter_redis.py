@@ -1,5 +1,6 @@
 import os
-from typing import Any, List, Dict
+from datetime import timedelta
+from typing import Any, List, Dict, Optional
 
 import redis.asyncio as redis
 
@@ -10,8 +11,8 @@ class RedisRepository(KeyValueRepository):
     def __init__(self):
         self.redis = redis.from_url(os.environ.get("REDIS_URL"))
 
-    async def set(self, key: str, value: Any) -> None:
-        return await self.redis.set(key, value)
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        return await self.redis.set(key, value, ex=ttl)
 
     async def batch_set(self, updates: Dict[str, Any]) -> None:
         return await self.redis.mset(updates)
@@ -27,3 +28,6 @@ class RedisRepository(KeyValueRepository):
 
     async def batch_delete(self, keys: List[str]) -> List[Any]:
         return await self.redis.delete(*keys)
+
+    async def ping(self) -> bool:
+        return await self.redis.ping()
@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+PING_KEY = "agentex:ping"
 
 
 class KeyValueRepository(ABC):
 
     @abstractmethod
-    async def set(self, key: str, value: Any) -> None:
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        """Sets the value, which expires after `ttl` if one is given and is kept until deleted otherwise."""
         raise NotImplementedError
 
     @abstractmethod
@@ -27,3 +31,11 @@ class KeyValueRepository(ABC):
     @abstractmethod
     async def batch_delete(self, keys: List[str]) -> List[Any]:
         raise NotImplementedError
+
+    async def ping(self) -> bool:
+        """
+        Whether the store is reachable. By default a key is read, which raises if the store cannot be reached;
+        stores with a cheaper health check override this.
+        """
+        await self.get(PING_KEY)
+        return True
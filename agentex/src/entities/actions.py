@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Union, Type, Literal, Any
+from datetime import timedelta
+from typing import Optional, List, Dict, Union, Type, Literal, Any, ClassVar
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
+from pydantic_core import to_json
 
 from agentex.utils.json_schema import resolve_refs
 from agentex.utils.model_utils import BaseModel
@@ -34,6 +36,26 @@ class Artifact(BaseModel):
     )
 
 
+class ArtifactSummary(BaseModel):
+    """An artifact without its content, for listing a task's artifacts cheaply."""
+    name: str = Field(
+        ...,
+        description="The name of the artifact."
+    )
+    description: Optional[str] = Field(
+        None,
+        description="The description of the artifact."
+    )
+    size: int = Field(
+        0,
+        description="The size of the artifact's JSON encoded content in bytes."
+    )
+
+    @classmethod
+    def from_artifact(cls, artifact: Artifact) -> "ArtifactSummary":
+        return cls(name=artifact.name, description=artifact.description, size=len(to_json(artifact.content)))
+
+
 class ActionResponse(BaseModel):
     """
     A response that represents a   message response to the agent and something you want to add to the agent's context.
@@ -56,14 +78,61 @@ class ActionResponse(BaseModel):
     )
 
 
+class ActionContext:
+    """
+    Runtime services available to an action while it executes: progress heartbeats, cancellation and the
+    checkpoint recorded by a previous attempt. The base context is inert so that actions can also be executed
+    directly, outside of a worker.
+    """
+
+    @property
+    def attempt(self) -> int:
+        return 1
+
+    @property
+    def checkpoint(self) -> Optional[Any]:
+        """The last checkpoint reported by a previous attempt of this action, if it was retried."""
+        return None
+
+    def is_cancelled(self) -> bool:
+        return False
+
+    def heartbeat(self, progress: Optional[str] = None, checkpoint: Optional[Any] = None) -> None:
+        """
+        Reports that the action is still making progress.
+
+        :param progress: A short human readable description of the current progress.
+        :param checkpoint: JSON serializable state to resume from if this attempt fails and is retried.
+        """
+        pass
+
+
 class Action(BaseModel, ABC):
+    # Set on actions whose execute calls synchronous libraries or does blocking IO, so they are run on a
+    # dedicated thread pool instead of the worker's event loop. Actions with a plain `def execute` are
+    # always treated as blocking.
+    blocking: ClassVar[bool] = False
+
+    _context: ActionContext = PrivateAttr(default_factory=ActionContext)
+
+    @classmethod
+    def action_name(cls) -> str:
+        return camel_to_snake(cls.__name__)
+
+    @property
+    def context(self) -> ActionContext:
+        return self._context
+
+    def bind_context(self, context: ActionContext) -> "Action":
+        self._context = context
+        return self
 
     @classmethod
     def function_call_schema(cls) -> FunctionCallSchema:
         return FunctionCallSchema(
             type="function",
             function=FunctionSchema(
-                name=camel_to_snake(cls.__name__),
+                name=cls.action_name(),
                 description=cls.__doc__.strip(),
                 parameters=resolve_refs(cls.schema())
             )
@@ -74,19 +143,62 @@ class Action(BaseModel, ABC):
         pass
 
 
+class ActionPolicy(BaseModel):
+    max_concurrency: Optional[int] = Field(
+        None,
+        description="The maximum number of executions of the action running at once on a worker."
+    )
+    rate_limit: Optional[float] = Field(
+        None,
+        description="The sustained number of executions per second allowed to start on a worker."
+    )
+    burst: int = Field(
+        1,
+        description="The number of executions that may start at once before the rate limit applies."
+    )
+    timeout: Optional[timedelta] = Field(
+        None,
+        description="How long a single execution may run before it is abandoned and counted as a failure."
+    )
+    failure_threshold: Optional[int] = Field(
+        None,
+        description="The number of consecutive failures after which the circuit opens and executions are "
+                    "rejected without calling the action."
+    )
+    reset_timeout: timedelta = Field(
+        timedelta(seconds=30),
+        description="How long the circuit stays open before a single trial execution is let through."
+    )
+
+
 class ActionRegistry:
-    def __init__(self, actions: Dict[str, List[Type[Action]]]):
+    def __init__(
+        self,
+        actions: Dict[str, List[Type[Action]]],
+        policies: Optional[Dict[str, ActionPolicy]] = None,
+    ):
+        """
+        :param actions: The action classes available to the agent, grouped by registry key.
+        :param policies: Execution policies keyed by action name, enforced by the worker for every execution.
+        """
         self.actions = actions
+        self.policies = policies or {}
+        self._registry: Optional[Dict[str, Dict[str, Type[Action]]]] = None
 
     @property
     def registry(self) -> Dict[str, Dict[str, Type[Action]]]:
-        return {
-            key: {
-                action_class.function_call_schema().function.name: action_class
-                for action_class in actions
+        if self._registry is None:
+            self._registry = {
+                key: {
+                    action_class.action_name(): action_class
+                    for action_class in actions
+                }
+                for key, actions in self.actions.items()
             }
-            for key, actions in self.actions.items()
-        }
+        return self._registry
 
     def get(self, key: str, action_name: str) -> Type[Action]:
         return self.registry[key][action_name]
+
+    def get_policy(self, action_name: str) -> Optional[ActionPolicy]:
+        return self.policies.get(action_name)
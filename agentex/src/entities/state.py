@@ -1,12 +1,17 @@
 from collections import defaultdict
+from enum import Enum
 from typing import List, Dict, Any, Optional, Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from agentex.src.entities.llm import AssistantMessage, Message
 from agentex.utils.model_utils import BaseModel
 
 
+class ContextKey(str, Enum):
+    ARTIFACTS = "artifacts"
+
+
 class Choice(BaseModel):
     finish_reason: Literal["stop", "length", "content_filter", "tool_calls"]
     index: int
@@ -30,6 +35,78 @@ class Thread(BaseModel):
     messages: List[Message] = Field(
         default_factory=list,
     )
+    version: int = Field(
+        0,
+        description="Advances by the number of messages on every append and by one on any other mutation."
+    )
+    base_version: int = Field(
+        0,
+        description="The version after the last mutation that was not an append."
+    )
+    base_length: int = Field(
+        0,
+        description="The thread length after the last mutation that was not an append."
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_base_length(cls, data: Any) -> Any:
+        # Threads stored before versioning have no version fields; all of their messages predate version 0
+        if isinstance(data, dict) and not {"version", "base_version", "base_length"} & data.keys():
+            data = {**data, "base_length": len(data.get("messages") or [])}
+        return data
+
+    def record_append(self, count: int) -> None:
+        self.version += count
+
+    def record_rewrite(self) -> None:
+        self.version += 1
+        self.base_version = self.version
+        self.base_length = len(self.messages)
+
+    def length_at(self, version: int) -> Optional[int]:
+        """
+        The length the thread had at the given version, or None if the thread was rewritten since then and
+        the messages after that version can no longer be expressed as a suffix.
+        """
+        if version < self.base_version or version > self.version:
+            return None
+        return self.base_length + (version - self.base_version)
+
+
+class ThreadAppendResult(BaseModel):
+    length: int = Field(
+        ...,
+        description="The length of the thread after the append."
+    )
+    version: int = Field(
+        ...,
+        description="The version of the thread after the append."
+    )
+
+
+class ThreadSlice(BaseModel):
+    messages: List[Message] = Field(
+        default_factory=list,
+        description="The requested messages, oldest first."
+    )
+    offset: int = Field(
+        0,
+        description="The index in the thread of the first returned message."
+    )
+    length: int = Field(
+        0,
+        description="The total length of the thread."
+    )
+    version: int = Field(
+        0,
+        description="The current version of the thread. Pass it as `since_version` to fetch only newer messages."
+    )
+    reset: bool = Field(
+        False,
+        description="Whether the thread was rewritten since the requested version, in which case `messages` "
+                    "is the whole thread and replaces what the caller had."
+    )
 
 
 class AgentState(BaseModel):
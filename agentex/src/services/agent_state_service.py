@@ -1,9 +1,14 @@
+from datetime import timedelta
 from typing import List, Dict, Any, Optional
 
-from agentex.src.entities.llm import Message
-from agentex.src.entities.state import Thread
+from agentex.src.entities.actions import ActionResponse, Artifact, ArtifactSummary
+from agentex.src.entities.llm import Message, ToolMessage
+from agentex.src.entities.state import ContextKey, Thread, ThreadAppendResult, ThreadSlice
 from agentex.src.services.agent_state_repository import AgentStateRepository
 
+# A memoized result only has to outlive the retries of its take_action, which give up well within a day
+DEFAULT_ACTION_RESULT_TTL = timedelta(days=1)
+
 
 class ThreadsService:
 
@@ -37,19 +42,99 @@ class ThreadsService:
             for i in indices
         ]
 
-    async def append_message(self, task_id: str, thread_name: str, message: Message) -> None:
+    async def get_thread_slice(
+        self,
+        task_id: str,
+        thread_name: str,
+        tail: Optional[int] = None,
+        since_version: Optional[int] = None,
+    ) -> ThreadSlice:
+        """
+        Returns part of a thread: the messages added after `since_version` and/or the last `tail` messages.
+        With neither, the whole thread is returned.
+        """
+        state = await self.repository.load(task_id)
+        thread = state.threads.get(thread_name) or Thread()
+        length = len(thread.messages)
+        offset = 0
+        reset = False
+        if since_version is not None:
+            length_at_version = thread.length_at(since_version)
+            if length_at_version is None:
+                reset = True
+            else:
+                offset = length_at_version
+        if tail is not None and not reset:
+            offset = max(offset, length - tail)
+        return ThreadSlice(
+            messages=thread.messages[offset:],
+            offset=offset,
+            length=length,
+            version=thread.version,
+            reset=reset,
+        )
+
+    async def get_last_message(self, task_id: str, thread_name: str, role: Optional[str] = None) -> Optional[Message]:
+        state = await self.repository.load(task_id)
+        thread = state.threads.get(thread_name) or Thread()
+        return next((m for m in reversed(thread.messages) if role is None or m.role == role), None)
+
+    async def append_message(self, task_id: str, thread_name: str, message: Message) -> ThreadAppendResult:
+        return await self.batch_append_messages(task_id=task_id, thread_name=thread_name, messages=[message])
+
+    async def batch_append_messages(self, task_id: str, thread_name: str, messages: List[Message]) -> ThreadAppendResult:
         state = await self.repository.load(task_id)
         if thread_name not in state.threads:
             state.threads[thread_name] = Thread()
-        state.threads[thread_name].messages.append(message)
+        thread = state.threads[thread_name]
+        thread.messages.extend(messages)
+        thread.record_append(len(messages))
         await self.repository.save(task_id, state)
+        return ThreadAppendResult(length=len(thread.messages), version=thread.version)
+
+    async def upsert_tool_message(self, task_id: str, thread_name: str, message: ToolMessage) -> ThreadAppendResult:
+        """
+        Appends a tool message, or replaces the message already recorded for the same tool call, so that a
+        retried tool call does not leave duplicate results in the thread.
+        """
+        return await self.batch_upsert_tool_messages(task_id=task_id, thread_name=thread_name, messages=[message])
 
-    async def batch_append_messages(self, task_id: str, thread_name: str, messages: List[Message]) -> None:
+    async def batch_upsert_tool_messages(
+        self, task_id: str, thread_name: str, messages: List[ToolMessage]
+    ) -> ThreadAppendResult:
+        """
+        Upserts several tool messages in a single write, so replacing any number of them rewrites the thread
+        (and makes delta readers reload it) only once.
+        """
         state = await self.repository.load(task_id)
         if thread_name not in state.threads:
             state.threads[thread_name] = Thread()
-        state.threads[thread_name].messages.extend(messages)
+        thread = state.threads[thread_name]
+        appended = 0
+        replaced = False
+        for message in messages:
+            index = next(
+                (
+                    i for i in range(len(thread.messages) - 1, -1, -1)
+                    if isinstance(thread.messages[i], ToolMessage)
+                    and thread.messages[i].tool_call_id == message.tool_call_id
+                ),
+                None
+            )
+            if index is None:
+                thread.messages.append(message)
+                appended += 1
+            elif thread.messages[index] != message:
+                thread.messages[index] = message
+                replaced = True
+        if replaced:
+            thread.record_rewrite()
+        elif appended:
+            thread.record_append(appended)
+        else:
+            return ThreadAppendResult(length=len(thread.messages), version=thread.version)
         await self.repository.save(task_id, state)
+        return ThreadAppendResult(length=len(thread.messages), version=thread.version)
 
     async def override_message(self, task_id: str, thread_name: str, index: int, message: Message) -> None:
         state = await self.repository.load(task_id)
@@ -57,22 +142,29 @@ class ThreadsService:
             state.threads[thread_name] = Thread()
         if 0 <= index < len(state.threads[thread_name].messages):
             state.threads[thread_name].messages[index] = message
+            state.threads[thread_name].record_rewrite()
             await self.repository.save(task_id, state)
 
     async def batch_override_messages(self, task_id: str, thread_name: str, updates: Dict[int, Message]) -> None:
         state = await self.repository.load(task_id)
         if thread_name not in state.threads:
             state.threads[thread_name] = Thread()
+        thread = state.threads[thread_name]
+        applied = False
         for index, message in updates.items():
-            if 0 <= index < len(state.threads[thread_name].messages):
-                state.threads[thread_name].messages[index] = message
-        await self.repository.save(task_id, state)
+            if 0 <= index < len(thread.messages) and thread.messages[index] != message:
+                thread.messages[index] = message
+                applied = True
+        if applied:
+            thread.record_rewrite()
+            await self.repository.save(task_id, state)
 
     async def insert_message(self, task_id: str, thread_name: str, index: int, message: Message) -> None:
         state = await self.repository.load(task_id)
         if thread_name not in state.threads:
             state.threads[thread_name] = Thread()
         state.threads[thread_name].messages.insert(index, message)
+        state.threads[thread_name].record_rewrite()
         await self.repository.save(task_id, state)
 
     async def batch_insert_messages(self, task_id: str, thread_name: str, inserts: Dict[int, Message]) -> None:
@@ -81,6 +173,7 @@ class ThreadsService:
             state.threads[thread_name] = Thread()
         for index, message in inserts.items():
             state.threads[thread_name].messages.insert(index, message)
+        state.threads[thread_name].record_rewrite()
         await self.repository.save(task_id, state)
 
     async def delete_message(self, task_id: str, thread_name: str, index: int) -> None:
@@ -89,6 +182,7 @@ class ThreadsService:
             state.threads[thread_name] = Thread()
         if 0 <= index < len(state.threads[thread_name].messages):
             del state.threads[thread_name].messages[index]
+            state.threads[thread_name].record_rewrite()
             await self.repository.save(task_id, state)
 
     async def delete_all_messages(self, task_id: str, thread_name: str) -> None:
@@ -96,6 +190,7 @@ class ThreadsService:
         if thread_name not in state.threads:
             state.threads[thread_name] = Thread()
         state.threads[thread_name].messages = []
+        state.threads[thread_name].record_rewrite()
         await self.repository.save(task_id, state)
 
     async def delete_thread(self, task_id: str, thread_name: str) -> None:
@@ -121,6 +216,11 @@ class ContextService:
         state = await self.repository.load(task_id)
         return {key: state.context.get(key) for key in keys}
 
+    async def list_artifacts(self, task_id: str) -> List[ArtifactSummary]:
+        """Returns the task's artifacts without their content."""
+        artifacts = await self.get_value(task_id, ContextKey.ARTIFACTS) or []
+        return [ArtifactSummary.from_artifact(Artifact.model_validate(artifact)) for artifact in artifacts]
+
     async def set_value(self, task_id: str, key: str, value: Any) -> None:
         state = await self.repository.load(task_id)
         state.context[key] = value
@@ -151,7 +251,36 @@ class ContextService:
         await self.repository.save(task_id, state)
 
 
+class ActionResultsService:
+    """
+    Memoizes the results of completed tool calls, keyed by task and tool call id, so that a retried take_action
+    returns the recorded result instead of executing the action again. Results expire after `ttl`, since the
+    keys are not removed with the task's state.
+    """
+
+    def __init__(self, repository: AgentStateRepository, ttl: timedelta = DEFAULT_ACTION_RESULT_TTL):
+        self.kv_store = repository.kv_store
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(task_id: str, tool_call_id: str) -> str:
+        return f"{task_id}:action_results:{tool_call_id}"
+
+    async def get(self, task_id: str, tool_call_id: str) -> Optional[ActionResponse]:
+        data = await self.kv_store.get(self._key(task_id, tool_call_id))
+        if data is None:
+            return None
+        return ActionResponse.from_json(data)
+
+    async def set(self, task_id: str, tool_call_id: str, response: ActionResponse) -> None:
+        await self.kv_store.set(self._key(task_id, tool_call_id), response.to_json(), ttl=self.ttl)
+
+    async def delete(self, task_id: str, tool_call_id: str) -> None:
+        await self.kv_store.delete(self._key(task_id, tool_call_id))
+
+
 class AgentStateService:
-    def __init__(self, repository: AgentStateRepository):
+    def __init__(self, repository: AgentStateRepository, action_result_ttl: timedelta = DEFAULT_ACTION_RESULT_TTL):
         self.threads = ThreadsService(repository)
         self.context = ContextService(repository)
+        self.action_results = ActionResultsService(repository, ttl=action_result_ttl)
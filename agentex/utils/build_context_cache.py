@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import Field
+
+from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
+
+logger = make_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("AGENTEX_CACHE_DIR", Path.home() / ".cache" / "agentex"))
+DEFAULT_MAX_CACHED_ARCHIVES = 5
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ContextEntry(BaseModel):
+    arcname: str = Field(
+        ...,
+        description="The path of the file inside the build context archive."
+    )
+    path: Path = Field(
+        ...,
+        description="The path of the file on disk."
+    )
+    size: int = Field(
+        ...,
+        description="The size of the file in bytes."
+    )
+    mtime_ns: int = Field(
+        ...,
+        description="The modification time of the file, used to tell whether its cached hash is still valid."
+    )
+    mode: int = Field(
+        ...,
+        description="The permission bits of the file, which end up in the archive as well."
+    )
+    sha256: Optional[str] = Field(
+        None,
+        description="The hash of the file's content, once computed."
+    )
+
+    @classmethod
+    def from_path(cls, path: Path, arcname: str) -> "ContextEntry":
+        stat = path.stat()
+        return cls(arcname=arcname, path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, mode=stat.st_mode & 0o777)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildContextCache:
+    """
+    Caches compressed build context archives, keyed by a digest of the context's content manifest.
+
+    File hashes are remembered together with the size and modification time they were computed for, so only
+    files that changed since the last build are read again, like git's index. An unchanged context is
+    recognized from file metadata alone and its previous archive is reused as is.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_archives: int = DEFAULT_MAX_CACHED_ARCHIVES):
+        self.cache_dir = Path(cache_dir)
+        self.archive_dir = self.cache_dir / "build-contexts"
+        self.hashes_path = self.cache_dir / "file-hashes.json"
+        self.max_archives = max_archives
+
+    def _load_hashes(self) -> Dict[str, Tuple[int, int, str]]:
+        try:
+            with open(self.hashes_path) as file:
+                return {path: tuple(value) for path, value in json.load(file).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_hashes(self, hashes: Dict[str, Tuple[int, int, str]]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.hashes_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w") as file:
+            json.dump(hashes, file)
+        os.replace(temp_path, self.hashes_path)
+
+    def hash_entries(self, entries: List[ContextEntry]) -> None:
+        """
+        Sets the sha256 of every entry, rehashing only files whose size or modification time changed. Only the
+        hashes of these entries are kept, so files that left the context do not accumulate in the cache.
+        """
+        hashes = self._load_hashes()
+        current = {str(entry.path) for entry in entries}
+        stale = []
+        for entry in entries:
+            cached = hashes.get(str(entry.path))
+            if cached is not None and cached[0] == entry.size and cached[1] == entry.mtime_ns:
+                entry.sha256 = cached[2]
+            else:
+                stale.append(entry)
+        if stale:
+            logger.info(f"Hashing {len(stale)} changed files of the build context")
+            with ThreadPoolExecutor(thread_name_prefix="agentex-hash") as executor:
+                for entry, sha256 in zip(stale, executor.map(_hash_file, [entry.path for entry in stale])):
+                    entry.sha256 = sha256
+                    hashes[str(entry.path)] = (entry.size, entry.mtime_ns, sha256)
+        pruned = {path: value for path, value in hashes.items() if path in current}
+        if stale or len(pruned) != len(hashes):
+            self._save_hashes(pruned)
+
+    def digest(self, entries: List[ContextEntry]) -> str:
+        """The content digest of the build context: the archived path, mode and content hash of every file."""
+        self.hash_entries(entries)
+        digest = hashlib.sha256()
+        for entry in sorted(entries, key=lambda entry: entry.arcname):
+            digest.update(f"{entry.arcname}\0{entry.mode:o}\0{entry.sha256}\n".encode())
+        return digest.hexdigest()
+
+    def archive_path(self, digest: str, suffix: str = ".tar.gz") -> Path:
+        return self.archive_dir / f"{digest}{suffix}"
+
+    def prune(self) -> None:
+        """Removes all but the most recently used archives."""
+        archives = sorted(
+            (path for path in self.archive_dir.glob("*") if path.is_file() and not path.name.endswith(".tmp")),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for path in archives[self.max_archives:]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,75 @@
+import gzip
+import io
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Deque, Optional
+
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    """
+    A writable stream that gzips its input on several threads, in the style of pigz.
+
+    The input is cut into blocks that are compressed independently as separate gzip members and written out in
+    order. Concatenated members are a valid gzip stream that every gzip reader (including Docker's) decompresses
+    to the original data. zlib releases the GIL, so the blocks really are compressed in parallel. At most two
+    blocks per thread are buffered at any time.
+    """
+
+    def __init__(
+        self,
+        fileobj: IO[bytes],
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+        threads: Optional[int] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        """
+        :param fileobj: The stream to write the compressed output to. It is not closed by this writer.
+        :param level: The gzip compression level.
+        :param threads: The number of compression threads. Defaults to the number of CPUs.
+        :param block_size: The size of the blocks compressed independently.
+        """
+        super().__init__()
+        self.fileobj = fileobj
+        self.level = level
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size
+        self._buffer = bytearray()
+        self._pending: Deque[Future] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="agentex-gzip")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._executor.submit(gzip.compress, block, self.level, mtime=0))
+        # Bound memory: once every thread has a block queued, wait for the oldest one
+        while len(self._pending) > 2 * self.threads:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.fileobj.write(self._pending.popleft().result())
+        self.fileobj.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
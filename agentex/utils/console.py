@@ -1,13 +1,23 @@
-from typing import List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
 
-from rich import box
-from rich.table import Table
-from rich.console import Console
+if TYPE_CHECKING:
+    from rich.console import Console
 
-console = Console()
+
+@lru_cache(maxsize=None)
+def get_console() -> "Console":
+    """The console shared by all of agentex's output, created on first use since importing rich is slow."""
+    from rich.console import Console
+
+    return Console()
 
 
 def print_section(name: str, contents: List[str], subtitle: Optional[str] = None):
+    from rich import box
+    from rich.table import Table
+
+    console = get_console()
     console.print()
     table = Table(box=box.SQUARE, caption=subtitle, show_header=False, expand=True)
     table.title = name
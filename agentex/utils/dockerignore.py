@@ -0,0 +1,163 @@
+import posixpath
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern
+
+
+class IgnorePattern:
+    """A single .dockerignore pattern, compiled to regular expressions."""
+
+    def __init__(self, pattern: str, negated: bool = False, anchored: bool = False, directory_only: bool = False):
+        self.pattern = pattern
+        self.negated = negated
+        self.anchored = anchored
+        self.directory_only = directory_only
+        prefix = "" if anchored else "(?:.*/)?"
+        # A path also matches if one of its parent directories does, and a directory-only pattern matches files
+        # only through a parent directory
+        self.dir_source = f"{prefix}{_translate(pattern)}(?:/.*)?"
+        self.file_source = f"{prefix}{_translate(pattern)}/.*" if directory_only else self.dir_source
+        self.dir_regex = re.compile(self.dir_source, re.DOTALL)
+        self.file_regex = re.compile(self.file_source, re.DOTALL)
+
+    @classmethod
+    def parse(cls, line: str) -> Optional["IgnorePattern"]:
+        """Parses a line of a .dockerignore. Returns None for blank lines and comments."""
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return None
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:].strip()
+        directory_only = line.endswith("/")
+        # Like .gitignore, a pattern with a slash other than a trailing one is relative to the context root, and
+        # one without matches at any depth
+        anchored = "/" in line.rstrip("/")
+        pattern = posixpath.normpath(line.strip("/")) if line.strip("/") else ""
+        if pattern in ("", "."):
+            return None
+        return cls(pattern, negated=negated, anchored=anchored, directory_only=directory_only)
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        regex = self.dir_regex if is_dir else self.file_regex
+        return regex.fullmatch(path) is not None
+
+    def may_match_below(self, directory: str) -> bool:
+        """Whether this pattern could match a path inside `directory`, used to tell if it can be pruned."""
+        if not self.anchored:
+            # Without an anchor, the last component can match at any depth
+            return True
+        pattern_parts = self.pattern.split("/")
+        for index, part in enumerate(directory.split("/")):
+            if index >= len(pattern_parts) or pattern_parts[index] == "**":
+                # The pattern matches a parent of the directory, or spans any number of directories
+                return True
+            if not fnmatchcase(part, pattern_parts[index]):
+                return False
+        return True
+
+
+def _translate(pattern: str) -> str:
+    """Translates a glob to a regex, where `*` and `?` stop at `/` and `**` spans any number of directories."""
+    result = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**", index):
+            index += 2
+            if pattern.startswith("/", index):
+                # `**/` matches zero or more leading directories
+                result.append("(?:.*/)?")
+                index += 1
+            else:
+                result.append(".*")
+            continue
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            result.append(re.escape(pattern[index]))
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                body = pattern[index + 1:end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                index = end
+        else:
+            result.append(re.escape(char))
+        index += 1
+    return "".join(result)
+
+
+def _combine(sources: Iterable[str]) -> Pattern:
+    return re.compile("|".join(f"(?:{source})" for source in sources), re.DOTALL)
+
+
+class DockerIgnore:
+    """
+    A compiled .dockerignore, matched against paths relative to the build context root.
+
+    Where Docker and .gitignore differ, patterns follow .gitignore: a pattern without a slash other than a
+    trailing one, like `*.pyc` or `node_modules/`, matches at any depth, where Docker would only match it at the
+    context root. A pattern with a slash is anchored at the root, as in both. A path is ignored if the last
+    pattern matching it or one of its parent directories is not negated, `**` matches any number of directories
+    and a trailing `/` matches directories only.
+
+    An anchored `!` pattern can re-include files inside an ignored directory, as in Docker. An unanchored one
+    cannot, as in .gitignore, so `!keep.pyc` re-includes that file anywhere except below an ignored directory
+    and never keeps one from being pruned. Patterns are compiled once, and without negations they are combined
+    into a single regex.
+    """
+
+    def __init__(self, patterns: List[IgnorePattern]):
+        self.patterns = patterns
+        self.has_negations = any(pattern.negated for pattern in patterns)
+        self._combined_file: Optional[Pattern] = None
+        self._combined_dir: Optional[Pattern] = None
+        if patterns and not self.has_negations:
+            self._combined_file = _combine(pattern.file_source for pattern in patterns)
+            self._combined_dir = _combine(pattern.dir_source for pattern in patterns)
+
+    @classmethod
+    def from_lines(cls, lines: List[str]) -> "DockerIgnore":
+        patterns = [IgnorePattern.parse(line) for line in lines]
+        return cls([pattern for pattern in patterns if pattern is not None])
+
+    @classmethod
+    def from_file(cls, dockerignore_path: Path) -> "DockerIgnore":
+        with open(dockerignore_path, "r") as file:
+            return cls.from_lines(file.read().splitlines())
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """
+        :param path: The path relative to the build context root, with `/` separators.
+        :param is_dir: Whether the path is a directory, which directory-only patterns like `build/` require.
+        """
+        if self._combined_file is not None:
+            combined = self._combined_dir if is_dir else self._combined_file
+            return combined.fullmatch(path) is not None
+        for pattern in reversed(self.patterns):
+            if pattern.matches(path, is_dir):
+                if not pattern.negated:
+                    return True
+                return not pattern.anchored and self._parent_ignored(path)
+        return False
+
+    def _parent_ignored(self, path: str) -> bool:
+        parent = posixpath.dirname(path)
+        return bool(parent) and self.is_ignored(parent, is_dir=True)
+
+    def can_prune(self, directory: str) -> bool:
+        """Whether the directory is ignored along with everything inside it, so a walk need not descend into it."""
+        if not self.is_ignored(directory, is_dir=True):
+            return False
+        return not any(
+            pattern.negated and pattern.anchored and pattern.may_match_below(directory) for pattern in self.patterns
+        )
@@ -1,13 +1,15 @@
 from typing import Dict, Any
 
-import jsonref
-from jsonschema import validate as schema_validation
+# jsonref (which pulls in requests) and jsonschema are slow to import and only needed once a schema is actually
+# resolved or validated, so they are imported on first use
 
 
 def resolve_refs(schema: dict) -> dict:
     """
     Resolve JSON references in a schema.
     """
+    import jsonref
+
     resolved = jsonref.replace_refs(schema, proxies=False, lazy_load=False)
     serializable = {
         "type": resolved.get("type"),
@@ -20,4 +22,6 @@ def resolve_refs(schema: dict) -> dict:
 
 def validate_payload(json_schema: Dict[str, Any], payload: Dict[str, Any]) -> None:
     """Validate the payload against the JSON schema."""
+    from jsonschema import validate as schema_validation
+
     schema_validation(instance=payload, schema=json_schema)
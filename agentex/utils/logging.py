@@ -1,7 +1,33 @@
 import logging
 
-from rich.console import Console
-from rich.logging import RichHandler
+from agentex.utils.console import get_console
+
+
+class LazyRichHandler(logging.Handler):
+    """
+    A handler that prints colored text with rich, but only imports rich and creates its handler once the first
+    record is emitted, so that importing a module that has a logger stays cheap.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._handler = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            from rich.logging import RichHandler
+
+            self._handler = RichHandler(
+                console=get_console(),
+                show_level=False,
+                show_path=False,
+                show_time=False,
+            )
+        # Formatters are set on this handler, possibly after the first record, so pass the current one on
+        if self._handler.formatter is not self.formatter:
+            self._handler.setFormatter(self.formatter)
+        # The logger and handle() already applied this handler's level and filters, so skip the inner handler's own
+        self._handler.emit(record)
 
 
 def make_logger(name: str):
@@ -10,22 +36,14 @@ def make_logger(name: str):
     :param name: The name of the module to create the logger for.
     :return: A logger object.
     """
-    # Create a console object to print colored text
-    console = Console()
-
     # Create a logger object with the name of the current module
     logger = logging.getLogger(name)
 
     # Set the global log level to INFO
     logger.setLevel(logging.INFO)
 
-    # Add the RichHandler to the logger to print colored text
-    handler = RichHandler(
-        console=console,
-        show_level=False,
-        show_path=False,
-        show_time=False,
-    )
-    logger.addHandler(handler)
+    # Add a handler to the logger to print colored text, unless it already has one
+    if not any(isinstance(handler, LazyRichHandler) for handler in logger.handlers):
+        logger.addHandler(LazyRichHandler())
 
     return logger
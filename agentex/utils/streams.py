@@ -0,0 +1,115 @@
+import io
+import queue
+from typing import IO, Optional
+
+DEFAULT_PIPE_CAPACITY = 16
+_PUT_TIMEOUT = 0.1
+
+
+class Pipe(io.RawIOBase):
+    """
+    A bounded in-memory pipe that hands bytes from a producer thread to a consumer.
+
+    The producer blocks while `capacity` writes are waiting to be read, so memory stays bounded however much data
+    flows through. An error the producer closes the pipe with is raised to the consumer, and a consumer that
+    stops reading makes further writes fail with BrokenPipeError instead of blocking forever.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_PIPE_CAPACITY):
+        super().__init__()
+        self._queue: queue.Queue = queue.Queue(maxsize=capacity)
+        self._buffer = b""
+        self._eof = False
+        self._reader_closed = False
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._put(bytes(data))
+        return len(data)
+
+    def _put(self, item) -> None:
+        while True:
+            if self._reader_closed:
+                raise BrokenPipeError("The reader of the pipe was closed")
+            try:
+                self._queue.put(item, timeout=_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def close_writer(self, error: Optional[BaseException] = None) -> None:
+        """Signals the end of the data, or that producing it failed with `error`."""
+        try:
+            self._put(error)
+        except BrokenPipeError:
+            pass
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._eof:
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+            elif isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            else:
+                self._buffer = item
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        self._reader_closed = True
+        super().close()
+
+
+class TeeWriter(io.RawIOBase):
+    """A writable stream that writes everything to two streams."""
+
+    def __init__(self, first: IO[bytes], second: IO[bytes]):
+        super().__init__()
+        self.first = first
+        self.second = second
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.first.write(data)
+        self.second.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.first.flush()
+        self.second.flush()
+
+
+def read_chunk(stream: IO[bytes], size: int) -> bytes:
+    """Reads exactly `size` bytes, or fewer only at the end of the stream."""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        data = stream.read(remaining)
+        if not data:
+            break
+        chunks.append(data)
+        remaining -= len(data)
+    return b"".join(chunks)
+
+
+def skip(stream: IO[bytes], offset: int) -> None:
+    """Positions the stream at `offset` from its current start, seeking if possible and reading otherwise."""
+    if stream.seekable():
+        stream.seek(offset)
+        return
+    while offset > 0:
+        data = stream.read(min(offset, io.DEFAULT_BUFFER_SIZE * 64))
+        if not data:
+            raise EOFError(f"The stream ended {offset} bytes before the requested offset")
+        offset -= len(data)
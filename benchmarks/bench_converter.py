@@ -0,0 +1,54 @@
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from agentex.sdk.execution.converter import PydanticPayloadConverter
+from agentex.sdk.execution.worker import DateTimePayloadConverter
+from agentex.src.entities.llm import Message
+from agentex.src.entities.state import Choice, Completion, Usage
+from conftest import MESSAGE_SIZES, THREAD_LENGTHS, make_messages
+
+
+@pytest.mark.parametrize("thread_length", THREAD_LENGTHS)
+@pytest.mark.parametrize("message_size", MESSAGE_SIZES)
+def bench_payload_round_trip_messages_stdlib(benchmark, thread_length, message_size):
+    converter = DateTimePayloadConverter()
+    adapter = TypeAdapter(List[Message])
+    messages = make_messages(thread_length, message_size)
+
+    def round_trip():
+        # The stdlib converter cannot decode the discriminated union directly, so the result is decoded
+        # untyped and then validated
+        [value] = converter.from_payloads(converter.to_payloads([messages]))
+        return adapter.validate_python(value)
+
+    benchmark(round_trip)
+
+
+@pytest.mark.parametrize("thread_length", THREAD_LENGTHS)
+@pytest.mark.parametrize("message_size", MESSAGE_SIZES)
+def bench_payload_round_trip_messages_pydantic(benchmark, thread_length, message_size):
+    converter = PydanticPayloadConverter()
+    messages = make_messages(thread_length, message_size)
+
+    def round_trip():
+        return converter.from_payloads(converter.to_payloads([messages]), [List[Message]])
+
+    benchmark(round_trip)
+
+
+@pytest.mark.parametrize("converter_class", [DateTimePayloadConverter, PydanticPayloadConverter])
+@pytest.mark.parametrize("message_size", MESSAGE_SIZES)
+def bench_payload_round_trip_completion(benchmark, converter_class, message_size):
+    converter = converter_class()
+    message = make_messages(2, message_size)[1]
+    completion = Completion(
+        choices=[Choice(finish_reason="tool_calls", index=0, message=message)],
+        usage=Usage(prompt_tokens=100, completion_tokens=100, total_tokens=200),
+    )
+
+    def round_trip():
+        return converter.from_payloads(converter.to_payloads([completion]), [Completion])
+
+    benchmark(round_trip)
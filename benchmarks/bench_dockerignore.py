@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from agentex.cli.models.action_manifest import BuildContextManager
+from agentex.utils.build_context_cache import BuildContextCache
+from agentex.utils.dockerignore import DockerIgnore
+
+SOURCE_DIRS = 20
+SOURCE_FILES = 10
+IGNORED_DIRS = 200
+IGNORED_FILES = 25
+
+DOCKERIGNORE = [
+    "# Python compiled files",
+    "__pycache__/",
+    "*.py[cod]",
+    "node_modules/",
+    ".venv/",
+    "/agent/dist",
+    "**/*.log",
+]
+
+# The same dockerignore with a negation that could re-include files in every package, so the walk descends into them
+DOCKERIGNORE_WITH_NEGATION = DOCKERIGNORE + ["!agent/node_modules/**/keep.txt"]
+
+
+@pytest.fixture(scope="module")
+def large_tree(tmp_path_factory) -> Path:
+    """A build context whose source files are dwarfed by ignored dependency directories, like a typical monorepo."""
+    root = tmp_path_factory.mktemp("context")
+    for i in range(SOURCE_DIRS):
+        source_dir = root / "agent" / f"module_{i}"
+        source_dir.mkdir(parents=True)
+        for j in range(SOURCE_FILES):
+            (source_dir / f"file_{j}.py").write_text("pass\n")
+    for i in range(IGNORED_DIRS):
+        ignored_dir = root / "agent" / "node_modules" / f"package_{i}" / "lib"
+        ignored_dir.mkdir(parents=True)
+        for j in range(IGNORED_FILES):
+            (ignored_dir / f"file_{j}.js").write_text("")
+    return root
+
+
+def _walk(root: Path, dockerignore: DockerIgnore) -> BuildContextManager:
+    build_context = BuildContextManager(agent_manifest=None, build_context_root=root, cache=BuildContextCache(root))
+    build_context.add_directory(directory_path=root / "agent", context_root=root, dockerignore=dockerignore)
+    return build_context
+
+
+@pytest.mark.parametrize("lines", [DOCKERIGNORE, DOCKERIGNORE_WITH_NEGATION], ids=["pruned", "unpruned"])
+def bench_build_context_walk(benchmark, large_tree, lines):
+    dockerignore = DockerIgnore.from_lines(lines)
+    build_context = benchmark(_walk, large_tree, dockerignore)
+    assert len(build_context.entries) == SOURCE_DIRS * SOURCE_FILES
+
+
+@pytest.mark.parametrize("lines", [DOCKERIGNORE, DOCKERIGNORE_WITH_NEGATION], ids=["combined", "ordered"])
+def bench_dockerignore_match(benchmark, large_tree, lines):
+    dockerignore = DockerIgnore.from_lines(lines)
+    paths = [
+        Path(current, name).relative_to(large_tree).as_posix()
+        for current, _, file_names in os.walk(large_tree)
+        for name in file_names
+    ]
+    benchmark(lambda: [dockerignore.is_ignored(path) for path in paths])
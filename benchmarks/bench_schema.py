@@ -0,0 +1,56 @@
+from typing import List
+
+import pytest
+from pydantic import Field, TypeAdapter
+
+from agentex.src.entities.actions import Action, ActionRegistry, ActionResponse
+from agentex.src.entities.llm import Message
+from agentex.utils.json_schema import resolve_refs
+from agentex.utils.model_utils import BaseModel
+from conftest import MESSAGE_SIZES, THREAD_LENGTHS, make_messages
+
+REGISTRY_KEY = "benchmark"
+
+
+class Company(BaseModel):
+    name: str
+    category: str
+
+
+class ProcessCompanies(Action):
+    """
+    Process a list of companies. Nested models exercise $ref resolution.
+    """
+    companies: List[Company] = Field(..., description="The companies to process")
+    keyword: str = Field(..., description="The keyword to filter by")
+
+    async def execute(self) -> ActionResponse:
+        return ActionResponse(message="ok")
+
+
+def _make_action(index: int):
+    return type(f"BenchmarkAction{index}", (ProcessCompanies,), {"__doc__": f"Benchmark action {index}."})
+
+
+@pytest.mark.parametrize("thread_length", THREAD_LENGTHS)
+@pytest.mark.parametrize("message_size", MESSAGE_SIZES)
+def bench_message_union_validation(benchmark, thread_length, message_size):
+    adapter = TypeAdapter(List[Message])
+    payload = [message.to_dict() for message in make_messages(thread_length, message_size)]
+    benchmark(adapter.validate_python, payload)
+
+
+@pytest.mark.parametrize("action_count", [2, 10, 50])
+def bench_action_registry_get(benchmark, action_count):
+    actions = [_make_action(i) for i in range(action_count)]
+    registry = ActionRegistry(actions={REGISTRY_KEY: actions})
+    benchmark(registry.get, key=REGISTRY_KEY, action_name="benchmark_action0")
+
+
+def bench_function_call_schema(benchmark):
+    benchmark(ProcessCompanies.function_call_schema)
+
+
+def bench_resolve_refs(benchmark):
+    schema = ProcessCompanies.model_json_schema()
+    benchmark(resolve_refs, schema)
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+from typing import Dict
+
+CLI_MODULE = "agentex.cli.commands.main"
+
+# Import time the CLI may add on top of typer (which imports rich itself) before running any command, relative to
+# the import time of typer in the same run so the budget holds on fast and slow machines alike
+CLI_IMPORT_BUDGET_RATIO = 0.5
+
+# Modules only individual commands need, which must not be imported just to start the CLI
+DEFERRED_MODULES = [
+    "httpx",
+    "jsonref",
+    "jsonschema",
+    "agentex.client.agentex",
+    "agentex.cli.handlers.agent_handlers",
+    "agentex.cli.handlers.task_handlers",
+    "agentex.src.entities.actions",
+]
+
+
+def _import_cli() -> None:
+    subprocess.run([sys.executable, "-c", f"import {CLI_MODULE}"], check=True)
+
+
+def _cumulative_import_times_us(module: str) -> Dict[str, int]:
+    """The cumulative import time of every module imported by `module`, as reported by `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def bench_cli_startup(benchmark):
+    benchmark.pedantic(_import_cli, rounds=10, warmup_rounds=1)
+
+
+def bench_cli_import_budget():
+    # The fastest of a few runs, to keep the budget check stable on busy machines
+    runs = [_cumulative_import_times_us(CLI_MODULE) for _ in range(3)]
+    times = min(runs, key=lambda times: (times[CLI_MODULE] - times["typer"]) / times["typer"])
+    overhead_ms = (times[CLI_MODULE] - times["typer"]) / 1000
+    typer_ms = times["typer"] / 1000
+    assert overhead_ms < typer_ms * CLI_IMPORT_BUDGET_RATIO, (
+        f"Importing the CLI took {overhead_ms:.1f}ms on top of typer, which took {typer_ms:.1f}ms"
+    )
+
+
+def bench_cli_defers_command_imports():
+    imported = _cumulative_import_times_us(CLI_MODULE)
+    eager = [module for module in DEFERRED_MODULES if module in imported]
+    assert not eager, f"Starting the CLI imports {eager}"
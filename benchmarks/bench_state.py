@@ -0,0 +1,67 @@
+import itertools
+
+import pytest
+
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+from agentex.src.entities.llm import UserMessage
+from agentex.src.entities.state import AgentState, Thread
+from agentex.src.services.agent_state_repository import AgentStateRepository
+from conftest import MESSAGE_SIZES, TASK_ID, THREAD_LENGTHS, THREAD_NAME, make_messages
+
+SHAPES = list(itertools.product(THREAD_LENGTHS, MESSAGE_SIZES))
+SHAPE_IDS = [f"len{length}-size{size}" for length, size in SHAPES]
+
+
+@pytest.mark.parametrize("thread_length,message_size", SHAPES, ids=SHAPE_IDS)
+def bench_repository_save(benchmark, event_loop_runner, thread_length, message_size):
+    repository = AgentStateRepository(kv_store=LocalKeyValueRepository())
+    state = AgentState(threads={THREAD_NAME: Thread(messages=make_messages(thread_length, message_size))})
+    benchmark(lambda: event_loop_runner(repository.save(TASK_ID, state)))
+
+
+@pytest.mark.parametrize("thread_length,message_size", SHAPES, ids=SHAPE_IDS)
+def bench_repository_load(benchmark, event_loop_runner, thread_length, message_size):
+    repository = AgentStateRepository(kv_store=LocalKeyValueRepository())
+    state = AgentState(threads={THREAD_NAME: Thread(messages=make_messages(thread_length, message_size))})
+    event_loop_runner(repository.save(TASK_ID, state))
+    benchmark(lambda: event_loop_runner(repository.load(TASK_ID)))
+
+
+@pytest.mark.parametrize("agent_state_service", SHAPES, ids=SHAPE_IDS, indirect=True)
+def bench_threads_append(benchmark, event_loop_runner, agent_state_service):
+    message = UserMessage(content="appended")
+    benchmark(lambda: event_loop_runner(agent_state_service.threads.append_message(
+        task_id=TASK_ID,
+        thread_name=THREAD_NAME,
+        message=message,
+    )))
+
+
+@pytest.mark.parametrize("agent_state_service", SHAPES, ids=SHAPE_IDS, indirect=True)
+def bench_threads_override(benchmark, event_loop_runner, agent_state_service):
+    message = UserMessage(content="overridden")
+    benchmark(lambda: event_loop_runner(agent_state_service.threads.override_message(
+        task_id=TASK_ID,
+        thread_name=THREAD_NAME,
+        index=0,
+        message=message,
+    )))
+
+
+@pytest.mark.parametrize("agent_state_service", SHAPES, ids=SHAPE_IDS, indirect=True)
+def bench_threads_insert(benchmark, event_loop_runner, agent_state_service):
+    message = UserMessage(content="inserted")
+    benchmark(lambda: event_loop_runner(agent_state_service.threads.insert_message(
+        task_id=TASK_ID,
+        thread_name=THREAD_NAME,
+        index=1,
+        message=message,
+    )))
+
+
+@pytest.mark.parametrize("agent_state_service", SHAPES, ids=SHAPE_IDS, indirect=True)
+def bench_threads_get_messages(benchmark, event_loop_runner, agent_state_service):
+    benchmark(lambda: event_loop_runner(agent_state_service.threads.get_messages(
+        task_id=TASK_ID,
+        thread_name=THREAD_NAME,
+    )))
@@ -0,0 +1,54 @@
+"""
+Micro-benchmarks for the O(history) hot paths of the SDK. Run with `make bench` (requires pytest-benchmark);
+results are stored as JSON under .benchmarks/ and `make bench-compare` fails on regressions.
+"""
+import asyncio
+from typing import List
+
+import pytest
+
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+from agentex.src.entities.llm import AssistantMessage, Message, ToolCall, ToolCallRequest, ToolMessage, UserMessage
+from agentex.src.entities.state import AgentState, Thread
+from agentex.src.services.agent_state_repository import AgentStateRepository
+from agentex.src.services.agent_state_service import AgentStateService
+
+THREAD_LENGTHS = [10, 100, 1000]
+MESSAGE_SIZES = [100, 10_000]
+TASK_ID = "benchmark-task"
+THREAD_NAME = "benchmark-thread"
+
+
+def make_messages(count: int, size: int) -> List[Message]:
+    """A realistic mix of user, assistant (with tool calls) and tool messages of roughly `size` bytes each."""
+    content = "x" * size
+    messages = []
+    for i in range(count):
+        if i % 3 == 0:
+            messages.append(UserMessage(content=content))
+        elif i % 3 == 1:
+            messages.append(AssistantMessage(
+                content=content,
+                tool_calls=[ToolCallRequest(id=f"call_{i}", function=ToolCall(name="fetch_news", arguments="{}"))],
+            ))
+        else:
+            messages.append(ToolMessage(content=content, tool_call_id=f"call_{i - 1}", name="fetch_news"))
+    return messages
+
+
+@pytest.fixture
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def agent_state_service(request):
+    """An AgentStateService over an in-memory store, pre-seeded with a thread of the parametrized shape."""
+    thread_length, message_size = request.param
+    kv_store = LocalKeyValueRepository()
+    repository = AgentStateRepository(kv_store=kv_store)
+    state = AgentState(threads={THREAD_NAME: Thread(messages=make_messages(thread_length, message_size))})
+    asyncio.run(repository.save(TASK_ID, state))
+    return AgentStateService(repository=repository)
@@ -1,19 +1,21 @@
 import asyncio
-from datetime import timedelta
 from typing import List
 
 from temporalio import workflow
-from temporalio.common import RetryPolicy
 
-from agentex.sdk.execution.helpers import WorkflowHelper
+from agentex.sdk.execution.event_log import (
+    TaskCanceledEvent,
+    TaskCompletedEvent,
+    TaskReceivedEvent,
+    ToolLoopStartedEvent,
+)
 from agentex.sdk.execution.workflow import AgentTaskWorkflowParams, BaseWorkflow
-from agentex.sdk.lib.activities.names import ActivityName
+from agentex.sdk.lib.activities import stubs
 from agentex.sdk.lib.activities.state import AppendMessagesToThreadParams, AddArtifactToContextParams
 from agentex.sdk.lib.workflows.action_loop import ActionLoop
 from agentex.src.entities.actions import Artifact
 from agentex.src.entities.llm import Message, UserMessage, SystemMessage, LLMConfig
 from agentex.src.entities.notifications import NotificationRequest
-from agentex.src.entities.state import Completion
 from agentex.utils.logging import make_logger
 from agentex.utils.model_utils import BaseModel
 from constants import AGENT_NAME, ActionRegistryKey
@@ -51,28 +53,39 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
         agent = params.agent
 
         writer_thread_name = "writer"
+        resumed = self.restore(params)
 
         try:
-            self.event_log.append({"event": "task_received", "task": task})
-
-            # Give the writer agent the initial instructions
-            await self._add_messages_to_thread(
-                task_id=task.id,
-                thread_name=writer_thread_name,
-                messages=[
-                    SystemMessage(content=self.writer_instructions),
-                    UserMessage(content=task.prompt)
-                ],
-            )
+            if not resumed:
+                self.event_log.append(TaskReceivedEvent(task_id=task.id, prompt_size=len(task.prompt)))
+
+                # Give the writer agent the initial instructions
+                await self._add_messages_to_thread(
+                    task_id=task.id,
+                    thread_name=writer_thread_name,
+                    messages=[
+                        SystemMessage(content=self.writer_instructions),
+                        UserMessage(content=task.prompt)
+                    ],
+                )
 
             # Run the tool loop
-            content = None
+            content = self.checkpoint_state.get("content")
             while True:
-                self.event_log.append({"event": "tool_loop_started"})
+                self.event_log.append(ToolLoopStartedEvent())
                 critic_satisfied = False
-                iteration = 0
-                critic_response = None
+                iteration = self.checkpoint_state.get("iteration", 0)
+                critic_response = self.checkpoint_state.get("critic_response")
                 while not critic_satisfied:
+                    # Each writer/critic round is resumable from these values, so the workflow may
+                    # continue as new between rounds instead of inside the action loops
+                    self.checkpoint_state = {
+                        "iteration": iteration,
+                        "critic_response": critic_response,
+                        "content": content,
+                    }
+                    await self.continue_as_new_if_needed()
+
                     if critic_response:
                         # Give the writer agent the initial instructions
                         await self._add_messages_to_thread(
@@ -99,6 +112,7 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
                         thread_name=writer_thread_name,
                         action_registry_key=ActionRegistryKey.WRITER,
                         model=self.model,
+                        continue_as_new=False,
                     )
                     await self._save_artifact(task_id=task.id, artifact=Artifact(
                         name=f"writer_draft_{iteration + 1}",
@@ -130,12 +144,12 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
                         thread_name=critic_thread_name,
                         action_registry_key=ActionRegistryKey.CRITIC,
                         model=self.model,
+                        continue_as_new=False,
                     )
                     logger.info("Critic tool loop finished")
 
-                    critic_satisfied_completion = await WorkflowHelper.execute_activity(
-                        activity_name=ActivityName.ASK_LLM,
-                        request=LLMConfig(
+                    critic_satisfied_completion = await stubs.ask_llm(
+                        LLMConfig(
                             model=self.model,
                             messages=[
                                 UserMessage(
@@ -147,10 +161,7 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
                                             f"needs to make revisions."
                                 )
                             ],
-                        ),
-                        response_type=Completion,
-                        start_to_close_timeout=timedelta(seconds=60),
-                        retry_policy=RetryPolicy(maximum_attempts=5),
+                        )
                     )
                     critic_satisfied = critic_satisfied_completion.choices[0].message.content.lower() == "false"
                     iteration += 1
@@ -160,6 +171,8 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
                         content=latest_content,
                     ))
 
+                # The next pass starts a fresh writer/critic cycle
+                self.checkpoint_state = {"content": content}
                 if params.require_approval:
                     logger.info("Waiting for instruction or approval")
                     self.waiting_for_instruction = True
@@ -168,17 +181,13 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
                             f"✅ {self.display_name} has executed the following task: {task.prompt} and is now "
                             f"waiting for your input."
                         )
-                        await WorkflowHelper.execute_activity(
-                            activity_name=ActivityName.SEND_NOTIFICATION,
-                            request=NotificationRequest(
+                        await stubs.send_notification(
+                            NotificationRequest(
                                 topic=agent.name,
                                 message=f"{preface}\n\n{self.display_name}:\n{content}",
                                 title=self.display_name,
                                 tags=["hourglass"],
-                            ),
-                            response_type=None,
-                            start_to_close_timeout=timedelta(seconds=60),
-                            retry_policy=RetryPolicy(maximum_attempts=5),
+                            )
                         )
                     await workflow.wait_condition(lambda: not self.waiting_for_instruction or self.task_approved)
                     if self.task_approved:
@@ -191,50 +200,38 @@ class DocWriterActorCriticWorkflow(BaseWorkflow):
                     break
 
             preface = f"🎉 {self.display_name} has completed the following task: {task.prompt}."
-            await WorkflowHelper.execute_activity(
-                activity_name=ActivityName.SEND_NOTIFICATION,
-                request=NotificationRequest(
+            await stubs.send_notification(
+                NotificationRequest(
                     topic=agent.name,
                     message=f"{preface}\n\n{self.display_name}:\n{content}",
                     title=self.display_name,
                     tags=["notification"],
-                ),
-                response_type=None,
-                start_to_close_timeout=timedelta(seconds=60),
-                retry_policy=RetryPolicy(maximum_attempts=5),
+                )
             )
             status = "completed"
-            self.event_log.append({"event": "task_completed", "status": status})
+            self.event_log.append(TaskCompletedEvent(status=status))
         except asyncio.CancelledError as error:
             logger.warning(f"Task canceled by user: {task.id}")
-            self.event_log.append({"event": "task_canceled", "error": str(error)})
+            self.event_log.append(TaskCanceledEvent(error=str(error)))
             raise error
 
         return status
 
     @staticmethod
     async def _add_messages_to_thread(task_id: str, thread_name: str, messages: List[Message]):
-        await WorkflowHelper.execute_activity(
-            activity_name=ActivityName.APPEND_MESSAGES_TO_THREAD,
-            request=AppendMessagesToThreadParams(
+        await stubs.append_messages_to_thread(
+            AppendMessagesToThreadParams(
                 task_id=task_id,
                 thread_name=thread_name,
                 messages=messages,
-            ),
-            response_type=List[Message],
-            start_to_close_timeout=timedelta(seconds=60),
-            retry_policy=RetryPolicy(maximum_attempts=5),
+            )
         )
 
     @staticmethod
     async def _save_artifact(task_id: str, artifact: Artifact):
-        await WorkflowHelper.execute_activity(
-            activity_name=ActivityName.ADD_ARTIFACT_TO_CONTEXT,
-            request=AddArtifactToContextParams(
+        await stubs.add_artifact_to_context(
+            AddArtifactToContextParams(
                 task_id=task_id,
                 artifact=artifact
-            ),
-            response_type=None,
-            start_to_close_timeout=timedelta(seconds=60),
-            retry_policy=RetryPolicy(maximum_attempts=5),
+            )
         )
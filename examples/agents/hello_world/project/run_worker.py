@@ -16,13 +16,13 @@ from workflow import HelloWorldWorkflow
 
 
 async def main():
-    worker = AgentexWorker(task_queue=TASK_QUEUE_NAME)
-
     # Initialize adapters
     redis_repository = RedisRepository()
     llm_gateway = LiteLLMGateway()
     notification_gateway = NtfyGateway()
 
+    worker = AgentexWorker(task_queue=TASK_QUEUE_NAME, kv_store=redis_repository)
+
     # Initialize services
     agent_state_repository = AgentStateRepository(kv_store=redis_repository)
     agent_state_service = AgentStateService(repository=agent_state_repository)
@@ -50,7 +50,10 @@ async def main():
     await worker.run(
         activities=[
             agent_state_activities.append_messages_to_thread,
+            agent_state_activities.upsert_tool_messages_in_thread,
             agent_state_activities.get_messages_from_thread,
+            agent_state_activities.get_thread_slice,
+            agent_state_activities.get_last_message,
             action_loop_activities.decide_action,
             action_loop_activities.take_action,
             notification_activities.send_notification,
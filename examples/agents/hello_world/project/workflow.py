@@ -1,17 +1,19 @@
 import asyncio
-from datetime import timedelta
-from typing import List
 
 from temporalio import workflow
-from temporalio.common import RetryPolicy
 
 from agentex.constants import DEFAULT_ROOT_THREAD_NAME
-from agentex.sdk.execution.helpers import WorkflowHelper
+from agentex.sdk.execution.event_log import (
+    TaskCanceledEvent,
+    TaskCompletedEvent,
+    TaskReceivedEvent,
+    ToolLoopStartedEvent,
+)
 from agentex.sdk.execution.workflow import AgentTaskWorkflowParams, BaseWorkflow
-from agentex.sdk.lib.activities.names import ActivityName
+from agentex.sdk.lib.activities import stubs
 from agentex.sdk.lib.activities.state import AppendMessagesToThreadParams
 from agentex.sdk.lib.workflows.action_loop import ActionLoop
-from agentex.src.entities.llm import Message, UserMessage, SystemMessage
+from agentex.src.entities.llm import UserMessage, SystemMessage
 from agentex.src.entities.notifications import NotificationRequest
 from agentex.utils.logging import make_logger
 from constants import AGENT_NAME, BASE_ACTION_REGISTRY_KEY
@@ -33,29 +35,27 @@ class HelloWorldWorkflow(BaseWorkflow):
     async def run(self, params: AgentTaskWorkflowParams):
         task = params.task
         agent = params.agent
+        resumed = self.restore(params)
 
         try:
-            # Give the agent the initial task
-            await WorkflowHelper.execute_activity(
-                activity_name=ActivityName.APPEND_MESSAGES_TO_THREAD,
-                request=AppendMessagesToThreadParams(
-                    task_id=task.id,
-                    thread_name=DEFAULT_ROOT_THREAD_NAME,
-                    messages=[
-                        SystemMessage(content=self.instructions),
-                        UserMessage(content=task.prompt)
-                    ],
-                ),
-                response_type=List[Message],
-                start_to_close_timeout=timedelta(seconds=60),
-                retry_policy=RetryPolicy(maximum_attempts=5),
-            )
-            self.event_log.append({"event": "task_received", "task": task})
+            if not resumed:
+                # Give the agent the initial task
+                await stubs.append_messages_to_thread(
+                    AppendMessagesToThreadParams(
+                        task_id=task.id,
+                        thread_name=DEFAULT_ROOT_THREAD_NAME,
+                        messages=[
+                            SystemMessage(content=self.instructions),
+                            UserMessage(content=task.prompt)
+                        ],
+                    )
+                )
+                self.event_log.append(TaskReceivedEvent(task_id=task.id, prompt_size=len(task.prompt)))
 
             # Run the tool loop
             content = None
             while True:
-                self.event_log.append({"event": "tool_loop_started"})
+                self.event_log.append(ToolLoopStartedEvent())
                 content = await ActionLoop.run(
                     parent_workflow=self,
                     task_id=task.id,
@@ -77,23 +77,19 @@ class HelloWorldWorkflow(BaseWorkflow):
                     break
 
             preface = f"🎉 {self.display_name} has completed the following task: {task.prompt}."
-            await WorkflowHelper.execute_activity(
-                activity_name=ActivityName.SEND_NOTIFICATION,
-                request=NotificationRequest(
+            await stubs.send_notification(
+                NotificationRequest(
                     topic=agent.name,
                     message=f"{preface}\n\n{self.display_name}:\n{content}",
                     title=self.display_name,
                     tags=["notification"],
-                ),
-                response_type=None,
-                start_to_close_timeout=timedelta(seconds=60),
-                retry_policy=RetryPolicy(maximum_attempts=5),
+                )
             )
             status = "completed"
-            self.event_log.append({"event": "task_completed", "status": status})
+            self.event_log.append(TaskCompletedEvent(status=status))
         except asyncio.CancelledError as error:
             logger.warning(f"Task canceled by user: {task.id}")
-            self.event_log.append({"event": "task_canceled", "error": str(error)})
+            self.event_log.append(TaskCanceledEvent(error=str(error)))
             raise error
 
         return status
@@ -25,6 +25,7 @@ class FetchNews(Action):
     """
     Fetch the latest news articles related to a given topic using GoogleNews.
     """
+    blocking = True
 
     keyword: str
     language: str = "en"
@@ -32,6 +33,7 @@ class FetchNews(Action):
 
     async def execute(self) -> ActionResponse:
         try:
+            self.context.heartbeat(progress=f"Searching news for '{self.keyword}'")
             gn = GoogleNews(lang=self.language, period=self.period)
             gn.search(self.keyword)
             results = gn.result()
@@ -90,6 +92,7 @@ class WriteSummary(Action):
     """
     Write a summary document based on the provided markdown
     """
+    blocking = True
     name: str
     description: str
     markdown_content: str
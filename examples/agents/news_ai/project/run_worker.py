@@ -1,4 +1,5 @@
 import asyncio
+from datetime import timedelta
 
 from agentex.sdk.execution.worker import AgentexWorker
 from agentex.sdk.lib.activities.action_loop import ActionLoopActivities
@@ -7,7 +8,7 @@ from agentex.sdk.lib.activities.state import AgentStateActivities
 from agentex.src.adapters.kv_store.adapter_redis import RedisRepository
 from agentex.src.adapters.llm.adapter_litellm import LiteLLMGateway
 from agentex.src.adapters.notifications.adapter_ntfy import NtfyGateway
-from agentex.src.entities.actions import ActionRegistry
+from agentex.src.entities.actions import ActionPolicy, ActionRegistry
 from agentex.src.services.agent_state_repository import AgentStateRepository
 from agentex.src.services.agent_state_service import AgentStateService
 from examples.agents.news_ai.project.activities import FetchNews, ProcessNews, WriteSummary, ReportTerminalFailure
@@ -16,26 +17,37 @@ from workflow import NewsAIWorkflow
 
 
 async def main():
-    worker = AgentexWorker(task_queue=TASK_QUEUE_NAME)
-
     # Initialize adapters
     redis_repository = RedisRepository()
     llm_gateway = LiteLLMGateway()
     notification_gateway = NtfyGateway()
 
+    worker = AgentexWorker(task_queue=TASK_QUEUE_NAME, kv_store=redis_repository)
+
     # Initialize services
     agent_state_repository = AgentStateRepository(kv_store=redis_repository)
     agent_state_service = AgentStateService(repository=agent_state_repository)
 
     # Register actions
-    action_registry = ActionRegistry(actions={
-        BASE_ACTION_REGISTRY_KEY: [
-            FetchNews,
-            ProcessNews,
-            WriteSummary,
-            ReportTerminalFailure,
-        ]
-    })
+    action_registry = ActionRegistry(
+        actions={
+            BASE_ACTION_REGISTRY_KEY: [
+                FetchNews,
+                ProcessNews,
+                WriteSummary,
+                ReportTerminalFailure,
+            ]
+        },
+        policies={
+            # Google News throttles bursts of searches, so spread parallel tool calls out
+            FetchNews.action_name(): ActionPolicy(
+                max_concurrency=2,
+                rate_limit=1,
+                timeout=timedelta(minutes=2),
+                failure_threshold=3,
+            ),
+        },
+    )
 
     agent_state_activities = AgentStateActivities(
         agent_state=agent_state_service,
@@ -52,7 +64,10 @@ async def main():
     await worker.run(
         activities=[
             agent_state_activities.append_messages_to_thread,
+            agent_state_activities.upsert_tool_messages_in_thread,
             agent_state_activities.get_messages_from_thread,
+            agent_state_activities.get_thread_slice,
+            agent_state_activities.get_last_message,
             action_loop_activities.decide_action,
             action_loop_activities.take_action,
             notification_activities.send_notification,
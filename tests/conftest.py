@@ -0,0 +1,23 @@
+"""
+Unit tests for the SDK, the API clients and the CLI. Run with `make test`; they need only pytest.
+"""
+from typing import Callable
+
+import httpx
+
+from agentex.client.agentex import Agentex, AsyncAgentex
+
+
+def mock_agentex(handler: Callable[[httpx.Request], httpx.Response], **kwargs) -> Agentex:
+    """A client whose requests are answered by `handler` instead of a server."""
+    client = Agentex(base_url="http://agentex.test/", **kwargs)
+    client._client.close()
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+
+def mock_async_agentex(handler: Callable[[httpx.Request], httpx.Response], **kwargs) -> AsyncAgentex:
+    """An async client whose requests are answered by `handler`, which may be sync or async."""
+    client = AsyncAgentex(base_url="http://agentex.test/", **kwargs)
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from datetime import timedelta
+from typing import ClassVar, List
+
+import pytest
+
+from agentex.sdk.execution.action_executor import ActionExecutor
+from agentex.sdk.execution.action_policy import ActionGuard
+from agentex.sdk.execution.worker import shutdown_activities
+from agentex.sdk.lib.activities.action_loop import ActionLoopActivities
+from agentex.src.entities.actions import Action, ActionPolicy, ActionRegistry, ActionResponse
+
+
+class WaitForRelease(Action):
+    """Blocks its pool thread until the test releases it."""
+
+    release: ClassVar[threading.Event]
+    started: ClassVar[List[int]]
+
+    def execute(self) -> ActionResponse:
+        self.started.append(threading.get_ident())
+        self.release.wait(timeout=5)
+        return ActionResponse(message="released")
+
+
+@pytest.fixture(autouse=True)
+def fresh_release():
+    WaitForRelease.release = threading.Event()
+    WaitForRelease.started = []
+    yield
+    WaitForRelease.release.set()
+
+
+async def wait_for_start(count: int) -> None:
+    while len(WaitForRelease.started) < count:
+        await asyncio.sleep(0.005)
+
+
+def test_timed_out_execution_keeps_its_policy_slot_until_the_thread_finishes():
+    async def scenario():
+        executor = ActionExecutor()
+        guard = ActionGuard(
+            WaitForRelease.action_name(),
+            ActionPolicy(max_concurrency=1, timeout=timedelta(milliseconds=50)),
+        )
+        with pytest.raises(TimeoutError):
+            await guard.execute(lambda: executor.execute(WaitForRelease()))
+
+        # The abandoned execution still occupies its thread, so the next one has to wait for it
+        assert guard.semaphore.locked()
+        second = asyncio.create_task(guard.execute(lambda: executor.execute(WaitForRelease())))
+        await asyncio.sleep(0.1)
+        assert len(WaitForRelease.started) == 1
+
+        WaitForRelease.release.set()
+        assert (await second).message == "released"
+        assert len(WaitForRelease.started) == 2
+        assert not guard.semaphore.locked()
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_execution_keeps_its_executor_slot_until_the_thread_finishes():
+    async def scenario():
+        executor = ActionExecutor(default_action_concurrency=1)
+        first = asyncio.create_task(executor.execute(WaitForRelease()))
+        await wait_for_start(1)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        second = asyncio.create_task(executor.execute(WaitForRelease()))
+        await asyncio.sleep(0.05)
+        assert len(WaitForRelease.started) == 1
+
+        WaitForRelease.release.set()
+        assert (await second).message == "released"
+        assert len(WaitForRelease.started) == 2
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_stopping_the_worker_shuts_down_the_action_executor():
+    async def scenario():
+        activities = ActionLoopActivities(
+            llm_gateway=None,
+            agent_state=None,
+            action_class_registry=ActionRegistry(actions={}),
+        )
+        WaitForRelease.release.set()
+        await activities.action_executor.execute(WaitForRelease())
+        assert activities.action_executor.loop_monitor.running
+
+        shutdown_activities([activities.decide_action, activities.take_action])
+        await asyncio.sleep(0)
+        assert not activities.action_executor.loop_monitor.running
+        assert activities.action_executor._pool is None
+
+    asyncio.run(scenario())
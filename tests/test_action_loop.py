@@ -0,0 +1,196 @@
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from agentex.sdk.execution.workflow import BaseWorkflow
+from agentex.sdk.lib.activities import stubs
+from agentex.sdk.lib.activities.action_loop import DecideActionParams, TakeActionParams
+from agentex.sdk.lib.activities.state import AppendMessagesToThreadParams, UpsertToolMessagesInThreadParams
+from agentex.sdk.lib.workflows.action_loop import PENDING_TOOL_RESULT, ActionLoop
+from agentex.src.entities.actions import ActionResponse
+from agentex.src.entities.llm import AssistantMessage, ToolCall, ToolCallRequest
+from agentex.src.entities.state import Choice, Completion, ThreadAppendResult, Usage
+
+# The tool calls of each decision as (tool name, call id); an empty decision stops the loop
+Decision = List[Tuple[str, str]]
+
+
+class LoopActivities:
+    """
+    Stands in for the activities the loop schedules. Decisions, thread writes and continue-as-new checks are
+    logged in order; tool calls named "slow" or "notify" only finish once the test releases them.
+    """
+
+    def __init__(self, decisions: List[Decision], on_decision: Optional[Dict[int, Callable[[], None]]] = None):
+        self.decisions = decisions
+        self.on_decision = on_decision or {}
+        self.log: List[str] = []
+        self.takes: Dict[str, TakeActionParams] = {}
+        self.releases: Dict[str, asyncio.Event] = {}
+        self.recorded: List[UpsertToolMessagesInThreadParams] = []
+        self.deciding = False
+
+    def release(self, call_id: str) -> None:
+        self.releases.setdefault(call_id, asyncio.Event()).set()
+
+    async def decide_action(self, params: DecideActionParams) -> Completion:
+        index = sum(1 for entry in self.log if entry == "decide")
+        self.log.append("decide")
+        self.deciding = True
+        if index in self.on_decision:
+            self.on_decision[index]()
+        # Give tool calls that are still running the chance to write while the decision is in flight
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.deciding = False
+        calls = self.decisions[index]
+        message = AssistantMessage(
+            content=f"decision {index}",
+            tool_calls=[
+                ToolCallRequest(id=call_id, function=ToolCall(name=name, arguments="{}")) for name, call_id in calls
+            ] or None,
+        )
+        return Completion(
+            choices=[Choice(finish_reason="tool_calls" if calls else "stop", index=0, message=message)],
+            usage=Usage(prompt_tokens=0, completion_tokens=0, total_tokens=0),
+        )
+
+    async def take_action(self, params: TakeActionParams) -> ActionResponse:
+        self.takes[params.tool_call_id] = params
+        if params.tool_name in ("slow", "notify"):
+            await self.releases.setdefault(params.tool_call_id, asyncio.Event()).wait()
+        return ActionResponse(message=f"result of {params.tool_call_id}")
+
+    async def append_messages_to_thread(self, params: AppendMessagesToThreadParams) -> ThreadAppendResult:
+        assert not self.deciding, "The thread was written while a decision was running"
+        assert all(message.content == PENDING_TOOL_RESULT for message in params.messages)
+        self.log.append("placeholders " + ",".join(message.tool_call_id for message in params.messages))
+        return ThreadAppendResult(length=0, version=0)
+
+    async def upsert_tool_messages_in_thread(self, params: UpsertToolMessagesInThreadParams) -> ThreadAppendResult:
+        assert not self.deciding, "The thread was written while a decision was running"
+        self.recorded.append(params)
+        self.log.append("results " + ",".join(message.tool_call_id for message in params.messages))
+        return ThreadAppendResult(length=0, version=0)
+
+
+class LoopWorkflow(BaseWorkflow):
+
+    def __init__(self, log: List[str]):
+        super().__init__(display_name="loop")
+        self.log = log
+
+    async def run(self, params):
+        raise NotImplementedError
+
+    async def continue_as_new_if_needed(self) -> None:
+        self.log.append("continue_as_new")
+
+
+def run_loop(activities: LoopActivities, monkeypatch, **kwargs) -> str:
+    for name in ("decide_action", "take_action", "append_messages_to_thread", "upsert_tool_messages_in_thread"):
+        monkeypatch.setattr(stubs, name, getattr(activities, name))
+    return asyncio.run(ActionLoop.run(
+        parent_workflow=LoopWorkflow(activities.log),
+        task_id="task",
+        thread_name="thread",
+        model="model",
+        action_registry_key="actions",
+        **kwargs,
+    ))
+
+
+def test_without_background_actions_every_call_finishes_before_the_next_decision(monkeypatch):
+    activities = LoopActivities([[("fast", "call_1"), ("fast", "call_2")], []])
+    assert run_loop(activities, monkeypatch) == "decision 1"
+
+    assert activities.log == ["continue_as_new", "decide", "continue_as_new", "decide"]
+    assert all(params.record_tool_message for params in activities.takes.values())
+
+
+def test_deferred_result_replaces_its_placeholder_before_the_next_decision(monkeypatch):
+    activities = LoopActivities(
+        [[("slow", "call_1"), ("fast", "call_2")], [("fast", "call_3")], []],
+        on_decision={1: lambda: activities.release("call_1")},
+    )
+    assert run_loop(activities, monkeypatch, deferred_actions=["slow"]) == "decision 2"
+
+    assert activities.log == [
+        "continue_as_new",
+        "decide",
+        "placeholders call_1",
+        # While call_1 is in flight the workflow may not continue as new
+        "decide",
+        # It landed during the second decision, so the third one reads its result
+        "results call_1",
+        "continue_as_new",
+        "decide",
+    ]
+    # Only the loop writes the background call's tool message
+    assert activities.takes["call_1"].record_tool_message is False
+    assert activities.takes["call_2"].record_tool_message is True
+    (recorded,) = activities.recorded
+    assert [(message.tool_call_id, message.name, message.content) for message in recorded.messages] == [
+        ("call_1", "slow", "result of call_1"),
+    ]
+
+
+def test_results_that_land_together_are_recorded_in_one_write(monkeypatch):
+    def release_both():
+        activities.release("call_1")
+        activities.release("call_2")
+
+    activities = LoopActivities(
+        [[("slow", "call_1"), ("slow", "call_2")], [("fast", "call_3")], []],
+        on_decision={1: release_both},
+    )
+    run_loop(activities, monkeypatch, deferred_actions=["slow"])
+
+    assert activities.log.count("placeholders call_1,call_2") == 1
+    assert [[message.tool_call_id for message in params.messages] for params in activities.recorded] == [
+        ["call_1", "call_2"],
+    ]
+
+
+@pytest.mark.parametrize("kwargs, decisions, content", [
+    # The model stopped before it saw the deferred result, so it decides once more
+    ({"deferred_actions": ["slow"]}, ["decide", "decide", "results call_1", "continue_as_new", "decide"], "decision 2"),
+    # Fire-and-forget results are recorded, but the model never needs them
+    ({"fire_and_forget_actions": ["slow"]}, ["decide", "decide", "results call_1"], "decision 1"),
+])
+def test_outstanding_calls_are_drained_before_finishing(monkeypatch, kwargs, decisions, content):
+    activities = LoopActivities(
+        [[("slow", "call_1")], [], []],
+        # call_1 lands only after the model decided to stop
+        on_decision={1: lambda: asyncio.get_running_loop().call_later(0.01, activities.release, "call_1")},
+    )
+    assert run_loop(activities, monkeypatch, **kwargs) == content
+
+    assert [entry for entry in activities.log if not entry.startswith("placeholders")][1:] == decisions
+    assert activities.log[-1] != "continue_as_new"
+
+
+def test_no_continue_as_new_while_background_calls_are_in_flight(monkeypatch):
+    activities = LoopActivities(
+        [[("slow", "call_1")], [("fast", "call_2")], [("fast", "call_3")], []],
+        on_decision={2: lambda: activities.release("call_1")},
+    )
+    run_loop(activities, monkeypatch, deferred_actions=["slow"])
+
+    assert activities.log == [
+        "continue_as_new",
+        "decide",
+        "placeholders call_1",
+        "decide",
+        "decide",
+        "results call_1",
+        "continue_as_new",
+        "decide",
+    ]
+
+
+def test_continue_as_new_can_be_disabled(monkeypatch):
+    activities = LoopActivities([[("fast", "call_1")], []])
+    run_loop(activities, monkeypatch, continue_as_new=False)
+    assert "continue_as_new" not in activities.log
@@ -0,0 +1,56 @@
+import io
+import json
+import tarfile
+from pathlib import Path
+
+from agentex.cli.models.action_manifest import BuildContextManager
+from agentex.utils.build_context_cache import BuildContextCache, ContextEntry
+from agentex.utils.dockerignore import DockerIgnore
+
+
+def make_context(root: Path) -> None:
+    (root / "Dockerfile").write_text("FROM python\n")
+    (root / ".dockerignore").write_text("*.pyc\n")
+    (root / "agent").mkdir()
+    (root / "agent" / "main.py").write_text("pass\n")
+    (root / "agent" / "main.pyc").write_text("")
+
+
+def test_overlapping_include_paths_archive_each_file_once(tmp_path):
+    root = tmp_path / "context"
+    root.mkdir()
+    make_context(root)
+    build_context = BuildContextManager(agent_manifest=None, build_context_root=root, cache=BuildContextCache(tmp_path))
+    build_context.add_dockerfile(root / "Dockerfile")
+    build_context.add_dockerignore(root / ".dockerignore")
+    dockerignore = DockerIgnore.from_file(root / ".dockerignore")
+    # The root contains the Dockerfile, the .dockerignore and the other include path
+    for directory in (root, root / "agent"):
+        build_context.add_directory(directory_path=directory, context_root=root, dockerignore=dockerignore)
+
+    arcnames = [entry.arcname for entry in build_context.entries]
+    assert sorted(arcnames) == [".dockerignore", "Dockerfile", "agent/main.py"]
+
+    archive = io.BytesIO()
+    build_context.write_archive(archive)
+    archive.seek(0)
+    with tarfile.open(fileobj=archive, mode="r:gz") as tar_file:
+        assert sorted(tar_file.getnames()) == sorted(arcnames)
+
+
+def test_file_hashes_only_keep_the_current_entries(tmp_path):
+    cache = BuildContextCache(tmp_path / "cache")
+    files = []
+    for name in ("kept", "removed"):
+        path = tmp_path / name
+        path.write_text(name)
+        files.append(path)
+
+    cache.hash_entries([ContextEntry.from_path(path, arcname=path.name) for path in files])
+    assert set(json.loads(cache.hashes_path.read_text())) == {str(path) for path in files}
+
+    # Nothing needs rehashing, but the file that left the context is dropped
+    entry = ContextEntry.from_path(files[0], arcname="kept")
+    cache.hash_entries([entry])
+    assert entry.sha256 is not None
+    assert set(json.loads(cache.hashes_path.read_text())) == {str(files[0])}
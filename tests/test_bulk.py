@@ -0,0 +1,91 @@
+import asyncio
+import json
+from typing import List
+
+import httpx
+import pytest
+
+from agentex.client.agentex import Agentex
+from agentex.client.resources import _bulk
+from agentex.client.types.bulk import BulkItemStatus
+from agentex.client.types.tasks import CancelTaskRequest, CreateTaskRequest
+from tests.conftest import mock_agentex, mock_async_agentex
+
+
+class TaskServer:
+    """Turns the first `rejections` requests for each prompt away with a 503, then creates the task."""
+
+    def __init__(self, rejections: int):
+        self.rejections = rejections
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith("/modify"):
+            return httpx.Response(200)
+        prompt = json.loads(request.content)["prompt"]
+        attempts = sum(1 for sent in self.requests if sent.content == request.content)
+        if attempts <= self.rejections:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"id": f"task-{prompt}", "agent_id": "agent", "prompt": prompt})
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(_bulk, "DEFAULT_INITIAL_RETRY_DELAY", 0.0)
+
+
+def create_requests(count: int) -> List[CreateTaskRequest]:
+    return [CreateTaskRequest(agent="agent", prompt=str(i)) for i in range(count)]
+
+
+def test_bulk_retries_are_not_multiplied_by_transport_retries():
+    server = TaskServer(rejections=10)
+
+    async def create_many():
+        async with mock_async_agentex(server, max_retries=2) as client:
+            return await client.tasks.create_many(create_requests(2), max_retries=3)
+
+    results = asyncio.run(create_many())
+    assert [result.status for result in results] == [BulkItemStatus.FAILED] * 2
+    assert [result.attempts for result in results] == [4, 4]
+    # One request per bulk attempt, without the transport retrying each of them again
+    assert len(server.requests) == 8
+
+
+def test_bulk_retries_transient_failures():
+    server = TaskServer(rejections=2)
+
+    async def create_many():
+        async with mock_async_agentex(server) as client:
+            return await client.tasks.create_many(create_requests(3))
+
+    results = asyncio.run(create_many())
+    assert [(result.index, result.task_id, result.attempts) for result in results] == [
+        (0, "task-0", 3),
+        (1, "task-1", 3),
+        (2, "task-2", 3),
+    ]
+
+
+def test_sync_bulk_inside_a_running_event_loop(monkeypatch):
+    server = TaskServer(rejections=0)
+    monkeypatch.setattr(Agentex, "to_async", lambda self: mock_async_agentex(server))
+    client = mock_agentex(server)
+
+    async def called_from_a_coroutine():
+        created = client.tasks.create_many(create_requests(2))
+        modified = client.tasks.modify_many([("task-0", CancelTaskRequest())])
+        return created, modified
+
+    created, modified = asyncio.run(called_from_a_coroutine())
+    assert [result.task_id for result in created] == ["task-0", "task-1"]
+    assert [(result.status, result.task_id) for result in modified] == [(BulkItemStatus.SUCCEEDED, "task-0")]
+    assert [request.url.path for request in server.requests] == ["/tasks", "/tasks", "/tasks/task-0/modify"]
+
+
+def test_sync_bulk_without_an_event_loop(monkeypatch):
+    server = TaskServer(rejections=0)
+    monkeypatch.setattr(Agentex, "to_async", lambda self: mock_async_agentex(server))
+    results = mock_agentex(server).tasks.create_many(create_requests(1))
+    assert results[0].task_id == "task-0"
@@ -0,0 +1,188 @@
+"""Every endpoint must send the same request and parse the same result whether called on Agentex or AsyncAgentex."""
+import asyncio
+import inspect
+import io
+import json
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from agentex.client.agentex import Agentex
+from agentex.client.resources.agents import AgentsResource, AsyncAgentsResource
+from agentex.client.resources.tasks import AsyncTasksResource, TasksResource
+from agentex.client.types.agents import AgentField, CreateAgentRequest
+from agentex.client.types.pagination import NDJSON_CONTENT_TYPE
+from agentex.client.types.tasks import CancelTaskRequest, CreateTaskRequest, TaskField
+from agentex.constants import DEFAULT_ROOT_THREAD_NAME
+from tests.conftest import mock_agentex, mock_async_agentex
+
+TASK = {"id": "task-1", "agent_id": "agent-1", "prompt": "Say hi", "status": "RUNNING"}
+AGENT = {"id": "agent-1", "name": "hello", "description": "Says hi", "status": "Ready"}
+THREAD_SLICE = {"messages": [{"role": "user", "content": "Say hi"}], "offset": 1, "length": 2, "version": 3}
+AGENT_REQUEST = CreateAgentRequest(name="hello", description="Says hi", workflow_name="hello", workflow_queue_name="q")
+PACKAGE = b"0123456789" * 3
+
+# Only AsyncAgentex can watch a task's events
+ASYNC_ONLY = {("tasks", "watch")}
+
+RecordedRequest = Tuple[str, str, List[Tuple[str, str]], bytes]
+
+
+class ParityServer:
+    """Answers every endpoint of both clients and records the requests it received."""
+
+    def __init__(self):
+        self.requests: List[RecordedRequest] = []
+        self.upload_offset = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = request.content
+        boundary = re.search(r"boundary=([\w-]+)", request.headers.get("Content-Type", ""))
+        if boundary:
+            # Multipart boundaries are random per request
+            body = body.replace(boundary.group(1).encode(), b"BOUNDARY")
+        params = sorted(request.url.params.multi_items())
+        self.requests.append((request.method, request.url.path, params, body))
+        return self.respond(request, dict(params))
+
+    def respond(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        method, path = request.method, request.url.path
+        if request.headers.get("Accept") == NDJSON_CONTENT_TYPE:
+            item = TASK if path == "/tasks" else AGENT
+            return httpx.Response(200, content=(json.dumps(item) + "\n\n" + json.dumps(item) + "\n").encode())
+        if "limit" in params:
+            item = TASK if path == "/tasks" else AGENT
+            next_cursor = None if params.get("cursor") else "page-2"
+            return httpx.Response(200, json={"items": [item], "next_cursor": next_cursor})
+        if method == "DELETE" or path.endswith("/modify"):
+            return httpx.Response(204)
+        if path == "/tasks" and method == "POST":
+            prompt = json.loads(request.content)["prompt"]
+            return httpx.Response(200, json={**TASK, "id": f"task-{prompt}", "prompt": prompt})
+        if path in ("/tasks", "/agents") and method == "GET":
+            return httpx.Response(200, json=[TASK] if path == "/tasks" else [AGENT])
+        if path == f"/tasks/task-1/threads/{DEFAULT_ROOT_THREAD_NAME}/messages":
+            return httpx.Response(200, json=THREAD_SLICE)
+        if path == "/tasks/task-1/context/missing":
+            return httpx.Response(404)
+        if path.startswith("/tasks/task-1/context/"):
+            return httpx.Response(200, json={"value": [1, 2]})
+        if path == "/tasks/task-1/artifacts":
+            return httpx.Response(200, json=[{"name": "report", "size": 12}])
+        if path == "/tasks/task-1":
+            return httpx.Response(200, json={"id": "task-1", "status": "RUNNING"} if "fields" in params else TASK)
+        if path == "/agents/uploads" or path == "/agents/uploads/upload-1" and method == "GET":
+            return self.upload_status()
+        if path == "/agents/uploads/upload-1" and method == "PUT":
+            self.upload_offset += len(request.content)
+            return self.upload_status(complete="*" not in request.headers["Content-Range"])
+        if path in ("/agents", "/agents/agent-1"):
+            return httpx.Response(200, json=AGENT)
+        raise AssertionError(f"Unexpected request {method} {path}")
+
+    def upload_status(self, complete: bool = False) -> httpx.Response:
+        return httpx.Response(200, json={"upload_id": "upload-1", "offset": self.upload_offset, "complete": complete})
+
+
+Call = Callable[[Any], Any]
+
+CALLS: Dict[Tuple[str, str], List[Call]] = {
+    ("tasks", "create"): [lambda client: client.tasks.create(agent_name="hello", prompt="Say hi")],
+    ("tasks", "get"): [
+        lambda client: client.tasks.get("task-1"),
+        lambda client: client.tasks.get("task-1", fields=[TaskField.STATUS]),
+    ],
+    ("tasks", "get_status"): [lambda client: client.tasks.get_status("task-1")],
+    ("tasks", "get_messages"): [
+        lambda client: client.tasks.get_messages("task-1"),
+        lambda client: client.tasks.get_messages("task-1", tail=5, since_version=2),
+    ],
+    ("tasks", "get_context_value"): [
+        lambda client: client.tasks.get_context_value("task-1", "key"),
+        lambda client: client.tasks.get_context_value("task-1", "missing"),
+    ],
+    ("tasks", "list_artifacts"): [lambda client: client.tasks.list_artifacts("task-1")],
+    ("tasks", "list"): [lambda client: client.tasks.list()],
+    ("tasks", "list_page"): [lambda client: client.tasks.list_page(limit=1, cursor="page-2", fields=["status"])],
+    ("tasks", "iter"): [lambda client: client.tasks.iter(page_size=1)],
+    ("tasks", "stream"): [lambda client: client.tasks.stream(fields=[TaskField.STATUS, TaskField.PROMPT])],
+    ("tasks", "delete"): [lambda client: client.tasks.delete("task-1")],
+    ("tasks", "modify"): [lambda client: client.tasks.modify("task-1", CancelTaskRequest())],
+    ("tasks", "create_many"): [
+        lambda client: client.tasks.create_many(
+            [CreateTaskRequest(agent="hello", prompt=str(i)) for i in range(3)],
+            concurrency=1,
+        ),
+    ],
+    ("tasks", "modify_many"): [
+        lambda client: client.tasks.modify_many([("task-1", CancelTaskRequest())], concurrency=1),
+    ],
+    ("agents", "create"): [
+        lambda client: client.agents.create(request=AGENT_REQUEST, upload_id="upload-1"),
+        lambda client: client.agents.create(request=AGENT_REQUEST, agent_package=("agent.tar.gz", b"package")),
+    ],
+    ("agents", "upload_package"): [
+        lambda client: client.agents.upload_package(io.BytesIO(PACKAGE), chunk_size=8),
+        lambda client: client.agents.upload_package(io.BytesIO(PACKAGE), upload_id="upload-1", chunk_size=16),
+    ],
+    ("agents", "get"): [lambda client: client.agents.get("agent-1")],
+    ("agents", "list"): [lambda client: client.agents.list()],
+    ("agents", "list_page"): [lambda client: client.agents.list_page(limit=1, fields=[AgentField.STATUS])],
+    ("agents", "iter"): [lambda client: client.agents.iter(page_size=1)],
+    ("agents", "stream"): [lambda client: client.agents.stream()],
+    ("agents", "delete"): [lambda client: client.agents.delete("hello")],
+}
+
+
+def public_methods(resource: type) -> set:
+    return {name for name, _ in inspect.getmembers(resource, inspect.isfunction) if not name.startswith("_")}
+
+
+def test_every_method_is_covered():
+    for name, sync_resource, async_resource in [
+        ("tasks", TasksResource, AsyncTasksResource),
+        ("agents", AgentsResource, AsyncAgentsResource),
+    ]:
+        sync_methods = public_methods(sync_resource)
+        async_methods = public_methods(async_resource)
+        assert sync_methods | {method for resource, method in ASYNC_ONLY if resource == name} == async_methods
+        assert {method for resource, method in CALLS if resource == name} == sync_methods
+
+
+def run_sync(call: Call, monkeypatch) -> Tuple[Any, List[RecordedRequest]]:
+    server = ParityServer()
+    # The bulk methods run on an async client with the same settings
+    monkeypatch.setattr(Agentex, "to_async", lambda self: mock_async_agentex(server))
+    with mock_agentex(server) as client:
+        result = call(client)
+        if inspect.isgenerator(result):
+            result = list(result)
+    return result, server.requests
+
+
+def run_async(call: Call) -> Tuple[Any, List[RecordedRequest]]:
+    server = ParityServer()
+
+    async def run():
+        async with mock_async_agentex(server) as client:
+            result = call(client)
+            if inspect.isasyncgen(result):
+                return [item async for item in result]
+            return await result
+
+    return asyncio.run(run()), server.requests
+
+
+@pytest.mark.parametrize(
+    "call",
+    [call for calls in CALLS.values() for call in calls],
+    ids=[f"{resource}.{method}[{i}]" for (resource, method), calls in CALLS.items() for i in range(len(calls))],
+)
+def test_sync_and_async_clients_agree(call, monkeypatch):
+    sync_result, sync_requests = run_sync(call, monkeypatch)
+    async_result, async_requests = run_async(call)
+    assert sync_requests, "The call sent no request"
+    assert sync_requests == async_requests
+    assert sync_result == async_result
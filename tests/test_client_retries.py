@@ -0,0 +1,168 @@
+import asyncio
+from typing import Callable, List, Optional
+
+import httpx
+import pytest
+
+from agentex.client import _client
+from agentex.client._client import DEFAULT_MAX_RETRY_DELAY, AsyncAPIClient, RequestTiming, SyncAPIClient
+
+
+class Server:
+    """Answers each request with the next of `responses`; an exception is raised as a transport error."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    @property
+    def methods(self) -> List[str]:
+        return [request.method for request in self.requests]
+
+
+@pytest.fixture
+def delays(monkeypatch) -> List[float]:
+    """The backoff delays slept between attempts, without actually sleeping."""
+    slept = []
+
+    async def async_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(_client.time, "sleep", slept.append)
+    monkeypatch.setattr(_client.asyncio, "sleep", async_sleep)
+    return slept
+
+
+@pytest.fixture
+def timings() -> List[RequestTiming]:
+    return []
+
+
+def sync_client(server: Server, timings: List[RequestTiming], max_retries: int = 2) -> SyncAPIClient:
+    client = SyncAPIClient(base_url="http://agentex.test/", max_retries=max_retries, on_request_timing=timings.append)
+    client._client.close()
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(server))
+    return client
+
+
+def async_client(server: Server, timings: List[RequestTiming], max_retries: int = 2) -> AsyncAPIClient:
+    client = AsyncAPIClient(base_url="http://agentex.test/", max_retries=max_retries, on_request_timing=timings.append)
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(server))
+    return client
+
+
+def send_sync(server: Server, timings: List[RequestTiming], method: str, **kwargs) -> httpx.Response:
+    with sync_client(server, timings, **kwargs) as client:
+        return client.request(method, "/tasks")
+
+
+def send_async(server: Server, timings: List[RequestTiming], method: str, **kwargs) -> httpx.Response:
+    async def send():
+        async with async_client(server, timings, **kwargs) as client:
+            return await client.request(method, "/tasks")
+
+    return asyncio.run(send())
+
+
+Send = Callable[..., httpx.Response]
+both_clients = pytest.mark.parametrize("send", [send_sync, send_async], ids=["sync", "async"])
+
+
+@both_clients
+def test_rate_limited_request_waits_for_retry_after(send: Send, delays, timings):
+    server = Server(httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(200))
+    # The server turned the request away before doing any work, so even a POST is resent
+    assert send(server, timings, "POST").status_code == 200
+    assert server.methods == ["POST", "POST"]
+    assert delays == [3.0]
+    assert [(timing.status_code, timing.attempts) for timing in timings] == [(200, 2)]
+
+
+@both_clients
+def test_retry_after_is_capped(send: Send, delays, timings):
+    server = Server(httpx.Response(503, headers={"Retry-After": "3600"}), httpx.Response(200))
+    assert send(server, timings, "GET").status_code == 200
+    assert delays == [DEFAULT_MAX_RETRY_DELAY]
+
+
+@both_clients
+@pytest.mark.parametrize("method", ["GET", "PUT", "DELETE"])
+def test_server_errors_are_retried_on_idempotent_methods(send: Send, delays, timings, method):
+    server = Server(httpx.Response(500), httpx.Response(502), httpx.Response(200))
+    assert send(server, timings, method).status_code == 200
+    assert server.methods == [method] * 3
+    # Exponential backoff with full jitter: each delay is at most the doubling cap for its retry
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0
+
+
+@both_clients
+@pytest.mark.parametrize("method", ["POST", "PATCH"])
+def test_server_errors_are_not_retried_on_non_idempotent_methods(send: Send, delays, timings, method):
+    server = Server(httpx.Response(500), httpx.Response(200))
+    # The server may have acted on the request before failing, so resending it could apply it twice
+    assert send(server, timings, method).status_code == 500
+    assert server.methods == [method]
+    assert delays == []
+
+
+@both_clients
+def test_post_that_never_connected_is_retried(send: Send, delays, timings):
+    server = Server(httpx.ConnectError("refused"), httpx.Response(201))
+    assert send(server, timings, "POST").status_code == 201
+    assert len(server.requests) == 2
+
+
+@both_clients
+def test_post_that_failed_after_being_sent_is_not_retried(send: Send, delays, timings):
+    server = Server(httpx.ReadError("connection reset"), httpx.Response(201))
+    with pytest.raises(httpx.ReadError):
+        send(server, timings, "POST")
+    assert len(server.requests) == 1
+    assert [(timing.status_code, timing.attempts) for timing in timings] == [(None, 1)]
+    assert "connection reset" in timings[0].error
+
+
+@both_clients
+def test_last_response_is_returned_once_retries_run_out(send: Send, delays, timings):
+    server = Server(*[httpx.Response(503) for _ in range(3)])
+    assert send(server, timings, "GET").status_code == 503
+    # The first attempt plus max_retries retries
+    assert len(server.requests) == 3
+    assert len(delays) == 2
+    assert [(timing.status_code, timing.attempts) for timing in timings] == [(503, 3)]
+
+
+@both_clients
+def test_last_transport_error_is_raised_once_retries_run_out(send: Send, delays, timings):
+    server = Server(httpx.ReadTimeout("slow"), httpx.ReadTimeout("slow"))
+    with pytest.raises(httpx.ReadTimeout):
+        send(server, timings, "GET", max_retries=1)
+    assert len(server.requests) == 2
+    assert [(timing.status_code, timing.attempts) for timing in timings] == [(None, 2)]
+
+
+@pytest.mark.parametrize("max_retries", [None, 0])
+def test_per_request_max_retries(delays, timings, max_retries: Optional[int]):
+    server = Server(httpx.Response(503), httpx.Response(200))
+    with sync_client(server, timings) as client:
+        response = client.request("GET", "/tasks", max_retries=max_retries)
+    assert response.status_code == (200 if max_retries is None else 503)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2", 2.0),
+    ("-1", 0.0),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ("soon", None),
+    (None, None),
+])
+def test_parse_retry_after(value, expected):
+    assert _client._parse_retry_after(value) == expected
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from temporalio.api.common.v1 import Payload
+
+from agentex.sdk.execution import codec
+from agentex.sdk.execution.codec import (
+    EXTERNAL_ENCODING,
+    KeyValuePayloadStore,
+    LargePayloadCodec,
+    LocalBlobPayloadStore,
+    PayloadCompression,
+)
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+
+
+def make_payload(size: int) -> Payload:
+    return Payload(metadata={"encoding": b"json/plain"}, data=b'"' + b"x" * size + b'"')
+
+
+def round_trip(payload_codec: LargePayloadCodec, payload: Payload) -> Payload:
+    async def run():
+        (encoded,) = await payload_codec.encode([payload])
+        (decoded,) = await payload_codec.decode([encoded])
+        return encoded, decoded
+
+    encoded, decoded = asyncio.run(run())
+    assert decoded == payload
+    return encoded
+
+
+def test_compresses_with_zlib_by_default():
+    encoded = round_trip(LargePayloadCodec(), make_payload(10_000))
+    assert encoded.metadata["compression"] == b"zlib"
+
+
+def test_small_payloads_pass_through():
+    payload = make_payload(10)
+    assert round_trip(LargePayloadCodec(), payload) == payload
+
+
+@pytest.mark.skipif(codec.zstandard is not None, reason="zstandard is installed")
+def test_zstd_is_opt_in_and_needs_zstandard():
+    with pytest.raises(ImportError, match="zstd"):
+        LargePayloadCodec(compression=PayloadCompression.ZSTD)
+
+
+@pytest.mark.skipif(codec.zstandard is None, reason="zstandard is not installed")
+def test_zstd_round_trip():
+    encoded = round_trip(LargePayloadCodec(compression=PayloadCompression.ZSTD), make_payload(10_000))
+    assert encoded.metadata["compression"] == b"zstd"
+
+
+def test_kv_store_offloads_with_ttl():
+    kv_store = LocalKeyValueRepository()
+    store = KeyValuePayloadStore(kv_store, ttl=timedelta(seconds=60))
+    payload_codec = LargePayloadCodec(store=store, external_storage_threshold=10)
+    encoded = round_trip(payload_codec, make_payload(10_000))
+    assert encoded.metadata["encoding"] == EXTERNAL_ENCODING
+    key = f"payloads:{encoded.data.decode()}"
+    assert kv_store.expires_at[key] > time.monotonic()
+
+    # Once expired, the payload is gone
+    kv_store.expires_at[key] = time.monotonic() - 1
+    assert asyncio.run(kv_store.get(key)) is None
+
+
+def test_blob_store_deletes_expired_payloads(tmp_path):
+    store = LocalBlobPayloadStore(str(tmp_path), ttl=timedelta(hours=1))
+    asyncio.run(store.put("old", b"old"))
+    asyncio.run(store.put("new", b"new"))
+    an_hour_ago = time.time() - 2 * 3600
+    os.utime(tmp_path / "old", (an_hour_ago, an_hour_ago))
+
+    assert store.delete_expired() == 1
+    assert asyncio.run(store.get("old")) is None
+    assert asyncio.run(store.get("new")) == b"new"
+
+
+def test_blob_store_put_refreshes_and_cleans_up(tmp_path):
+    store = LocalBlobPayloadStore(str(tmp_path), ttl=timedelta(hours=1), cleanup_interval=timedelta(0))
+    asyncio.run(store.put("kept", b"kept"))
+    asyncio.run(store.put("expired", b"expired"))
+    two_hours_ago = time.time() - 2 * 3600
+    for name in ("kept", "expired"):
+        os.utime(tmp_path / name, (two_hours_ago, two_hours_ago))
+
+    # Storing "kept" again refreshes it, and the put runs the cleanup that drops "expired"
+    asyncio.run(store.put("kept", b"kept"))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["kept"]
+
+
+def test_blob_store_without_ttl_keeps_everything(tmp_path):
+    store = LocalBlobPayloadStore(str(tmp_path))
+    asyncio.run(store.put("blob", b"blob"))
+    os.utime(tmp_path / "blob", (0, 0))
+    assert store.delete_expired() == 0
+    assert (tmp_path / "blob").exists()
+
+
+def test_blob_store_concurrent_writes_of_one_payload(tmp_path, monkeypatch):
+    store = LocalBlobPayloadStore(str(tmp_path))
+    # Every writer sees the payload as missing, as when they race to store it
+    monkeypatch.setattr(codec.Path, "exists", lambda self: False)
+
+    async def put_concurrently():
+        await asyncio.gather(*[store.put("blob", b"blob") for _ in range(20)])
+
+    asyncio.run(put_concurrently())
+    # No writer's rename found its temporary file taken by another, and none were left behind
+    assert [path.name for path in tmp_path.iterdir()] == ["blob"]
+    assert (tmp_path / "blob").read_bytes() == b"blob"
+
+
+def test_blob_store_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    store = LocalBlobPayloadStore(str(tmp_path))
+
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(codec.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        asyncio.run(store.put("blob", b"blob"))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,206 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from temporalio import workflow
+from temporalio.testing import WorkflowEnvironment
+
+from agentex.sdk.execution.event_log import TaskApprovedEvent
+from agentex.sdk.execution.worker import get_data_converter
+from agentex.sdk.execution.workflow import AgentTaskWorkflowParams, BaseWorkflow, WorkflowCheckpoint
+from agentex.sdk.testing.harness import RecordedConversation, WorkflowHarness
+from agentex.src.entities.actions import ActionRegistry
+from agentex.src.entities.agents import Agent, AgentStatus
+from agentex.src.entities.task import Task
+from tests.test_harness import HELLO_WORLD_PROJECT, tool_call_completion
+
+TASK = Task(id="task", agent_id="agent", prompt="Say hi")
+AGENT = Agent(
+    id="agent",
+    name="agent",
+    description="Agent",
+    status=AgentStatus.READY,
+    workflow_name="CheckpointedWorkflow",
+    workflow_queue_name="queue",
+)
+
+
+class ContinuedAsNew(Exception):
+    def __init__(self, params: AgentTaskWorkflowParams):
+        super().__init__()
+        self.params = params
+
+
+class CheckpointedWorkflow(BaseWorkflow):
+
+    def __init__(self):
+        super().__init__(display_name="checkpointed", max_history_length=100, max_history_size=1000)
+
+    async def run(self, params):
+        raise NotImplementedError
+
+
+def history(monkeypatch, length: int = 0, size: int = 0, suggested: bool = False) -> None:
+    info = SimpleNamespace(
+        is_continue_as_new_suggested=lambda: suggested,
+        get_current_history_length=lambda: length,
+        get_current_history_size=lambda: size,
+    )
+    monkeypatch.setattr(workflow, "info", lambda: info)
+
+
+@pytest.fixture
+def continued(monkeypatch) -> List[AgentTaskWorkflowParams]:
+    """Stands in for the workflow APIs continue_as_new_if_needed uses, recording the params of the next run."""
+    runs = []
+
+    def continue_as_new(params):
+        runs.append(params)
+        raise ContinuedAsNew(params)
+
+    monkeypatch.setattr(workflow, "wait_condition", lambda condition: asyncio.sleep(0))
+    monkeypatch.setattr(workflow, "continue_as_new", continue_as_new)
+    return runs
+
+
+@pytest.mark.parametrize("length, size, suggested, expected", [
+    (99, 999, False, False),
+    (100, 0, False, True),
+    (0, 1000, False, True),
+    (0, 0, True, True),
+])
+def test_should_continue_as_new_thresholds(monkeypatch, length, size, suggested, expected):
+    history(monkeypatch, length=length, size=size, suggested=suggested)
+    assert CheckpointedWorkflow().should_continue_as_new() is expected
+
+
+def test_fresh_run_has_nothing_to_restore():
+    workflow_instance = CheckpointedWorkflow()
+    assert workflow_instance.restore(AgentTaskWorkflowParams(task=TASK, agent=AGENT)) is False
+    assert workflow_instance.run_segment == 0
+
+
+def test_checkpoint_round_trip(monkeypatch, continued):
+    previous_run = CheckpointedWorkflow()
+    previous_run.restore(AgentTaskWorkflowParams(task=TASK, agent=AGENT, require_approval=True))
+    asyncio.run(previous_run.approve())
+    previous_run.waiting_for_instruction = True
+    previous_run.checkpoint_state["pending_tool_call_ids"] = ["call_1"]
+
+    history(monkeypatch, length=100)
+    with pytest.raises(ContinuedAsNew):
+        asyncio.run(previous_run.continue_as_new_if_needed())
+
+    # The next run receives its params through the data converter, like any workflow input
+    payload_converter = get_data_converter().payload_converter
+    (params,) = payload_converter.from_payloads(
+        payload_converter.to_payloads(continued),
+        [AgentTaskWorkflowParams],
+    )
+    assert params.checkpoint == WorkflowCheckpoint(
+        task_approved=True,
+        waiting_for_instruction=True,
+        event_log_offset=1,
+        run_segment=1,
+        state={"pending_tool_call_ids": ["call_1"]},
+    )
+
+    next_run = CheckpointedWorkflow()
+    assert next_run.restore(params) is True
+    assert (next_run.task_approved, next_run.waiting_for_instruction, next_run.run_segment) == (True, True, 1)
+    assert next_run.checkpoint_state == {"pending_tool_call_ids": ["call_1"]}
+    assert (next_run.params.task, next_run.params.require_approval) == (TASK, True)
+    # Event offsets carry on from the previous run, so readers' cursors stay valid
+    assert next_run.event_log.append(TaskApprovedEvent()).offset == 1
+
+
+def test_below_the_thresholds_the_run_goes_on(monkeypatch, continued):
+    workflow_instance = CheckpointedWorkflow()
+    workflow_instance.restore(AgentTaskWorkflowParams(task=TASK, agent=AGENT))
+    history(monkeypatch, length=99)
+    asyncio.run(workflow_instance.continue_as_new_if_needed())
+    assert continued == []
+
+
+def test_without_params_the_run_goes_on(monkeypatch, continued):
+    history(monkeypatch, length=100)
+    asyncio.run(CheckpointedWorkflow().continue_as_new_if_needed())
+    assert continued == []
+
+
+def test_in_flight_signal_handlers_finish_before_continuing_as_new(monkeypatch, continued):
+    handlers_finished = asyncio.Event()
+    conditions = []
+
+    async def wait_condition(condition):
+        conditions.append(condition)
+        await handlers_finished.wait()
+
+    monkeypatch.setattr(workflow, "wait_condition", wait_condition)
+    history(monkeypatch, length=100)
+    workflow_instance = CheckpointedWorkflow()
+    workflow_instance.restore(AgentTaskWorkflowParams(task=TASK, agent=AGENT))
+
+    async def continue_while_a_handler_runs():
+        attempt = asyncio.create_task(workflow_instance.continue_as_new_if_needed())
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert continued == []
+        handlers_finished.set()
+        await attempt
+
+    with pytest.raises(ContinuedAsNew):
+        asyncio.run(continue_while_a_handler_runs())
+    assert conditions == [workflow.all_handlers_finished]
+    assert len(continued) == 1
+
+
+def test_harness_forces_continue_as_new_mid_run(monkeypatch):
+    monkeypatch.syspath_prepend(str(HELLO_WORLD_PROJECT))
+    for module in ("activities", "constants", "workflow"):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    from activities import HelloAdam, HelloJessica
+    from constants import BASE_ACTION_REGISTRY_KEY
+    from workflow import HelloWorldWorkflow
+
+    # Continue as new at every decision once past the first few history events of a run
+    monkeypatch.setattr(
+        BaseWorkflow,
+        "should_continue_as_new",
+        lambda self: workflow.info().get_current_history_length() >= 8,
+    )
+
+    harness = WorkflowHarness(
+        workflow=HelloWorldWorkflow,
+        action_registry=ActionRegistry(actions={BASE_ACTION_REGISTRY_KEY: [HelloAdam, HelloJessica]}),
+    )
+    conversations = [
+        RecordedConversation(
+            prompt=f"Say hello to person {i}",
+            completions=[
+                tool_call_completion("hello_adam", f'{{"name": "Person {i}"}}', f"call_{i}_1"),
+                tool_call_completion("hello_jessica", f'{{"name": "Person {i}"}}', f"call_{i}_2"),
+            ],
+        )
+        for i in range(2)
+    ]
+
+    async def run():
+        try:
+            env = await WorkflowEnvironment.start_time_skipping(data_converter=harness.data_converter)
+        except RuntimeError as error:
+            pytest.skip(f"Temporal test server unavailable: {error}")
+        try:
+            return await harness.run(conversations, concurrency=2, env=env)
+        finally:
+            await env.shutdown()
+
+    report = asyncio.run(run())
+    assert report.failed_tasks == 0
+    # Each task continued as new between its decisions, and every run replays deterministically
+    assert report.continued_as_new >= len(conversations) * 2
+    assert report.replay_failures == 0
+    # The resumed runs carried on from the thread rather than starting the conversation over
+    assert report.turns == len(conversations) * 3
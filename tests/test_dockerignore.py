@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from agentex.cli.models.action_manifest import BuildContextManager
+from agentex.utils.build_context_cache import BuildContextCache
+from agentex.utils.dockerignore import DockerIgnore, IgnorePattern
+
+
+def ignored(lines, path: str, is_dir: bool = False) -> bool:
+    return DockerIgnore.from_lines(lines).is_ignored(path, is_dir=is_dir)
+
+
+def test_parse_skips_comments_and_blank_lines():
+    assert IgnorePattern.parse("# comment") is None
+    assert IgnorePattern.parse("   ") is None
+    assert IgnorePattern.parse("/") is None
+    pattern = IgnorePattern.parse("! /build/out/ ")
+    assert pattern.pattern == "build/out"
+    assert pattern.negated and pattern.anchored and pattern.directory_only
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("main.pyc", True),
+    ("agent/deep/main.pyc", True),
+    ("main.py", False),
+])
+def test_unanchored_patterns_match_at_any_depth(path, expected):
+    assert ignored(["*.pyc"], path) is expected
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("dist", True),
+    ("dist/app.js", True),
+    ("agent/dist", False),
+    ("agent/main.py", False),
+    ("agent/sub/main.py", True),
+    ("other/agent/main.py", False),
+])
+def test_anchored_patterns_match_from_the_root(path, expected):
+    assert ignored(["/dist", "agent/*/main.py"], path) is expected
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("debug.log", True),
+    ("agent/a/b/debug.log", True),
+    ("agent/test", True),
+    ("agent/a/b/test/case.py", True),
+    ("other/test", False),
+])
+def test_double_star_spans_directories(path, expected):
+    assert ignored(["**/*.log", "agent/**/test"], path) is expected
+
+
+def test_directory_only_patterns():
+    lines = ["build/"]
+    assert ignored(lines, "build", is_dir=True)
+    assert ignored(lines, "agent/build", is_dir=True)
+    assert ignored(lines, "agent/build/out.o")
+    # A file named like the directory is kept
+    assert not ignored(lines, "agent/build")
+
+
+def test_negation_re_includes_matching_files():
+    lines = ["*.md", "!README.md"]
+    assert ignored(lines, "docs/guide.md")
+    assert not ignored(lines, "README.md")
+    assert not ignored(lines, "docs/README.md")
+    # The last matching pattern wins
+    assert ignored(lines + ["docs/README.md"], "docs/README.md")
+
+
+def test_anchored_negation_re_includes_inside_an_ignored_directory():
+    dockerignore = DockerIgnore.from_lines(["build/", "!build/keep.txt"])
+    assert not dockerignore.is_ignored("build/keep.txt")
+    assert dockerignore.is_ignored("build/other.txt")
+    assert not dockerignore.can_prune("build")
+    assert dockerignore.can_prune("agent/build")
+
+
+def test_unanchored_negation_does_not_prevent_pruning():
+    dockerignore = DockerIgnore.from_lines(["node_modules/", "*.pyc", "!keep.pyc"])
+    assert dockerignore.can_prune("node_modules")
+    assert dockerignore.is_ignored("node_modules/keep.pyc")
+    assert not dockerignore.is_ignored("agent/keep.pyc")
+    assert dockerignore.is_ignored("agent/other.pyc")
+
+
+def test_unanchored_negation_of_a_directory_re_includes_it():
+    dockerignore = DockerIgnore.from_lines(["*", "!agent"])
+    assert not dockerignore.can_prune("agent")
+    assert not dockerignore.is_ignored("agent/main.py")
+    assert dockerignore.is_ignored("other/main.py")
+    assert dockerignore.can_prune("other")
+
+
+@pytest.mark.parametrize("lines", [
+    ["node_modules/", "*.pyc", "!keep.pyc"],
+    ["build/", "!build/keep.txt", "**/*.log", "!agent/**/important.log"],
+    ["*", "!agent", "agent/cache/"],
+])
+def test_pruned_walk_matches_ignoring_every_file(tmp_path, lines):
+    for path in [
+        "agent/main.py", "agent/keep.pyc", "agent/other.pyc", "agent/cache/blob", "agent/x/important.log",
+        "agent/x/debug.log", "node_modules/pkg/keep.pyc", "node_modules/pkg/index.js", "build/keep.txt",
+        "build/out.o", "README.md",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+    dockerignore = DockerIgnore.from_lines(lines)
+
+    build_context = BuildContextManager(
+        agent_manifest=None,
+        build_context_root=tmp_path,
+        cache=BuildContextCache(tmp_path / "cache"),
+    )
+    build_context.add_directory(directory_path=tmp_path, context_root=tmp_path, dockerignore=dockerignore)
+
+    every_file = [
+        Path(current, name).relative_to(tmp_path).as_posix()
+        for current, _, names in os.walk(tmp_path)
+        for name in names
+    ]
+    expected = sorted(path for path in every_file if not dockerignore.is_ignored(path))
+    assert sorted(entry.arcname for entry in build_context.entries) == expected
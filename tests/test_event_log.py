@@ -0,0 +1,99 @@
+from agentex.sdk.execution.event_log import (
+    DecisionMadeEvent,
+    EventLog,
+    EventLogPage,
+    GetEventLogParams,
+    TaskApprovedEvent,
+)
+from agentex.sdk.execution.workflow import BaseWorkflow
+
+
+def decision(index: int) -> DecisionMadeEvent:
+    return DecisionMadeEvent(finish_reason="tool_calls", tool_call_count=index, content_size=0)
+
+
+def filled_log(count: int, max_events: int) -> EventLog:
+    event_log = EventLog(max_events=max_events)
+    for index in range(count):
+        event_log.append(decision(index))
+    return event_log
+
+
+def offsets(page: EventLogPage):
+    return [event.offset for event in page.events]
+
+
+def test_events_get_increasing_offsets():
+    event_log = EventLog(next_offset=7)
+    assert event_log.first_offset == 7
+    assert event_log.append(TaskApprovedEvent()).offset == 7
+    assert event_log.append(TaskApprovedEvent()).offset == 8
+    assert (event_log.first_offset, event_log.next_offset, len(event_log)) == (7, 9, 2)
+
+
+def test_oldest_events_are_evicted():
+    event_log = filled_log(count=5, max_events=3)
+    assert len(event_log) == 3
+    assert event_log.first_offset == 2
+    assert [event.tool_call_count for event in event_log.events] == [2, 3, 4]
+
+
+def test_pages_follow_the_cursor():
+    event_log = filled_log(count=5, max_events=10)
+    page = event_log.page(cursor=0, limit=2)
+    assert (offsets(page), page.next_cursor, page.has_more) == ([0, 1], 2, True)
+    page = event_log.page(cursor=page.next_cursor, limit=2)
+    assert (offsets(page), page.next_cursor, page.has_more) == ([2, 3], 4, True)
+    page = event_log.page(cursor=page.next_cursor, limit=2)
+    assert (offsets(page), page.next_cursor, page.has_more) == ([4], 5, False)
+
+    # Polling at the end returns nothing until new events arrive
+    page = event_log.page(cursor=page.next_cursor, limit=2)
+    assert (offsets(page), page.next_cursor, page.has_more) == ([], 5, False)
+    event_log.append(decision(5))
+    assert offsets(event_log.page(cursor=5)) == [5]
+
+
+def test_cursor_behind_the_evicted_events_starts_at_the_oldest_retained_one():
+    event_log = filled_log(count=6, max_events=3)
+    page = event_log.page(cursor=1, limit=10)
+    # The reader can tell that events 1 and 2 were evicted before it saw them
+    assert page.first_offset == 3
+    assert (offsets(page), page.next_cursor, page.has_more) == ([3, 4, 5], 6, False)
+
+
+def test_page_of_an_empty_log():
+    page = EventLog().page()
+    assert (page.events, page.next_cursor, page.first_offset, page.has_more) == ([], 0, 0, False)
+
+
+def test_non_positive_limit_returns_no_events():
+    page = filled_log(count=3, max_events=3).page(cursor=0, limit=0)
+    assert (page.events, page.next_cursor, page.has_more) == ([], 0, True)
+
+
+class LoggingWorkflow(BaseWorkflow):
+
+    def __init__(self):
+        super().__init__(display_name="logging", max_event_log_size=3)
+
+    async def run(self, params):
+        raise NotImplementedError
+
+
+def test_queries():
+    workflow = LoggingWorkflow()
+    for index in range(4):
+        workflow.event_log.append(decision(index))
+
+    # The original query keeps returning every retained event as a list of dicts
+    events = workflow.get_event_log()
+    assert [(event["event"], event["offset"]) for event in events] == [
+        ("decision_made", 1),
+        ("decision_made", 2),
+        ("decision_made", 3),
+    ]
+
+    assert offsets(workflow.get_event_log_page()) == [1, 2, 3]
+    page = workflow.get_event_log_page(GetEventLogParams(cursor=2, limit=1))
+    assert (offsets(page), page.next_cursor, page.has_more) == ([2], 3, True)
@@ -0,0 +1,187 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from temporalio import activity
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
+
+from agentex.constants import DEFAULT_ROOT_THREAD_NAME
+from agentex.sdk.lib.activities.action_loop import DecideActionParams, TakeActionParams
+from agentex.sdk.lib.activities.names import ActivityName
+from agentex.sdk.lib.activities.state import AppendMessagesToThreadParams, GetMessagesFromThreadParams
+from agentex.sdk.testing.fakes import (
+    MeteredKeyValueRepository,
+    RecordingNotificationGateway,
+    ScriptedLLMGateway,
+    stop_completion,
+)
+from agentex.sdk.testing.harness import RecordedConversation, TurnTimer, WorkflowHarness, percentile
+from agentex.src.entities.actions import ActionRegistry
+from agentex.src.entities.llm import AssistantMessage, ToolCall, ToolCallRequest, ToolMessage, UserMessage
+from agentex.src.entities.state import Choice, Completion, Usage
+
+HELLO_WORLD_PROJECT = Path(__file__).parents[1] / "examples" / "agents" / "hello_world" / "project"
+
+
+def tool_call_completion(tool_name: str, arguments: str, call_id: str) -> Completion:
+    return Completion(
+        choices=[Choice(
+            finish_reason="tool_calls",
+            index=0,
+            message=AssistantMessage(
+                content="Saying hello.",
+                tool_calls=[ToolCallRequest(id=call_id, function=ToolCall(name=tool_name, arguments=arguments))],
+            ),
+        )],
+        usage=Usage(prompt_tokens=0, completion_tokens=0, total_tokens=0),
+    )
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([float(value) for value in range(1, 101)], 99) == 99.0
+
+
+def test_turn_timer_latencies():
+    timer = TurnTimer()
+    timer.decision_starts["task"] = [1.0, 1.5, 3.0]
+    assert timer.turn_latencies("task", finished_at=3.25) == [0.5, 1.5, 0.25]
+    assert timer.turn_latencies("unknown", finished_at=1.0) == []
+
+
+def test_metered_kv_store_counts_operations_and_bytes():
+    kv_store = MeteredKeyValueRepository()
+
+    async def exercise():
+        await kv_store.set("a", "four")
+        await kv_store.batch_set({"b": b"12", "c": {"x": 1}})
+        assert await kv_store.get("a") == "four"
+        await kv_store.batch_get(["b", "missing"])
+
+    asyncio.run(exercise())
+    assert (kv_store.writes, kv_store.reads) == (3, 3)
+    assert kv_store.bytes_written == 4 + 2 + len('{"x": 1}')
+    assert kv_store.bytes_read == 4 + 2
+
+
+def test_scripted_llm_gateway_picks_completion_by_turn():
+    first = tool_call_completion("hello_adam", '{"name": "Eve"}', "call_1")
+    gateway = ScriptedLLMGateway(conversations={"Say hi": [first]}, final_content="Bye.")
+    prompt = [UserMessage(content="Say hi")]
+
+    assert gateway.completion(messages=prompt, tools=[{}]) == first
+    # Without tools, decide_action asks for an explanation of the tool calls
+    assert not gateway.completion(messages=prompt, tools=None).choices[0].message.tool_calls
+    # Once the recording is exhausted, the loop is told to stop
+    after_first_turn = [*prompt, first.choices[0].message]
+    assert gateway.completion(messages=after_first_turn, tools=[{}]) == stop_completion("Bye.")
+    # Unknown prompts fall back to the default conversation, which is empty
+    assert gateway.completion(messages=[UserMessage(content="Other")], tools=[{}]) == stop_completion("Bye.")
+    assert gateway.calls == 4
+
+
+@pytest.fixture
+def hello_world(monkeypatch):
+    """The hello_world example's workflow and actions, which import their siblings as top-level modules."""
+    monkeypatch.syspath_prepend(str(HELLO_WORLD_PROJECT))
+    for module in ("activities", "constants", "workflow"):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    from activities import HelloAdam, HelloJessica
+    from constants import BASE_ACTION_REGISTRY_KEY
+    from workflow import HelloWorldWorkflow
+
+    registry = ActionRegistry(actions={BASE_ACTION_REGISTRY_KEY: [HelloAdam, HelloJessica]})
+    return HelloWorldWorkflow, registry
+
+
+def test_harness_registers_every_sdk_activity(hello_world):
+    workflow, registry = hello_world
+    harness = WorkflowHarness(workflow=workflow, action_registry=registry)
+    activities = harness._activities(
+        MeteredKeyValueRepository(),
+        ScriptedLLMGateway(conversations={}),
+        RecordingNotificationGateway(),
+    )
+    names = {activity._Definition.must_from_callable(function).name for function in activities}
+    assert names == {name.value for name in ActivityName}
+
+
+def test_harness_activities_run_a_hello_world_turn(hello_world):
+    """Drives one decision and action of the example through the harness's activities, without a Temporal server."""
+    workflow, registry = hello_world
+    harness = WorkflowHarness(workflow=workflow, action_registry=registry)
+    kv_store = MeteredKeyValueRepository()
+    completion = tool_call_completion("hello_adam", '{"name": "Eve"}', "call_1")
+    llm_gateway = ScriptedLLMGateway(conversations={"Say hi to Eve": [completion]})
+    activities = {
+        activity._Definition.must_from_callable(function).name: function
+        for function in harness._activities(kv_store, llm_gateway, RecordingNotificationGateway())
+    }
+    task = dict(task_id="task", thread_name=DEFAULT_ROOT_THREAD_NAME)
+    env = ActivityEnvironment()
+
+    async def turn():
+        await env.run(
+            activities[ActivityName.APPEND_MESSAGES_TO_THREAD],
+            AppendMessagesToThreadParams(**task, messages=[UserMessage(content="Say hi to Eve")]),
+        )
+        decision = await env.run(
+            activities[ActivityName.DECIDE_ACTION],
+            DecideActionParams(**task, action_registry_key="hello_world", model="gpt-4o-mini"),
+        )
+        tool_call = decision.choices[0].message.tool_calls[0]
+        response = await env.run(
+            activities[ActivityName.TAKE_ACTION],
+            TakeActionParams(
+                **task,
+                action_registry_key="hello_world",
+                tool_call_id=tool_call.id,
+                tool_name=tool_call.function.name,
+                tool_args=tool_call.function.arguments,
+            ),
+        )
+        messages = await env.run(activities[ActivityName.GET_MESSAGES_FROM_THREAD], GetMessagesFromThreadParams(**task))
+        return decision, response, messages
+
+    decision, response, messages = asyncio.run(turn())
+    assert decision == completion
+    assert response.message == "Adam: Hello, Eve!"
+    assert [message.role for message in messages] == ["user", "assistant", "tool"]
+    assert messages[-1] == ToolMessage(content="Adam: Hello, Eve!", tool_call_id="call_1", name="hello_adam")
+    assert kv_store.writes > 0 and kv_store.reads > 0
+    assert llm_gateway.calls == 1
+
+
+def test_harness_runs_hello_world_example(hello_world):
+    workflow, registry = hello_world
+    harness = WorkflowHarness(workflow=workflow, action_registry=registry)
+    conversations = [
+        RecordedConversation(
+            prompt=f"Say hello to person {i}",
+            completions=[tool_call_completion("hello_adam", f'{{"name": "Person {i}"}}', f"call_{i}")],
+        )
+        for i in range(3)
+    ]
+
+    async def run():
+        try:
+            env = await WorkflowEnvironment.start_time_skipping(data_converter=harness.data_converter)
+        except RuntimeError as error:
+            # The environment downloads Temporal's test server on first use
+            pytest.skip(f"Temporal test server unavailable: {error}")
+        try:
+            return await harness.run(conversations, concurrency=2, env=env)
+        finally:
+            await env.shutdown()
+
+    report = asyncio.run(run())
+    assert report.tasks == 3
+    assert report.failed_tasks == 0
+    assert report.replay_failures == 0
+    # One decision calls hello_adam and a second one, off the end of the recording, finishes the loop
+    assert report.turns == 6
+    assert report.kv_writes > 0 and report.kv_bytes_written > 0
+    assert report.history_events_max > 0
+    assert report.throughput_tasks_per_second > 0
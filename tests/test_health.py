@@ -0,0 +1,183 @@
+import asyncio
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from agentex.sdk.execution.health import ActivitySlotTracker, HealthMonitor, _SlotTrackingActivityInboundInterceptor
+from agentex.sdk.execution.worker import AgentexWorker
+from agentex.src.adapters.kv_store.port import KeyValueRepository
+
+
+class DictStore(KeyValueRepository):
+    """A store that implements only the abstract methods, like a third-party one."""
+
+    def __init__(self, hang: bool = False):
+        self.store: Dict[str, Any] = {}
+        self.hang = hang
+
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        self.store[key] = value
+
+    async def batch_set(self, updates: Dict[str, Any]) -> None:
+        self.store.update(updates)
+
+    async def get(self, key: str) -> Any:
+        if self.hang:
+            await asyncio.Event().wait()
+        return self.store.get(key)
+
+    async def batch_get(self, keys: List[str]) -> List[Any]:
+        return [self.store.get(key) for key in keys]
+
+    async def delete(self, key: str) -> Any:
+        return self.store.pop(key, None)
+
+    async def batch_delete(self, keys: List[str]) -> List[Any]:
+        return [self.store.pop(key, None) for key in keys]
+
+
+class HealthyTemporal:
+    service_client = SimpleNamespace(check_health=lambda timeout: asyncio.sleep(0, result=True))
+
+
+def running_worker(kv_store: KeyValueRepository, **kwargs) -> AgentexWorker:
+    worker = AgentexWorker(
+        task_queue="queue",
+        max_concurrent_activities=2,
+        health_check_port=0,
+        kv_store=kv_store,
+        **kwargs,
+    )
+    worker.health_monitor.temporal_client = HealthyTemporal()
+    worker.health_monitor.worker = SimpleNamespace(is_running=True, is_shutdown=False)
+    worker.health_monitor.check_timeout = timedelta(milliseconds=50)
+    return worker
+
+
+def probe(worker: AgentexWorker, path: str):
+    check = worker._liveness_check if path == "/livez" else worker._readiness_check
+    response = asyncio.run(check())
+    return response.status, json.loads(response.body)
+
+
+def test_store_without_its_own_ping_is_pinged_with_a_read():
+    assert asyncio.run(DictStore().ping()) is True
+
+
+def test_ready_worker():
+    worker = running_worker(DictStore())
+    status, report = probe(worker, "/readyz")
+    assert status == 200
+    assert {name: dependency["healthy"] for name, dependency in report["dependencies"].items()} == {
+        "temporal": True,
+        "kv_store": True,
+    }
+    assert probe(worker, "/livez")[0] == 200
+
+
+def test_hung_dependency_fails_readiness_but_not_liveness():
+    worker = running_worker(DictStore(hang=True))
+    status, report = probe(worker, "/readyz")
+    assert status == 503
+    assert report["dependencies"]["kv_store"]["healthy"] is False
+
+    # Liveness does not wait for the store, and does not even report it
+    status, report = probe(worker, "/livez")
+    assert status == 200
+    assert report["dependencies"] == {}
+
+
+def test_crashed_worker_fails_liveness():
+    worker = running_worker(DictStore())
+    worker.health_monitor.worker_failed = True
+    assert probe(worker, "/livez")[0] == 503
+    assert probe(worker, "/readyz")[0] == 503
+
+
+def test_worker_that_is_not_running_is_live_but_not_ready():
+    worker = running_worker(DictStore())
+    worker.health_monitor.worker = None
+    assert probe(worker, "/livez")[0] == 200
+    assert probe(worker, "/readyz")[0] == 503
+
+
+class CountingStore(DictStore):
+    def __init__(self):
+        super().__init__()
+        self.pings = 0
+
+    async def ping(self) -> bool:
+        self.pings += 1
+        return True
+
+
+def test_dependency_checks_are_cached():
+    store = CountingStore()
+    monitor = HealthMonitor(slot_tracker=ActivitySlotTracker(1), kv_store=store, check_interval=timedelta(hours=1))
+    monitor.temporal_client = HealthyTemporal()
+
+    async def check_twice():
+        await monitor.check_dependencies()
+        await monitor.check_dependencies()
+
+    asyncio.run(check_twice())
+    assert store.pings == 1
+
+
+def test_slot_tracker_detects_saturation():
+    tracker = ActivitySlotTracker(max_concurrent_activities=4, saturation_threshold=0.5)
+    tracker.acquire()
+    assert tracker.saturated_since is None
+    tracker.acquire()
+    assert tracker.saturated_since is not None
+    assert tracker.snapshot().utilization == 0.5
+    tracker.release()
+    assert tracker.saturated_since is None
+    assert tracker.saturated_for() == 0.0
+
+
+def test_sustained_saturation_sheds_load():
+    worker = running_worker(DictStore(), saturation_threshold=1.0, saturation_window=timedelta(0))
+    worker.slot_tracker.acquire()
+    assert probe(worker, "/readyz")[0] == 200
+    worker.slot_tracker.acquire()
+    status, report = probe(worker, "/readyz")
+    assert status == 503
+    assert report["saturated"] is True
+    assert report["activity_slots"]["in_flight"] == 2
+    # An overloaded worker is still live
+    assert probe(worker, "/livez")[0] == 200
+
+    worker.slot_tracker.release()
+    assert probe(worker, "/readyz")[0] == 200
+
+
+def test_saturation_within_the_window_keeps_the_worker_ready():
+    worker = running_worker(DictStore(), saturation_threshold=0.5, saturation_window=timedelta(minutes=5))
+    worker.slot_tracker.acquire()
+    assert worker.slot_tracker.saturated_since is not None
+    assert probe(worker, "/readyz")[0] == 200
+
+
+class FailingActivity:
+    def __init__(self, tracker: ActivitySlotTracker):
+        self.tracker = tracker
+        self.in_flight_during_execution = None
+
+    async def execute_activity(self, input) -> None:
+        self.in_flight_during_execution = self.tracker.in_flight
+        raise RuntimeError("activity failed")
+
+
+def test_interceptor_counts_activities_in_flight():
+    tracker = ActivitySlotTracker(max_concurrent_activities=1)
+    activity = FailingActivity(tracker)
+    interceptor = _SlotTrackingActivityInboundInterceptor(activity, tracker)
+    with pytest.raises(RuntimeError):
+        asyncio.run(interceptor.execute_activity(None))
+    assert activity.in_flight_during_execution == 1
+    # The slot is released even though the activity failed
+    assert tracker.in_flight == 0
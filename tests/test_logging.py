@@ -0,0 +1,60 @@
+import io
+import logging
+
+import pytest
+from rich.console import Console
+
+from agentex.utils import logging as agentex_logging
+from agentex.utils.logging import LazyRichHandler
+
+
+@pytest.fixture
+def output(monkeypatch) -> io.StringIO:
+    file = io.StringIO()
+    monkeypatch.setattr(agentex_logging, "get_console", lambda: Console(file=file, width=200))
+    return file
+
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    logger = logging.getLogger("tests.logging")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    logger.handlers.clear()
+
+
+def test_rich_is_set_up_on_the_first_record(output, logger):
+    handler = LazyRichHandler()
+    logger.addHandler(handler)
+    assert handler._handler is None
+    logger.info("hello")
+    assert handler._handler is not None
+    assert "hello" in output.getvalue()
+
+
+def test_level_and_filters_of_the_handler_apply(output, logger):
+    handler = LazyRichHandler()
+    handler.setLevel(logging.WARNING)
+    handler.addFilter(lambda record: "secret" not in record.getMessage())
+    logger.addHandler(handler)
+
+    logger.info("too detailed")
+    logger.warning("a secret warning")
+    logger.warning("a public warning")
+    assert "too detailed" not in output.getvalue()
+    assert "secret" not in output.getvalue()
+    assert "a public warning" in output.getvalue()
+
+
+def test_formatter_of_the_handler_applies(output, logger):
+    handler = LazyRichHandler()
+    handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+    logger.addHandler(handler)
+    logger.info("first")
+
+    # Also when it is replaced after rich was set up
+    handler.setFormatter(logging.Formatter("<%(levelname)s> %(message)s"))
+    logger.info("second")
+    assert "[tests.logging] first" in output.getvalue()
+    assert "<INFO> second" in output.getvalue()
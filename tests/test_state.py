@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+from agentex.src.entities.llm import AssistantMessage, ToolMessage, UserMessage
+from agentex.src.entities.state import AgentState, Thread
+from agentex.src.services.agent_state_repository import AgentStateRepository
+from agentex.src.services.agent_state_service import AgentStateService
+
+TASK_ID = "task"
+THREAD_NAME = "thread"
+
+
+def make_messages():
+    return [
+        UserMessage(content="Say hi"),
+        AssistantMessage(content="Saying hi."),
+        ToolMessage(content="hi", tool_call_id="call_1", name="say"),
+    ]
+
+
+def make_service(stored_state: str) -> AgentStateService:
+    kv_store = LocalKeyValueRepository()
+    asyncio.run(kv_store.set(TASK_ID, stored_state))
+    return AgentStateService(repository=AgentStateRepository(kv_store=kv_store))
+
+
+def test_thread_stored_without_versions_starts_at_its_length():
+    messages = [message.to_dict() for message in make_messages()]
+    thread = AgentState.from_json(json.dumps({"threads": {THREAD_NAME: {"messages": messages}}})).threads[THREAD_NAME]
+    assert (thread.version, thread.base_version, thread.base_length) == (0, 0, 3)
+    assert thread.length_at(0) == 3
+
+
+def test_stored_versions_are_kept():
+    thread = Thread.model_validate({"messages": [], "version": 4, "base_version": 2, "base_length": 1})
+    assert (thread.version, thread.base_version, thread.base_length) == (4, 2, 1)
+
+
+def test_legacy_thread_delta_after_append_is_only_the_new_message():
+    messages = [message.to_dict() for message in make_messages()]
+    service = make_service(json.dumps({"threads": {THREAD_NAME: {"messages": messages}}}))
+
+    async def append_and_read():
+        await service.threads.append_message(TASK_ID, THREAD_NAME, UserMessage(content="new"))
+        return await service.threads.get_thread_slice(TASK_ID, THREAD_NAME, since_version=0)
+
+    thread_slice = asyncio.run(append_and_read())
+    assert thread_slice.reset is False
+    assert thread_slice.offset == 3
+    assert thread_slice.messages == [UserMessage(content="new")]
+
+
+def test_batch_override_without_changes_keeps_version():
+    state = AgentState(threads={THREAD_NAME: Thread(messages=make_messages())})
+    service = make_service(state.to_json())
+    unchanged = state.threads[THREAD_NAME].messages[0]
+
+    async def override(updates):
+        await service.threads.batch_override_messages(TASK_ID, THREAD_NAME, updates)
+        return await service.threads.get_thread_slice(TASK_ID, THREAD_NAME, since_version=0)
+
+    # Out of range and identical updates apply nothing, so readers at version 0 keep getting deltas
+    thread_slice = asyncio.run(override({0: unchanged, 7: UserMessage(content="ignored")}))
+    assert (thread_slice.version, thread_slice.reset, thread_slice.messages) == (0, False, [])
+
+    thread_slice = asyncio.run(override({1: UserMessage(content="changed")}))
+    assert thread_slice.version == 1
+    assert thread_slice.reset is True
+
+
+def test_upsert_tool_message_appends_a_new_tool_call():
+    service = make_service(AgentState(threads={THREAD_NAME: Thread(messages=make_messages())}).to_json())
+    message = ToolMessage(content="hello", tool_call_id="call_2", name="say")
+
+    result = asyncio.run(service.threads.upsert_tool_message(TASK_ID, THREAD_NAME, message))
+    assert (result.length, result.version) == (4, 1)
+    thread_slice = asyncio.run(service.threads.get_thread_slice(TASK_ID, THREAD_NAME, since_version=0))
+    assert (thread_slice.reset, thread_slice.messages) == (False, [message])
+
+
+def test_upsert_tool_message_replaces_the_same_tool_call():
+    service = make_service(AgentState(threads={THREAD_NAME: Thread(messages=make_messages())}).to_json())
+    retried = ToolMessage(content="hi again", tool_call_id="call_1", name="say")
+
+    result = asyncio.run(service.threads.upsert_tool_message(TASK_ID, THREAD_NAME, retried))
+    assert (result.length, result.version) == (3, 1)
+    messages = asyncio.run(service.threads.get_messages(TASK_ID, THREAD_NAME))
+    assert messages[2] == retried
+    # Readers that had the replaced message have to reload the thread
+    thread_slice = asyncio.run(service.threads.get_thread_slice(TASK_ID, THREAD_NAME, since_version=0))
+    assert thread_slice.reset is True
+
+    # Upserting the same message again changes nothing
+    result = asyncio.run(service.threads.upsert_tool_message(TASK_ID, THREAD_NAME, retried))
+    assert (result.length, result.version) == (3, 1)
+
+
+def test_batch_upsert_rewrites_the_thread_once():
+    messages = make_messages() + [ToolMessage(content="pending", tool_call_id="call_2", name="say")]
+    service = make_service(AgentState(threads={THREAD_NAME: Thread(messages=messages)}).to_json())
+    results = [
+        ToolMessage(content="hi", tool_call_id="call_2", name="say"),
+        ToolMessage(content="changed", tool_call_id="call_1", name="say"),
+        ToolMessage(content="new", tool_call_id="call_3", name="say"),
+    ]
+
+    result = asyncio.run(service.threads.batch_upsert_tool_messages(TASK_ID, THREAD_NAME, results))
+    assert (result.length, result.version) == (5, 1)
+    stored = asyncio.run(service.threads.get_messages(TASK_ID, THREAD_NAME))
+    assert [message.content for message in stored[2:]] == ["changed", "hi", "new"]
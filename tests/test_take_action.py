@@ -0,0 +1,126 @@
+import asyncio
+from datetime import timedelta
+from typing import ClassVar, List
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from agentex.sdk.lib.activities.action_loop import ActionLoopActivities, TakeActionParams
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+from agentex.src.entities.actions import Action, ActionRegistry, ActionResponse
+from agentex.src.entities.llm import ToolMessage
+from agentex.src.services.agent_state_repository import AgentStateRepository
+from agentex.src.services.agent_state_service import AgentStateService
+
+TASK_ID = "task"
+THREAD_NAME = "thread"
+
+
+class SendEmail(Action):
+    """Records every execution, and fails while `failures` is positive."""
+
+    to: str
+
+    executions: ClassVar[List[str]] = []
+    failures: ClassVar[int] = 0
+
+    async def execute(self) -> ActionResponse:
+        SendEmail.executions.append(self.to)
+        if SendEmail.failures > 0:
+            SendEmail.failures -= 1
+            raise ConnectionError("mail server unavailable")
+        return ActionResponse(message=f"Sent to {self.to}")
+
+
+@pytest.fixture(autouse=True)
+def reset_action():
+    SendEmail.executions = []
+    SendEmail.failures = 0
+
+
+@pytest.fixture
+def kv_store() -> LocalKeyValueRepository:
+    return LocalKeyValueRepository()
+
+
+@pytest.fixture
+def agent_state(kv_store) -> AgentStateService:
+    return AgentStateService(repository=AgentStateRepository(kv_store=kv_store))
+
+
+@pytest.fixture
+def activities(agent_state):
+    activities = ActionLoopActivities(
+        llm_gateway=None,
+        agent_state=agent_state,
+        action_class_registry=ActionRegistry(actions={"actions": [SendEmail]}),
+    )
+    yield activities
+    activities.shutdown()
+
+
+def take_action(activities: ActionLoopActivities, **overrides) -> ActionResponse:
+    params = TakeActionParams(
+        task_id=TASK_ID,
+        thread_name=THREAD_NAME,
+        action_registry_key="actions",
+        tool_call_id="call_1",
+        tool_name="send_email",
+        tool_args='{"to": "adam"}',
+    ).model_copy(update=overrides)
+    return asyncio.run(ActivityEnvironment().run(activities.take_action, params))
+
+
+def tool_messages(agent_state: AgentStateService) -> List[ToolMessage]:
+    return asyncio.run(agent_state.threads.get_messages(TASK_ID, THREAD_NAME))
+
+
+def test_retried_call_reuses_the_recorded_result(activities, agent_state):
+    assert take_action(activities).message == "Sent to adam"
+    # A retry after the result was recorded, e.g. because the worker crashed before completing the activity
+    assert take_action(activities).message == "Sent to adam"
+
+    assert SendEmail.executions == ["adam"]
+    assert tool_messages(agent_state) == [ToolMessage(content="Sent to adam", tool_call_id="call_1", name="send_email")]
+
+
+def test_failed_attempt_is_not_recorded_and_its_message_is_replaced(activities, agent_state):
+    SendEmail.failures = 1
+    with pytest.raises(ConnectionError):
+        take_action(activities)
+    assert tool_messages(agent_state)[0].content == "mail server unavailable"
+
+    assert take_action(activities).message == "Sent to adam"
+    assert SendEmail.executions == ["adam", "adam"]
+    assert [message.content for message in tool_messages(agent_state)] == ["Sent to adam"]
+
+
+def test_other_tool_calls_are_executed(activities, agent_state):
+    take_action(activities)
+    take_action(activities, tool_call_id="call_2", tool_args='{"to": "jessica"}')
+    assert SendEmail.executions == ["adam", "jessica"]
+    assert [message.tool_call_id for message in tool_messages(agent_state)] == ["call_1", "call_2"]
+
+
+def test_background_call_leaves_the_tool_message_to_the_workflow(activities, agent_state):
+    assert take_action(activities, record_tool_message=False).message == "Sent to adam"
+    assert tool_messages(agent_state) == []
+    # Its result is still memoized
+    take_action(activities, record_tool_message=False)
+    assert SendEmail.executions == ["adam"]
+
+
+def test_recorded_results_expire(kv_store):
+    agent_state = AgentStateService(
+        repository=AgentStateRepository(kv_store=kv_store),
+        action_result_ttl=timedelta(milliseconds=10),
+    )
+
+    async def record_and_wait():
+        await agent_state.action_results.set(TASK_ID, "call_1", ActionResponse(message="done"))
+        assert (await agent_state.action_results.get(TASK_ID, "call_1")).message == "done"
+        await asyncio.sleep(0.02)
+        return await agent_state.action_results.get(TASK_ID, "call_1")
+
+    assert asyncio.run(record_and_wait()) is None
+    assert kv_store.store == {}
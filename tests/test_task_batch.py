@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from agentex.cli.handlers.task_handlers import load_task_batch, submit_task_batch
+from agentex.client.types.bulk import BulkItemStatus
+from tests.conftest import mock_async_agentex
+
+BATCH = """
+{"agent": "hello-world", "prompt": "first"}
+
+{"prompt": "second"}
+
+
+{"agent": "hello-world", "prompt": "rejected"}
+"""
+
+
+def create_task(request: httpx.Request) -> httpx.Response:
+    prompt = json.loads(request.content)["prompt"]
+    if prompt == "rejected":
+        return httpx.Response(400, json={"detail": "Invalid prompt"})
+    return httpx.Response(200, json={"id": f"task-{prompt}", "agent_id": "agent", "prompt": prompt})
+
+
+@pytest.fixture
+def batch_path(tmp_path) -> str:
+    path = tmp_path / "batch.jsonl"
+    path.write_text(BATCH)
+    return str(path)
+
+
+def test_load_task_batch_records_line_numbers(batch_path):
+    tasks = load_task_batch(batch_path, default_agent="default")
+    assert [(task.line, task.request.agent, task.request.prompt) for task in tasks] == [
+        (2, "hello-world", "first"),
+        (4, "default", "second"),
+        (7, "hello-world", "rejected"),
+    ]
+
+
+def test_load_task_batch_reports_the_line_of_an_invalid_task(tmp_path):
+    path = tmp_path / "batch.jsonl"
+    path.write_text('\n{"agent": "hello-world", "prompt": "first"}\n{"agent": "hello-world"}\n')
+    with pytest.raises(ValueError, match="line 3"):
+        load_task_batch(str(path))
+
+
+def test_manifest_points_at_the_lines_of_the_batch_file(batch_path, tmp_path):
+    manifest_path = tmp_path / "manifests" / "batch.manifest.jsonl"
+    results = asyncio.run(submit_task_batch(
+        agentex=mock_async_agentex(create_task),
+        tasks=load_task_batch(batch_path, default_agent="default"),
+        manifest_path=str(manifest_path),
+        concurrency=2,
+        rate_limit=None,
+        max_retries=0,
+    ))
+    assert [result.status for result in results] == [
+        BulkItemStatus.SUCCEEDED,
+        BulkItemStatus.SUCCEEDED,
+        BulkItemStatus.FAILED,
+    ]
+
+    entries = sorted(
+        (json.loads(line) for line in manifest_path.read_text().splitlines()),
+        key=lambda entry: entry["index"],
+    )
+    assert [(entry["index"], entry["line"], entry["status"], entry["task_id"]) for entry in entries] == [
+        (0, 2, "succeeded", "task-first"),
+        (1, 4, "succeeded", "task-second"),
+        (2, 7, "failed", None),
+    ]
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from temporalio import workflow
+
+from agentex.sdk.execution.helpers import THREAD_DELTAS_PATCH_ID, WorkflowHelper
+from agentex.sdk.lib.activities import stubs
+from agentex.sdk.lib.activities.state import AgentStateActivities, AppendMessagesToThreadParams
+from agentex.src.adapters.kv_store.adapter_local import LocalKeyValueRepository
+from agentex.src.entities.llm import Message, UserMessage
+from agentex.src.entities.state import ThreadAppendResult
+from agentex.src.services.agent_state_repository import AgentStateRepository
+from agentex.src.services.agent_state_service import AgentStateService
+
+PARAMS = AppendMessagesToThreadParams(task_id="task", thread_name="thread", messages=[UserMessage(content="hi")])
+
+
+@pytest.fixture
+def executed(monkeypatch) -> List[Dict[str, Any]]:
+    calls = []
+
+    async def execute_activity(**kwargs):
+        calls.append(kwargs)
+        if kwargs["response_type"] is ThreadAppendResult:
+            return ThreadAppendResult(length=1, version=1)
+        return [UserMessage(content="hi")]
+
+    monkeypatch.setattr(WorkflowHelper, "execute_activity", staticmethod(execute_activity))
+    return calls
+
+
+def patch_history(monkeypatch, has_marker: bool) -> None:
+    monkeypatch.setattr(workflow, "patched", lambda patch_id: patch_id != THREAD_DELTAS_PATCH_ID or has_marker)
+
+
+def test_append_returns_the_thread_length_and_version(monkeypatch, executed):
+    patch_history(monkeypatch, has_marker=True)
+    assert asyncio.run(stubs.append_messages_to_thread(PARAMS)) == ThreadAppendResult(length=1, version=1)
+    (call,) = executed
+    assert call["request"].return_thread is False
+
+
+def test_history_before_thread_deltas_replays_the_full_thread_append(monkeypatch, executed):
+    patch_history(monkeypatch, has_marker=False)
+    assert asyncio.run(stubs.append_messages_to_thread(PARAMS)) is None
+    (call,) = executed
+    assert call["request"].return_thread is True
+    assert call["response_type"] == List[Message]
+
+
+def test_append_activity_returns_the_thread_only_when_asked():
+    activities = AgentStateActivities(
+        agent_state=AgentStateService(repository=AgentStateRepository(kv_store=LocalKeyValueRepository())),
+    )
+    result = asyncio.run(activities.append_messages_to_thread(PARAMS))
+    assert result == ThreadAppendResult(length=1, version=1)
+
+    legacy_params = PARAMS.model_copy(update={"return_thread": True})
+    assert asyncio.run(activities.append_messages_to_thread(legacy_params)) == [UserMessage(content="hi")] * 2
@@ -0,0 +1,279 @@
+import asyncio
+import io
+import re
+import tarfile
+import threading
+from typing import Dict, List, Optional
+
+import httpx
+import pytest
+
+from agentex.cli.models.action_manifest import AgentManifestConfig, BuildContextManager
+from agentex.client import agentex as agentex_client
+from agentex.utils.build_context_cache import BuildContextCache
+from agentex.utils.streams import Pipe
+from tests.conftest import mock_agentex, mock_async_agentex
+
+PACKAGE = bytes(range(256)) * 40
+CHUNK_SIZE = 1000
+AGENT = {"id": "agent-1", "name": "hello", "description": "Says hi", "status": "Pending"}
+
+MANIFEST = """
+build:
+  context:
+    root: .
+    include_paths:
+      - project
+    dockerfile: Dockerfile
+agent:
+  name: hello
+  description: Says hi
+workflow:
+  name: hello
+  queue_name: hello_queue
+"""
+
+
+class Upload:
+    def __init__(self, data: bytes = b"", complete: bool = False):
+        self.data = data
+        self.complete = complete
+
+
+class UploadServer:
+    """
+    The resumable upload endpoints. The PUT numbered `fail_put` keeps only the first half of its chunk and then
+    fails with a 500, like a connection that broke mid-chunk behind a proxy. The PUT numbered `lose_put` stores
+    its whole chunk, but its response is lost and a 500 is returned instead.
+    """
+
+    def __init__(self, fail_put: Optional[int] = None, lose_put: Optional[int] = None):
+        self.fail_put = fail_put
+        self.lose_put = lose_put
+        self.uploads: Dict[str, Upload] = {}
+        self.ranges: List[str] = []
+        self.requests: List[str] = []
+        self.created_from: Optional[str] = None
+
+    def status(self, upload_id: str) -> httpx.Response:
+        upload = self.uploads[upload_id]
+        return httpx.Response(
+            200,
+            json={"upload_id": upload_id, "offset": len(upload.data), "complete": upload.complete},
+        )
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(f"{request.method} {request.url.path}")
+        if request.url.path == "/agents":
+            form = dict(part.split("=", 1) for part in request.content.decode().split("&"))
+            self.created_from = form["upload_id"]
+            return httpx.Response(200, json=AGENT)
+        if request.url.path == "/agents/uploads":
+            upload_id = f"upload-{len(self.uploads) + 1}"
+            self.uploads[upload_id] = Upload()
+            return self.status(upload_id)
+        upload_id = request.url.path.rsplit("/", 1)[-1]
+        if request.method == "GET":
+            return self.status(upload_id)
+
+        content_range = request.headers["Content-Range"]
+        self.ranges.append(content_range)
+        upload = self.uploads[upload_id]
+        start, total = re.fullmatch(r"bytes (\d+)-\d+/(\d+|\*)", content_range).groups()
+        assert int(start) == len(upload.data), "Chunks must continue at the received offset"
+        if len(self.ranges) == self.fail_put:
+            upload.data += request.content[:len(request.content) // 2]
+            return httpx.Response(500)
+        upload.data += request.content
+        upload.complete = total != "*"
+        if len(self.ranges) == self.lose_put:
+            return httpx.Response(500)
+        return self.status(upload_id)
+
+
+def test_fresh_upload():
+    server = UploadServer()
+    progress = []
+    with mock_agentex(server) as client:
+        upload_id = client.agents.upload_package(
+            io.BytesIO(PACKAGE),
+            chunk_size=CHUNK_SIZE,
+            on_progress=progress.append,
+        )
+
+    upload = server.uploads[upload_id]
+    assert upload.data == PACKAGE and upload.complete
+    assert len(server.ranges) == 11
+    assert server.ranges[0] == "bytes 0-999/*"
+    assert server.ranges[-1] == f"bytes 10000-{len(PACKAGE) - 1}/{len(PACKAGE)}"
+    assert progress == list(range(0, len(PACKAGE), CHUNK_SIZE)) + [len(PACKAGE)]
+
+
+def test_failed_chunk_resumes_from_the_server_offset():
+    server = UploadServer(fail_put=3)
+    with mock_agentex(server, max_retries=0) as client:
+        upload_id = client.agents.upload_package(io.BytesIO(PACKAGE), chunk_size=CHUNK_SIZE)
+
+    assert server.uploads[upload_id].data == PACKAGE
+    # The failed chunk is not sent again from its start, only from where the server says it stopped
+    assert server.ranges[2:4] == ["bytes 2000-2999/*", "bytes 2500-2999/*"]
+    assert server.requests.count(f"GET /agents/uploads/{upload_id}") == 1
+
+
+def test_chunk_whose_response_was_lost_is_not_sent_again():
+    server = UploadServer(lose_put=3)
+    with mock_agentex(server, max_retries=0) as client:
+        upload_id = client.agents.upload_package(io.BytesIO(PACKAGE), chunk_size=CHUNK_SIZE)
+
+    assert server.uploads[upload_id].data == PACKAGE and server.uploads[upload_id].complete
+    # The server confirms it has the whole chunk, so the upload goes on with the next one
+    assert server.ranges[2:4] == ["bytes 2000-2999/*", "bytes 3000-3999/*"]
+    assert len(server.ranges) == 11
+
+
+def test_last_chunk_whose_response_was_lost_completes_the_upload():
+    server = UploadServer(lose_put=11)
+    with mock_agentex(server, max_retries=0) as client:
+        upload_id = client.agents.upload_package(io.BytesIO(PACKAGE), chunk_size=CHUNK_SIZE)
+
+    assert server.uploads[upload_id].complete
+    assert len(server.ranges) == 11
+    assert server.requests[-1] == f"GET /agents/uploads/{upload_id}"
+
+
+def test_upload_gives_up_after_repeated_failures():
+    server = UploadServer()
+    server.uploads["upload-1"] = Upload()
+
+    def failing(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            return httpx.Response(500)
+        return server(request)
+
+    with mock_agentex(failing, max_retries=0) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.agents.upload_package(io.BytesIO(PACKAGE), upload_id="upload-1", max_chunk_retries=2)
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self.stream = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self.stream.readinto(buffer)
+
+
+def test_resume_an_existing_upload():
+    server = UploadServer()
+    server.uploads["upload-1"] = Upload(data=PACKAGE[:4321])
+    with mock_agentex(server) as client:
+        # The package is read again from its start and skipped ahead to what the server already has
+        upload_id = client.agents.upload_package(NonSeekable(PACKAGE), upload_id="upload-1", chunk_size=CHUNK_SIZE)
+
+    assert upload_id == "upload-1"
+    assert server.requests[0] == "GET /agents/uploads/upload-1"
+    assert server.ranges[0] == "bytes 4321-5320/*"
+    assert server.uploads["upload-1"].data == PACKAGE
+
+
+def test_resume_a_complete_upload_sends_nothing():
+    server = UploadServer()
+    server.uploads["upload-1"] = Upload(data=PACKAGE, complete=True)
+    with mock_agentex(server) as client:
+        assert client.agents.upload_package(io.BytesIO(b"unused"), upload_id="upload-1") == "upload-1"
+    assert server.requests == ["GET /agents/uploads/upload-1"]
+
+
+def test_async_upload_resumes_after_a_failed_chunk():
+    server = UploadServer(fail_put=5)
+    progress = []
+
+    async def upload():
+        async with mock_async_agentex(server, max_retries=0) as client:
+            return await client.agents.upload_package(
+                io.BytesIO(PACKAGE),
+                chunk_size=CHUNK_SIZE,
+                on_progress=progress.append,
+            )
+
+    upload_id = asyncio.run(upload())
+    assert server.uploads[upload_id].data == PACKAGE
+    assert server.ranges[4:6] == ["bytes 4000-4999/*", "bytes 4500-4999/*"]
+    assert progress[-1] == len(PACKAGE)
+
+
+def test_async_chunk_whose_response_was_lost_is_not_sent_again():
+    server = UploadServer(lose_put=4)
+
+    async def upload():
+        async with mock_async_agentex(server, max_retries=0) as client:
+            return await client.agents.upload_package(io.BytesIO(PACKAGE), chunk_size=CHUNK_SIZE)
+
+    upload_id = asyncio.run(upload())
+    assert server.uploads[upload_id].data == PACKAGE
+    assert server.ranges[3:5] == ["bytes 3000-3999/*", "bytes 4000-4999/*"]
+
+
+def test_pipe_raises_the_producer_error():
+    pipe = Pipe(capacity=2)
+
+    def produce():
+        pipe.write(b"partial")
+        pipe.close_writer(OSError("archiving failed"))
+
+    threading.Thread(target=produce).start()
+    assert pipe.read(7) == b"partial"
+    with pytest.raises(OSError, match="archiving failed"):
+        pipe.read(1)
+
+
+def test_producer_error_fails_the_upload():
+    server = UploadServer()
+    pipe = Pipe(capacity=2)
+
+    def produce():
+        pipe.write(PACKAGE[:2500])
+        pipe.close_writer(OSError("archiving failed"))
+
+    threading.Thread(target=produce).start()
+    with mock_agentex(server) as client:
+        with pytest.raises(OSError, match="archiving failed"):
+            client.agents.upload_package(pipe, chunk_size=CHUNK_SIZE)
+    # The error surfaces while reading ahead, before the incomplete package could be marked complete
+    assert not any(upload.complete for upload in server.uploads.values())
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    (tmp_path / "Dockerfile").write_text("FROM python\n")
+    (tmp_path / "project").mkdir()
+    (tmp_path / "project" / "app.py").write_text("print('hi')\n")
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text(MANIFEST)
+    cache = BuildContextCache(tmp_path / "cache")
+    monkeypatch.setattr(
+        AgentManifestConfig,
+        "context_manager",
+        lambda self, root: BuildContextManager(agent_manifest=self, build_context_root=root, cache=cache),
+    )
+    return manifest_path
+
+
+def test_create_command_resumes_the_upload(manifest, monkeypatch):
+    from agentex.cli.commands.agents import create
+
+    server = UploadServer()
+    server.uploads["upload-7"] = Upload()
+    monkeypatch.setattr(agentex_client, "Agentex", lambda: mock_agentex(server))
+    create(manifest=str(manifest), resume_upload="upload-7")
+
+    assert server.requests[0] == "GET /agents/uploads/upload-7"
+    upload = server.uploads["upload-7"]
+    assert upload.complete
+    with tarfile.open(fileobj=io.BytesIO(upload.data), mode="r:gz") as tar_file:
+        assert sorted(tar_file.getnames()) == ["Dockerfile", "project/app.py"]
+    assert server.created_from == "upload-7"
+    assert server.requests[-1] == "POST /agents"
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+import pytest
+
+from agentex.client._sse import aiter_sse
+from agentex.client.resources import tasks
+from agentex.client.types.events import MessageEvent, StatusEvent
+from tests.conftest import mock_async_agentex
+
+TASK = "task-1"
+
+
+def message_event(offset: int) -> Dict:
+    return {
+        "type": "message",
+        "offset": offset,
+        "task_id": TASK,
+        "thread_name": "root",
+        "message": {"role": "user", "content": f"message {offset}"},
+    }
+
+
+def status_event(offset: int, status: str) -> Dict:
+    return {"type": "status", "offset": offset, "task_id": TASK, "status": status}
+
+
+def sse(event: Dict, retry: Optional[int] = None) -> bytes:
+    lines = [f"id: {event['offset']}", f"event: {event['type']}", f"data: {json.dumps(event)}"]
+    if retry is not None:
+        lines.insert(0, f"retry: {retry}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class EventStream(httpx.AsyncByteStream):
+    """An event stream body that drops the connection after its chunks when `drop` is set."""
+
+    def __init__(self, chunks: List[bytes], drop: bool = False):
+        self.chunks = chunks
+        self.drop = drop
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            yield chunk
+        if self.drop:
+            raise httpx.ReadError("connection dropped")
+
+
+class EventServer:
+    """Answers each request to the events endpoint with the next scripted response, recording the offsets asked for."""
+
+    def __init__(self, responses: List[httpx.Response]):
+        self.responses = responses
+        self.offsets: List[Optional[str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == f"/tasks/{TASK}/events"
+        assert request.headers["Accept"] == "text/event-stream"
+        self.offsets.append(request.url.params.get("offset"))
+        return self.responses.pop(0)
+
+
+def stream_response(chunks: List[bytes], drop: bool = False) -> httpx.Response:
+    return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, stream=EventStream(chunks, drop))
+
+
+def watch(server: EventServer, **kwargs) -> List:
+    async def collect():
+        async with mock_async_agentex(server) as client:
+            return [event async for event in client.tasks.watch(TASK, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+@pytest.fixture(autouse=True)
+def no_reconnect_delay(monkeypatch):
+    monkeypatch.setattr(tasks, "DEFAULT_RECONNECT_DELAY", 0.0)
+
+
+def test_parse_sse():
+    async def parse(lines):
+        async def aiter_lines():
+            for line in lines:
+                yield line
+
+        return [event async for event in aiter_sse(aiter_lines())]
+
+    events = asyncio.run(parse([
+        ": keep-alive",
+        "retry: 2500",
+        "",
+        "id: 7",
+        "event: status",
+        "data: {\"a\":",
+        "data: 1}",
+        "",
+        "retry: soon",
+        "data:no-space\r\n",
+        "",
+    ]))
+    assert [(event.event, event.data, event.id, event.retry) for event in events] == [
+        ("message", "", None, 2500),
+        ("status", '{"a":\n1}', "7", None),
+        ("message", "no-space", None, None),
+    ]
+
+
+def test_watch_resumes_after_the_last_event_when_the_connection_drops():
+    server = EventServer([
+        stream_response([sse(message_event(0), retry=0), sse(message_event(1))], drop=True),
+        stream_response([sse(status_event(2, "COMPLETED"))]),
+    ])
+    events = watch(server)
+    assert [event.offset for event in events] == [0, 1, 2]
+    assert server.offsets == [None, "1"]
+
+
+def test_watch_stops_on_terminal_status():
+    server = EventServer([
+        stream_response([
+            sse(status_event(4, "RUNNING")),
+            sse(status_event(5, "FAILED")),
+            sse(message_event(6)),
+        ]),
+    ])
+    events = watch(server, offset=3)
+    assert [type(event) for event in events] == [StatusEvent, StatusEvent]
+    assert events[-1].is_terminal
+    assert server.offsets == ["3"]
+
+
+def test_watch_waits_out_an_unavailable_server():
+    server = EventServer([
+        stream_response([sse(message_event(0))], drop=True),
+        httpx.Response(503, headers={"Retry-After": "0"}),
+        httpx.Response(502),
+        stream_response([sse(status_event(1, "COMPLETED"))]),
+    ])
+    events = watch(server)
+    assert [event.offset for event in events] == [0, 1]
+    assert server.offsets == [None, "0", "0", "0"]
+
+
+def test_watch_raises_client_errors():
+    server = EventServer([httpx.Response(404)])
+    with pytest.raises(httpx.HTTPStatusError):
+        watch(server)
+
+
+def test_watch_without_reconnect():
+    server = EventServer([stream_response([sse(message_event(0))], drop=True)])
+    with pytest.raises(httpx.ReadError):
+        watch(server, reconnect=False)
+
+    # A stream the server ends before a terminal status is not resumed either
+    server = EventServer([stream_response([sse(message_event(0))])])
+    events = watch(server, reconnect=False)
+    assert [type(event) for event in events] == [MessageEvent]
+    assert server.offsets == [None]
+
+    server = EventServer([httpx.Response(503)])
+    with pytest.raises(httpx.HTTPStatusError):
+        watch(server, reconnect=False)